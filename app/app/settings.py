@@ -31,6 +31,12 @@ ALLOWED_HOSTS = []
 
 # Application definition
 
+# API_ONLY=1 serves the token authenticated API alone, for workers that
+# scale out with load: the admin site, sessions, messages, the browsable
+# API and schema generation are neither installed nor imported, which
+# shortens the time from process start to the first response
+API_ONLY = os.environ.get('API_ONLY', '0') == '1'
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -38,15 +44,20 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'core',
     'rest_framework',
     'rest_framework.authtoken',
     'drf_spectacular',
     'user',
     'client',
+    'database',
+    'project',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,6 +67,24 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+if API_ONLY:
+    _BROWSER_APPS = [
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+        'drf_spectacular',
+    ]
+    _BROWSER_MIDDLEWARE = [
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    ]
+    INSTALLED_APPS = [app for app in INSTALLED_APPS
+                      if app not in _BROWSER_APPS]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE
+                  if middleware not in _BROWSER_MIDDLEWARE]
+
 ROOT_URLCONF = 'app.urls'
 
 TEMPLATES = [
@@ -80,23 +109,136 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# DB_POOL_MAX_SIZE > 0 serves connections from a per-process pool and
+# closes them back into it after each request. Otherwise each thread keeps
+# its connection for DB_CONN_MAX_AGE seconds.
+_DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 0))
+_DB_OPTIONS = {}
+if _DB_POOL_MAX_SIZE > 0:
+    _DB_OPTIONS['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+        'max_size': _DB_POOL_MAX_SIZE,
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 600)),
+        'check_after': float(os.environ.get('DB_POOL_CHECK_AFTER', 30)),
+    }
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.db',
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': 0 if _DB_OPTIONS else int(
+            os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': _DB_OPTIONS,
         'TEST': {
                 'NAME': 'test',
         }
     },
 }
 
+# Read replicas of 'default', listed in DB_REPLICA_HOSTS, take the reads
+# of GET requests. A separate database on the same server, such as a copy
+# made with `createdb -T devdb devdb_replica` and named in
+# DB_REPLICA_NAME, stands in for one locally.
+_DB_REPLICA_HOSTS = [host.strip() for host in
+                     os.environ.get('DB_REPLICA_HOSTS', '').split(',')
+                     if host.strip()]
+for _number, _host in enumerate(_DB_REPLICA_HOSTS, 1):
+    DATABASES[f'replica_{_number}'] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'NAME': os.environ.get('DB_REPLICA_NAME',
+                               DATABASES['default']['NAME']),
+        'USER': os.environ.get('DB_REPLICA_USER',
+                               DATABASES['default']['USER']),
+        'PASSWORD': os.environ.get('DB_REPLICA_PASS',
+                                   DATABASES['default']['PASSWORD']),
+        # Tests read and write a single test database
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Routing used by core.routers. ALIASES are the DATABASES entries that
+# replicate 'default'. A client that wrote reads from the primary for
+# PIN_SECONDS, which should exceed the replication lag; the pin is sent
+# as a cookie and kept in the shared CACHE entry under the client's
+# credential, for clients that drop cookies. PRIMARY_APPS are always
+# read from the primary, so a new token works straight away and the
+# database cache never answers from a lagging copy.
+READ_REPLICAS = {
+    'ALIASES': [alias for alias in DATABASES if alias != 'default'],
+    'PIN_SECONDS': float(os.environ.get('DB_REPLICA_PIN_SECONDS', 5)),
+    'CACHE': os.environ.get('DB_REPLICA_PIN_CACHE', 'shared'),
+    'PRIMARY_APPS': ['authtoken', 'sessions', 'django_cache'],
+}
+
+# Caches
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# 'default' is local to each process. 'shared' is seen by every process
+# and host serving the API, and holds what must not go stale between
+# them, such as resource versions: Redis at SHARED_CACHE_URL when set
+# (needs the redis package), otherwise a table in 'default' created by
+# `manage.py createcachetable`.
+_SHARED_CACHE_URL = os.environ.get('SHARED_CACHE_URL')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': _SHARED_CACHE_URL,
+    } if _SHARED_CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'core_shared_cache',
+        # Culling would drop versions, so only stop runaway growth
+        'OPTIONS': {'MAX_ENTRIES': int(
+            os.environ.get('SHARED_CACHE_MAX_ENTRIES', 100000))},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+# PASSWORD_HASHER picks the hasher new hashes are made with, the others
+# stay listed so existing hashes still verify and are upgraded on login
+
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'core.hashers.TunablePBKDF2PasswordHasher',
+    'argon2': 'core.hashers.TunableArgon2PasswordHasher',
+    'bcrypt': 'core.hashers.TunableBCryptSHA256PasswordHasher',
+    'scrypt': 'core.hashers.TunableScryptPasswordHasher',
+}
+_PREFERRED_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[_PREFERRED_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items()
+    if name != _PREFERRED_HASHER
+]
+
+PASSWORD_HASHER_COST = {
+    'PBKDF2_ITERATIONS': int(os.environ.get('PBKDF2_ITERATIONS', 720000)),
+    'ARGON2_TIME_COST': int(os.environ.get('ARGON2_TIME_COST', 2)),
+    'ARGON2_MEMORY_COST': int(os.environ.get('ARGON2_MEMORY_COST', 102400)),
+    'ARGON2_PARALLELISM': int(os.environ.get('ARGON2_PARALLELISM', 8)),
+    'BCRYPT_ROUNDS': int(os.environ.get('BCRYPT_ROUNDS', 12)),
+    'SCRYPT_WORK_FACTOR': int(os.environ.get('SCRYPT_WORK_FACTOR', 2 ** 14)),
+}
+
+# Processes hashing the passwords of a bulk user provisioning request
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS',
+                                           os.cpu_count() or 1))
+# Bulk provisioning requests with more rows run as a background job
+USER_BULK_SYNC_LIMIT = int(os.environ.get('USER_BULK_SYNC_LIMIT', 500))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -138,5 +280,84 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'core.User'
 
 REST_FRAMEWORK = {
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema'
+    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+if API_ONLY:
+    del REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS']
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'core.renderers.FastJSONRenderer']
+
+# Where core.schema keeps the OpenAPI schema generated for each version of
+# the API, written by `manage.py build_schema` when the image is built
+SCHEMA_CACHE_DIR = os.environ.get('SCHEMA_CACHE_DIR',
+                                  BASE_DIR / '.openapi')
+
+# JSON library used by core.renderers: 'orjson' when installed, or 'json'
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'orjson')
+
+# Token -> user cache used by core.authentication.CachedTokenAuthentication
+# SHARED_CACHE names an entry of CACHES shared between workers (optional)
+# A change to a user's credentials in one process reaches cached tokens in
+# the others within VERSION_TTL seconds.
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': int(os.environ.get('TOKEN_AUTH_CACHE_SIZE', 10000)),
+    'TTL': int(os.environ.get('TOKEN_AUTH_CACHE_TTL', 60)),
+    'VERSION_TTL': float(os.environ.get('TOKEN_AUTH_VERSION_TTL', 1)),
+    'SHARED_CACHE': os.environ.get('TOKEN_AUTH_SHARED_CACHE') or None,
+}
+
+# Signed access tokens for core.authentication.AccessTokenAuthentication
+# POST user/token/refresh/ exchanges a token for an access token, sent as
+# "Authorization: Bearer <access>", valid for LIFETIME seconds and checked
+# without a query. Revocations reach other processes within
+# REVOCATION_SYNC seconds.
+ACCESS_TOKENS = {
+    'ENABLED': os.environ.get('ACCESS_TOKENS', '0') == '1',
+    'LIFETIME': int(os.environ.get('ACCESS_TOKEN_LIFETIME', 300)),
+    'REVOCATION_SYNC': float(
+        os.environ.get('ACCESS_TOKEN_REVOCATION_SYNC', 5)),
+}
+
+# ETags and cached bodies used by core.conditional.ConditionalGetMixin
+# VERSION_CACHE names the CACHES entry holding resource versions. It must
+# be shared by every process, as the checks of core.checks require, so a
+# write made anywhere changes the ETags served everywhere.
+# VERSION_TTL is how many seconds a process reuses a version it read, so
+# conditional requests skip the cache, and the database behind the default
+# one, at the cost of seeing other processes' writes that much later.
+# BODY_CACHE names a CACHES entry for rendered bodies, otherwise they are
+# kept in an in-process LRU cache of MAX_SIZE entries.
+RESPONSE_CACHE = {
+    'VERSION_CACHE': os.environ.get('RESPONSE_VERSION_CACHE', 'shared'),
+    'VERSION_TTL': float(os.environ.get('RESPONSE_VERSION_TTL', 1)),
+    'BODY_CACHE': os.environ.get('RESPONSE_BODY_CACHE') or None,
+    'MAX_SIZE': int(os.environ.get('RESPONSE_CACHE_SIZE', 1000)),
+    'TTL': int(os.environ.get('RESPONSE_CACHE_TTL', 300)),
+}
+
+# Client IDs each user may see, cached by core.access in every process
+# and dropped when the user's memberships change
+ACCESS_CACHE = {
+    'MAX_SIZE': int(os.environ.get('ACCESS_CACHE_SIZE', 10000)),
+    'TTL': int(os.environ.get('ACCESS_CACHE_TTL', 300)),
+}
+
+# Background jobs in core.jobs, run by `manage.py run_worker`. Failed jobs
+# are retried MAX_ATTEMPTS times in all, waiting RETRY_DELAY seconds
+# doubled on each attempt. Jobs running longer than TIMEOUT seconds are
+# assumed lost with their worker and run again.
+JOB_QUEUE = {
+    'MAX_ATTEMPTS': int(os.environ.get('JOB_MAX_ATTEMPTS', 3)),
+    'RETRY_DELAY': float(os.environ.get('JOB_RETRY_DELAY', 10)),
+    'TIMEOUT': float(os.environ.get('JOB_TIMEOUT', 3600)),
+    'POLL_INTERVAL': float(os.environ.get('JOB_POLL_INTERVAL', 1)),
 }
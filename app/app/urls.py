@@ -15,23 +15,35 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView)
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
 
+from core.views import MetricsView
+
 
 urlpatterns = [
-    # https://docs.djangoproject.com/en/5.0/ref/urls/#path
-    path('admin/', admin.site.urls),
-    # https://docs.djangoproject.com/en/5.0/topics/http/urls/#naming-url-patterns
-    path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
-    path('api/docs/',
-         SpectacularSwaggerView.as_view(url_name='api-schema'),
-         name='api-docs',
-         ),
+    path('api/metrics/', MetricsView.as_view(), name='api-metrics'),
     # https://docs.djangoproject.com/en/5.0/ref/urls/#include
     path('api/user/', include('user.urls')),
-    path('api/client/', include('client.urls'))
+    path('api/client/', include('client.urls')),
+    path('api/database/', include('database.urls')),
+    path('api/project/', include('project.urls')),
+    path('api/', include('core.urls')),
 ]
+
+if not settings.API_ONLY:
+    # Imported here so API only workers never load them
+    from django.contrib import admin
+    from core.schema import PrecomputedSchemaView, PrecomputedSwaggerView
+
+    urlpatterns += [
+        # https://docs.djangoproject.com/en/5.0/ref/urls/#path
+        path('admin/', admin.site.urls),
+        # https://docs.djangoproject.com/en/5.0/topics/http/urls/#naming-url-patterns
+        path('api/schema/', PrecomputedSchemaView.as_view(),
+             name='api-schema'),
+        path('api/docs/',
+             PrecomputedSwaggerView.as_view(url_name='api-schema'),
+             name='api-docs',
+             ),
+    ]
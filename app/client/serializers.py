@@ -1,27 +1,28 @@
 """
 Serializers for the Client API View
 """
+from collections import Counter
+from collections.abc import Mapping
+from contextlib import contextmanager
 from typing import override
-from django.contrib.auth import (
-    get_user_model,
-    )
-from django.contrib.auth.models import (
-    AbstractBaseUser,
-)
+from django.db import IntegrityError, transaction
 from django.utils.translation import gettext as gt
 from rest_framework import serializers
 
+from core.conditional import bump_version
 from core.models import BusinessClient
+from core.serializers import MeasuredSerializerMixin
 
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(MeasuredSerializerMixin,
+                       serializers.ModelSerializer):
     """
     Serializer for the user object
     """
 
     class Meta:
         model = BusinessClient
-        fields = ['name', 'date_created']
+        fields = ['name', 'date_created', 'database_count', 'project_count']
         extra_kwargs = {
             'name': {'required': True},
             'date_created': {'read_only': True}
@@ -43,3 +44,122 @@ class ClientSerializer(serializers.ModelSerializer):
         return client
 
 
+class ClientBulkListSerializer(serializers.ListSerializer):
+    """
+    Validate and write a batch of clients with bulk queries.
+
+    Name uniqueness is checked for the whole batch with a single query
+    instead of one UniqueValidator query per item. Errors are returned
+    as a list lined up with the submitted items. The caller owns the
+    transaction the batch is written in.
+    """
+    batch_size = 1000
+
+    @override
+    def to_internal_value(self, data) -> list:
+        try:
+            items = super().to_internal_value(data)
+            errors = [{} for _ in items]
+        except serializers.ValidationError as exc:
+            if not isinstance(exc.detail, list):
+                raise
+            # Keep checking names so every item error is reported at once
+            errors = exc.detail
+            items = [item if isinstance(item, Mapping) else {}
+                     for item in data]
+        updating = self.instance is not None
+
+        self.existing = {}
+        if updating:
+            ids = [item.get('id') if isinstance(item.get('id'), int)
+                   else None for item in items]
+            self.existing = self.instance.in_bulk(
+                [_id for _id in ids if _id is not None])
+            for error, _id in zip(errors, ids):
+                if 'id' in error:
+                    continue
+                if _id is None:
+                    error['id'] = [gt('This field is required.')]
+                elif _id not in self.existing:
+                    error['id'] = [gt('Client not found.')]
+
+        names = [item['name'] for item in items
+                 if isinstance(item.get('name'), str)]
+        taken = dict(BusinessClient.objects.filter(
+            name__in=names).values_list('name', 'id'))
+        counts = Counter(names)
+        unique_msg = BusinessClient._meta.get_field(
+            'name').error_messages['unique']
+        for error, item in zip(errors, items):
+            name = item.get('name')
+            if not isinstance(name, str):
+                continue
+            owner = taken.get(name)
+            if counts[name] > 1 or (owner is not None
+                                    and owner != item.get('id')):
+                error['name'] = [unique_msg]
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+    @contextmanager
+    def conflicts_as_errors(self):
+        """
+        Report a name taken by another request since the check as a
+        validation error rather than a server error
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {'non_field_errors': [gt('Clients were written '
+                                         'concurrently, retry the batch.')]},
+                code='conflict')
+
+    @override
+    def create(self, validated_data: list) -> list:
+        clients = [BusinessClient(**{k: v for k, v in attrs.items()
+                                     if k != 'id'})
+                   for attrs in validated_data]
+        with self.conflicts_as_errors():
+            clients = BusinessClient.objects.bulk_create(
+                clients, batch_size=self.batch_size)
+        # bulk_create sends no post_save signals
+        bump_version('client')
+        return clients
+
+    @override
+    def update(self, instance, validated_data: list) -> list:
+        clients = []
+        fields = set()
+        for attrs in validated_data:
+            client = self.existing[attrs.pop('id')]
+            for attr, value in attrs.items():
+                setattr(client, attr, value)
+                fields.add(attr)
+            clients.append(client)
+        if fields:
+            with self.conflicts_as_errors():
+                BusinessClient.objects.bulk_update(
+                    clients, sorted(fields), batch_size=self.batch_size)
+            bump_version('client')
+        return clients
+
+
+class ClientBulkSerializer(ClientSerializer):
+    """
+    Serializer for one item of a bulk client request
+    """
+    id = serializers.IntegerField(required=False)
+
+    class Meta(ClientSerializer.Meta):
+        fields = ['id', 'name', 'date_created', 'database_count',
+                  'project_count']
+        extra_kwargs = {
+            **ClientSerializer.Meta.extra_kwargs,
+            # Checked for the whole batch by ClientBulkListSerializer
+            'name': {'required': True, 'validators': []},
+        }
+        list_serializer_class = ClientBulkListSerializer
@@ -0,0 +1,63 @@
+"""
+Tests for the async client API
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import BusinessClient
+
+
+ASYNC_CLIENTS_URL = reverse('client:async-clients-list')
+
+
+class AsyncClientApiTests(TestCase):
+    """
+    Test the ASGI client endpoints
+    """
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username='testUser',
+            password='testpass123',
+            # Staff see every client, members see theirs
+            is_staff=True,
+        )
+        token = Token.objects.create(user=user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_list_matches_sync_view(self):
+        """Test the async list returns what the sync list returns"""
+        BusinessClient.objects.create(name='First')
+        BusinessClient.objects.create(name='Second')
+        res = self.client.get(ASYNC_CLIENTS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in res.json()],
+                         ['First', 'Second'])
+
+    def test_create_and_retrieve(self):
+        """Test a client is created and retrieved"""
+        res = self.client.post(ASYNC_CLIENTS_URL, {'name': 'New'},
+                               format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        client = BusinessClient.objects.get(name='New')
+        url = reverse('client:async-clients-detail', args=[client.id])
+        self.assertEqual(self.client.get(url).json()['name'], 'New')
+
+    def test_create_duplicate_rejected(self):
+        """Test the name uniqueness check still applies"""
+        BusinessClient.objects.create(name='Taken')
+        res = self.client.post(ASYNC_CLIENTS_URL, {'name': 'Taken'},
+                               format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', res.json())
+
+    def test_invalid_token_rejected(self):
+        """Test a bad token is a 401"""
+        self.client.credentials(HTTP_AUTHORIZATION='Token bad')
+        res = self.client.get(ASYNC_CLIENTS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
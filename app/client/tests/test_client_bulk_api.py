@@ -0,0 +1,115 @@
+"""
+Tests for the bulk client API
+"""
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import BusinessClient, Database
+
+
+BULK_URL = reverse('client:clients-bulk')
+
+
+class ClientBulkApiTests(TestCase):
+    """
+    Test creating, updating and deleting clients in bulk
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='testUser',
+            password='testpass123',
+            # Staff see every client, members see theirs
+            is_staff=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_create(self):
+        """Test a list of clients is created with one insert"""
+        payload = [{'name': f'Client{i}'} for i in range(50)]
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(BULK_URL, payload, format='json')
+        inserts = [query['sql'] for query in queries if query['sql']
+                   .startswith('INSERT INTO "core_businessclient"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 50)
+        self.assertIsNotNone(res.data[0]['id'])
+        self.assertEqual(BusinessClient.objects.count(), 50)
+
+    def test_bulk_create_concurrent_name(self):
+        """Test a name taken after the check is a 400, not a 500"""
+        BusinessClient.objects.create(name='Taken')
+        # The check runs before another request inserts the name
+        with patch.object(BusinessClient.objects, 'filter',
+                          return_value=BusinessClient.objects.none()):
+            res = self.client.post(BULK_URL, [{'name': 'New'},
+                                              {'name': 'Taken'}],
+                                   format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('non_field_errors', res.data)
+        self.assertFalse(BusinessClient.objects.filter(name='New').exists())
+
+    def test_bulk_create_reports_item_errors(self):
+        """Test duplicate names are reported against their items"""
+        BusinessClient.objects.create(name='Existing')
+        payload = [{'name': 'New'}, {'name': 'Existing'},
+                   {'name': 'Twice'}, {'name': 'Twice'}, {}]
+        res = self.client.post(BULK_URL, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('name', res.data[1])
+        self.assertIn('name', res.data[2])
+        self.assertIn('name', res.data[3])
+        self.assertIn('name', res.data[4])
+        self.assertFalse(BusinessClient.objects.filter(name='New').exists())
+
+    def test_bulk_update(self):
+        """Test clients are renamed by id"""
+        first = BusinessClient.objects.create(name='First')
+        second = BusinessClient.objects.create(name='Second')
+        payload = [{'id': first.id, 'name': 'First renamed'},
+                   {'id': second.id, 'name': 'Second'}]
+        res = self.client.patch(BULK_URL, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        self.assertEqual(first.name, 'First renamed')
+
+    def test_bulk_update_unknown_id(self):
+        """Test updating a missing client is an item error"""
+        client = BusinessClient.objects.create(name='First')
+        payload = [{'id': client.id, 'name': 'Renamed'},
+                   {'id': client.id + 100, 'name': 'Ghost'}]
+        res = self.client.patch(BULK_URL, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', res.data[1])
+        client.refresh_from_db()
+        self.assertEqual(client.name, 'First')
+
+    def test_bulk_delete(self):
+        """Test clients listed by id are deleted"""
+        clients = [BusinessClient.objects.create(name=f'Client{i}')
+                   for i in range(3)]
+        payload = {'ids': [clients[0].id, clients[1].id]}
+        res = self.client.delete(BULK_URL, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(list(BusinessClient.objects.values_list(
+            'id', flat=True)), [clients[2].id])
+
+    def test_bulk_delete_referenced_client(self):
+        """Test a client owning a database cannot be deleted"""
+        client = BusinessClient.objects.create(name='Owner')
+        Database.objects.create(name='Db1', description='desc',
+                                owned_by=client, created_by=self.user)
+        res = self.client.delete(BULK_URL, {'ids': [client.id]},
+                                 format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(BusinessClient.objects.filter(id=client.id).exists())
@@ -0,0 +1,58 @@
+"""
+Tests for the streaming client export
+"""
+import json
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import BusinessClient
+
+
+CLIENTS_URL = reverse('client:clients-list')
+
+
+class ClientExportApiTests(TestCase):
+    """
+    Test exporting clients with ?format=
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='testUser',
+            password='testpass123',
+            # Staff see every client, members see theirs
+            is_staff=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for name in ['ClientA', 'ClientB', 'ClientC']:
+            BusinessClient.objects.create(name=name)
+
+    def test_export_clients_ndjson(self):
+        """Test every client is streamed as one JSON line"""
+        res = self.client.get(CLIENTS_URL, {'format': 'ndjson'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'],
+                         'application/x-ndjson; charset=utf-8')
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        names = [json.loads(line)['name'] for line in lines]
+        self.assertEqual(names, ['ClientA', 'ClientB', 'ClientC'])
+
+    def test_export_clients_csv(self):
+        """Test clients are streamed as CSV"""
+        res = self.client.get(CLIENTS_URL, {'format': 'csv'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('attachment', res['Content-Disposition'])
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0],
+                         'name,date_created,database_count,project_count')
+        self.assertEqual(len(lines), 4)
+
+    def test_export_unknown_format(self):
+        """Test an unsupported format is rejected"""
+        res = self.client.get(CLIENTS_URL, {'format': 'xml'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
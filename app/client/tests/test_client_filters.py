@@ -0,0 +1,80 @@
+"""
+Tests for filtering, ordering and searching clients
+"""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import BusinessClient
+
+
+CLIENTS_URL = reverse('client:clients-list')
+
+
+class ClientFilterApiTests(TestCase):
+    """
+    Test the client list query parameters
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='testUser',
+            password='testpass123',
+            # Staff see every client, members see theirs
+            is_staff=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        now = timezone.now()
+        for days, name in enumerate(['Acme Holdings', 'Globex',
+                                     'Acme Logistics']):
+            BusinessClient.objects.create(
+                name=name, date_created=now - timedelta(days=days))
+
+    def names(self, params: dict) -> list[str]:
+        res = self.client.get(CLIENTS_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [client['name'] for client in res.data]
+
+    def test_name_filters(self):
+        """Test exact and substring name filters"""
+        self.assertEqual(self.names({'name': 'Globex'}), ['Globex'])
+        self.assertEqual(
+            sorted(self.names({'name__icontains': 'acme'})),
+            ['Acme Holdings', 'Acme Logistics'])
+
+    def test_date_range(self):
+        """Test date_created bounds, with dates taken as local midnight"""
+        yesterday = timezone.localdate() - timedelta(days=1)
+        self.assertEqual(
+            sorted(self.names({'date_created__gte': yesterday.isoformat()})),
+            ['Acme Holdings', 'Globex'])
+        self.assertEqual(
+            self.names({'date_created__lte': yesterday.isoformat()}),
+            ['Acme Logistics'])
+
+    def test_invalid_date_rejected(self):
+        """Test a malformed date is a validation error"""
+        res = self.client.get(CLIENTS_URL, {'date_created__gte': 'soon'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('date_created__gte', res.data)
+
+    def test_ordering(self):
+        """Test ordering by name and by date"""
+        self.assertEqual(self.names({'ordering': 'name'}),
+                         ['Acme Holdings', 'Acme Logistics', 'Globex'])
+        self.assertEqual(self.names({'ordering': '-date_created'}),
+                         ['Acme Holdings', 'Globex', 'Acme Logistics'])
+
+    def test_search(self):
+        """Test full text search on the name, combined with ordering"""
+        self.assertEqual(
+            self.names({'search': 'acme', 'ordering': '-name'}),
+            ['Acme Logistics', 'Acme Holdings'])
+        self.assertEqual(self.names({'search': 'logistic'}),
+                         ['Acme Logistics'])
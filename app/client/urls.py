@@ -16,5 +16,10 @@ router.register('clients', views.ClientViewSet, basename='clients')
 app_name = 'client'
 
 urlpatterns = [
+    # Async variants for ASGI deployments
+    path('async/clients/', views.AsyncClientListView.as_view(),
+         name='async-clients-list'),
+    path('async/clients/<int:pk>/', views.AsyncClientDetailView.as_view(),
+         name='async-clients-detail'),
     path('', include(router.urls))
 ]
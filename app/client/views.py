@@ -1,20 +1,152 @@
 """
 Views for the client API
 """
+from collections.abc import Mapping
+from typing import override
 
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import RestrictedError
+from django.utils.translation import gettext as gt
 from rest_framework import (
-    authentication,
     permissions,
+    serializers,
+    status,
     viewsets)
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
 from client.serializers import (
+    ClientBulkSerializer,
     ClientSerializer,
     )
+from core import access
+from core.authentication import AccessTokenAuthentication
+from core.conditional import ConditionalGetMixin
+from core.export import StreamingExportMixin
+from core.filters import FieldFilter, FullTextSearchFilter
+from core.models import BusinessClient
+from core.values import ValuesListMixin
+from core.views import AsyncAPIView, api_response, parse_body
 
 
-class ClientViewSet(viewsets.ModelViewSet):
+class ClientViewSet(ConditionalGetMixin, StreamingExportMixin,
+                    ValuesListMixin, viewsets.ModelViewSet):
     """
     View for managing clients
     """
     serializer_class = ClientSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [AccessTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    queryset = BusinessClient.objects.all()
+    cache_resource = 'client'
+    filter_backends = [FieldFilter, FullTextSearchFilter, OrderingFilter]
+    filter_fields = {'name': ['exact', 'icontains'],
+                     'date_created': ['gte', 'lte']}
+    ordering_fields = ['name', 'date_created', 'id']
+
+    @override
+    def get_queryset(self):
+        return access.scope(super().get_queryset(), self.request.user)
+
+    @override
+    def access_version(self, request):
+        return access.access_version(request.user)
+
+    @override
+    def perform_create(self, serializer):
+        client = serializer.save()
+        if not access.sees_everything(self.request.user):
+            access.grant(self.request.user, [client])
+
+    @override
+    def get_serializer_class(self):
+        """
+        Return the serializer class for the request
+        """
+        if self.action in ('bulk', 'bulk_update'):
+            return ClientBulkSerializer
+        return self.serializer_class
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Create a list of clients in one transaction
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            clients = serializer.save()
+            if not access.sees_everything(request.user):
+                access.grant(request.user, clients)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request):
+        """
+        Update a list of clients, each identified by its id
+        """
+        serializer = self.get_serializer(self.get_queryset(),
+                                         data=request.data,
+                                         many=True,
+                                         partial=True)
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        return Response(serializer.data)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request):
+        """
+        Delete the clients listed in ``ids``
+        """
+        data = request.data if isinstance(request.data, Mapping) else {}
+        ids = serializers.ListField(
+            child=serializers.IntegerField(), allow_empty=False
+        ).run_validation(data.get('ids'))
+        try:
+            with transaction.atomic():
+                self.get_queryset().filter(id__in=ids).delete()
+        except RestrictedError:
+            msg = gt('Clients still referenced by databases or '
+                     'projects cannot be deleted')
+            raise serializers.ValidationError(msg, code='restricted')
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AsyncClientListView(AsyncAPIView):
+    """
+    List and create clients under ASGI
+    """
+
+    async def get(self, request):
+        queryset = await sync_to_async(access.scope)(
+            BusinessClient.objects.order_by('id'), request.user)
+        clients = [client async for client in queryset]
+        return api_response(ClientSerializer(clients, many=True).data)
+
+    async def post(self, request):
+        serializer = ClientSerializer(data=parse_body(request))
+        # The name uniqueness check queries the database
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        client = await BusinessClient.objects.acreate(
+            **serializer.validated_data)
+        if not access.sees_everything(request.user):
+            await sync_to_async(access.grant)(request.user, [client])
+        return api_response(ClientSerializer(client).data, status=201)
+
+
+class AsyncClientDetailView(AsyncAPIView):
+    """
+    Retrieve a client under ASGI
+    """
+
+    async def get(self, request, pk: int):
+        queryset = await sync_to_async(access.scope)(
+            BusinessClient.objects.all(), request.user)
+        try:
+            client = await queryset.aget(pk=pk)
+        except BusinessClient.DoesNotExist:
+            raise NotFound()
+        return api_response(ClientSerializer(client).data)
@@ -0,0 +1,102 @@
+"""
+Which clients, databases and projects each user may see.
+
+Staff see everything. Other users see the clients a Membership grants
+them, with the databases and projects of those clients. A user's client
+IDs are read with one index only scan of membership_user_client_uniq
+and kept in process under the user's access version, which every change
+to their memberships bumps in the shared version cache, so every worker
+drops the old set at once and listings filter on the IDs without joining
+the memberships.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext as gt
+from rest_framework.exceptions import PermissionDenied
+
+from core.cache import LRUCache
+from core.conditional import bump_version, get_version
+from core.models import BusinessClient, Membership
+
+
+def _cache_settings() -> dict:
+    return {
+        'MAX_SIZE': 10000,
+        'TTL': 300,
+        **getattr(settings, 'ACCESS_CACHE', {}),
+    }
+
+
+_allowed = LRUCache(max_size=_cache_settings()['MAX_SIZE'],
+                    ttl=_cache_settings()['TTL'])
+
+
+def access_resource(user_id: int) -> str:
+    """
+    The resource whose version changes with a user's memberships
+    """
+    return f'access:{user_id}'
+
+
+def sees_everything(user) -> bool:
+    return user.is_staff
+
+
+def allowed_client_ids(user) -> frozenset[int]:
+    """
+    Return the IDs of the clients a user is a member of
+    """
+    tag, _ = get_version(access_resource(user.pk))
+    ids = _allowed.get((user.pk, tag))
+    if ids is None:
+        # Cached under the new version, so a lagging replica must not
+        # answer for it
+        ids = frozenset(Membership.objects.using(DEFAULT_DB_ALIAS)
+                        .filter(user_id=user.pk)
+                        .values_list('client_id', flat=True))
+        _allowed.set((user.pk, tag), ids)
+    return ids
+
+
+def access_version(user) -> tuple[str, float] | None:
+    """
+    The version of a user's memberships, or None for staff, who see
+    everything
+    """
+    if sees_everything(user):
+        return None
+    return get_version(access_resource(user.pk))
+
+
+def scope(queryset, user, client_field: str = 'pk'):
+    """
+    Filter a queryset to the rows of the clients a user may see, found
+    through ``client_field``
+    """
+    if sees_everything(user):
+        return queryset
+    ids = allowed_client_ids(user)
+    if not ids:
+        return queryset.none()
+    return queryset.filter(**{f'{client_field}__in': ids})
+
+
+def check_clients(user, *client_ids: int):
+    """
+    Raise PermissionDenied unless a user may see every client given
+    """
+    if sees_everything(user):
+        return
+    if not allowed_client_ids(user).issuperset(client_ids):
+        raise PermissionDenied(gt('You are not a member of this client'))
+
+
+def grant(user, clients: list[BusinessClient]):
+    """
+    Make a user a member of clients, skipping those already granted
+    """
+    Membership.objects.bulk_create(
+        [Membership(user=user, client=client) for client in clients],
+        ignore_conflicts=True)
+    # Bulk inserts send no signals
+    bump_version(access_resource(user.pk))
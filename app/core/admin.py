@@ -7,9 +7,31 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as translate
 
 from core import models
+from core.pagination import EstimatedCountPaginator
 
 
-class UserAdmin(BaseUserAdmin):
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelists that stay fast at millions of rows: counts are bounded
+    or estimated, and the unfiltered total is not counted at all
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    date_hierarchy = 'date_created'
+
+
+class MembershipInline(admin.TabularInline):
+    """
+    The clients a user is a member of
+    """
+    model = models.Membership
+    fields = ['client', 'date_created']
+    readonly_fields = ['date_created']
+    autocomplete_fields = ['client']
+    extra = 0
+
+
+class UserAdmin(LargeTableAdmin, BaseUserAdmin):
     """
     Note: temporary super user
     username:   admin@example.com
@@ -18,6 +40,8 @@ class UserAdmin(BaseUserAdmin):
     """
     #  ordering = ['username']
     list_display = ['username', 'email', 'first_name', 'last_name']
+    # Served by user_username_trgm_idx, the other columns are unindexed
+    search_fields = ['username']
     # fieldsets is overwritten from base class
     fieldsets = (
         (None, {"fields": ("username", "password")}),
@@ -35,9 +59,9 @@ class UserAdmin(BaseUserAdmin):
             },
         ),
         (translate("Important dates"), {"fields": ("date_created", )}),
-        # TODO  (translate('Groups'), {"fields": ("databases",)})
     )
     readonly_fields = ['date_created']
+    inlines = [MembershipInline]
     # Fieldsets for adding a user
     add_fieldsets = (
         (
@@ -57,7 +81,43 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+@admin.register(models.BusinessClient)
+class BusinessClientAdmin(LargeTableAdmin):
+    """
+    Define the admin pages for clients
+    """
+    list_display = ['name', 'database_count', 'project_count',
+                    'date_created']
+    readonly_fields = ['database_count', 'project_count']
+    search_fields = ['name']
+    ordering = ['name']
+
+
+@admin.register(models.Database)
+class DatabaseAdmin(LargeTableAdmin):
+    """
+    Define the admin pages for databases
+    """
+    list_display = ['name', 'owned_by', 'created_by', 'date_created']
+    list_select_related = ['owned_by', 'created_by']
+    autocomplete_fields = ['owned_by', 'created_by']
+    search_fields = ['name', 'description']
+    # Walks database_created_id_idx
+    ordering = ['-date_created', '-id']
+
+
+@admin.register(models.Project)
+class ProjectAdmin(LargeTableAdmin):
+    """
+    Define the admin pages for projects
+    """
+    list_display = ['name', 'client', 'database', 'created_by',
+                    'date_created']
+    list_select_related = ['client', 'database', 'created_by']
+    autocomplete_fields = ['client', 'database', 'created_by']
+    search_fields = ['name', 'description']
+    # Walks project_created_id_idx
+    ordering = ['-date_created', '-id']
+
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Project)
-admin.site.register(models.Database)
-admin.site.register(models.BusinessClient)
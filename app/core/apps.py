@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        if settings.API_ONLY:
+            from core.openapi import defer_admindocs
+            defer_admindocs()
+        from core import checks, signals  # noqa: F401
@@ -0,0 +1,217 @@
+"""
+Authentication classes for the REST API
+"""
+import copy
+from typing import override
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as translate
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    TokenAuthentication,
+    get_authorization_header,
+)
+
+from core import tokens
+from core.cache import LRUCache
+from core.conditional import bump_version, get_version
+
+TOKEN_CACHE_PREFIX = 'token-auth:'
+
+
+def _cache_settings() -> dict:
+    return {
+        'MAX_SIZE': 10000,
+        'TTL': 60,
+        'VERSION_TTL': 1,
+        'SHARED_CACHE': None,
+        **getattr(settings, 'TOKEN_AUTH_CACHE', {}),
+    }
+
+
+def _shared_cache():
+    alias = _cache_settings()['SHARED_CACHE']
+    return caches[alias] if alias else None
+
+
+token_cache = LRUCache(max_size=_cache_settings()['MAX_SIZE'],
+                       ttl=_cache_settings()['TTL'])
+
+
+def auth_resource(user_id: int) -> str:
+    """
+    The resource whose version changes with a user's credentials
+    """
+    return f'auth:{user_id}'
+
+
+def _auth_tag(user_id: int) -> str:
+    tag, _ = get_version(auth_resource(user_id),
+                         ttl=_cache_settings()['VERSION_TTL'])
+    return tag
+
+
+def invalidate_token(key: str):
+    """
+    Drop a cached token from this process and the shared cache
+    """
+    token_cache.delete(key)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(TOKEN_CACHE_PREFIX + key)
+
+
+def invalidate_user(user_id: int):
+    """
+    Drop the cached tokens of a user in every process, by giving them a
+    new auth version in the shared version cache
+    """
+    bump_version(auth_resource(user_id))
+
+
+def _checkout(cached: tuple) -> tuple:
+    """
+    Hand each request its own user instance so that views changing
+    request.user do not touch the cached copy
+    """
+    user, token, _ = cached
+    return copy.copy(user), token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches the token and its user.
+
+    Lookups are served from an in-process LRU cache with a short time
+    to live, falling back to the cache alias named in
+    ``TOKEN_AUTH_CACHE['SHARED_CACHE']`` when one is configured, and
+    only then to the database. Each entry holds the auth version of its
+    user, which ``invalidate_user`` bumps in the shared version cache.
+    Hits check the entry against that version as this process last read
+    it, so they run no query, and other processes drop the entry within
+    ``TOKEN_AUTH_CACHE['VERSION_TTL']`` seconds of the user's access
+    changing.
+    """
+
+    def _cached(self, key: str) -> tuple[tuple | None, str | None]:
+        """
+        The cached entry of a token if its user's auth version has not
+        changed, and that version when known
+        """
+        cached = token_cache.get(key)
+        shared = _shared_cache()
+        if cached is None and shared is not None:
+            cached = shared.get(TOKEN_CACHE_PREFIX + key)
+            if cached is not None:
+                token_cache.set(key, cached)
+        if cached is None:
+            return None, None
+        tag = _auth_tag(cached[0].pk)
+        if cached[2] != tag:
+            invalidate_token(key)
+            return None, tag
+        return cached, tag
+
+    def _store(self, key: str, cached: tuple):
+        token_cache.set(key, cached)
+        shared = _shared_cache()
+        if shared is not None:
+            shared.set(TOKEN_CACHE_PREFIX + key, cached,
+                       _cache_settings()['TTL'])
+
+    @override
+    def authenticate_credentials(self, key):
+        cached, tag = self._cached(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            cached = (user, token, tag or _auth_tag(user.pk))
+            self._store(key, cached)
+        return _checkout(cached)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of authenticate() for async views
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(
+                translate('Invalid token header. Token string should not '
+                          'contain spaces.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                translate('Invalid token header. Token string should not '
+                          'contain invalid characters.'))
+
+        # The caches are read and written in a thread, as their backends
+        # may be synchronous
+        cached, tag = await sync_to_async(self._cached)(key)
+        if cached is not None:
+            return _checkout(cached)
+
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related('user').aget(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(translate('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                translate('User inactive or deleted.'))
+
+        if tag is None:
+            tag = await sync_to_async(_auth_tag)(token.user.pk)
+        cached = (token.user, token, tag)
+        await sync_to_async(self._store)(key, cached)
+        return _checkout(cached)
+
+
+class AccessTokenAuthentication(CachedTokenAuthentication):
+    """
+    Also accept the signed access tokens of core.tokens.
+
+    ``Authorization: Bearer <access token>`` is checked against its
+    signature and the in-memory revocation list, so the request needs
+    no query unless the list is due to be reloaded. Other requests are
+    authenticated as by CachedTokenAuthentication.
+    """
+    access_keyword = 'Bearer'
+
+    def _access_token(self, request) -> str | None:
+        auth = get_authorization_header(request).split()
+        if (len(auth) != 2 or not tokens.token_settings()['ENABLED']
+                or auth[0].lower() != self.access_keyword.lower().encode()):
+            return None
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            return ''
+
+    def _authenticate_access(self, raw: str) -> tuple:
+        token = tokens.verify(raw)
+        if token is None or tokens.revocations.is_revoked(token):
+            raise exceptions.AuthenticationFailed(
+                translate('Invalid or expired access token.'))
+        return tokens.token_user(token), token
+
+    @override
+    def authenticate(self, request):
+        raw = self._access_token(request)
+        if raw is None:
+            return super().authenticate(request)
+        if tokens.revocations.due():
+            tokens.revocations.sync()
+        return self._authenticate_access(raw)
+
+    @override
+    async def aauthenticate(self, request):
+        raw = self._access_token(request)
+        if raw is None:
+            return await super().aauthenticate(request)
+        if tokens.revocations.due():
+            await sync_to_async(tokens.revocations.sync)()
+        return self._authenticate_access(raw)
@@ -0,0 +1,39 @@
+"""
+System checks for the core app
+"""
+from django.core import checks
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# Backends whose entries no other process can see
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+@checks.register(checks.Tags.caches)
+def check_version_cache(app_configs, **kwargs):
+    """
+    Resource versions must be shared, or writes made by one process
+    leave the ETags of the others unchanged
+    """
+    from core.conditional import _cache_settings, version_cache
+
+    cache = version_cache()
+    if isinstance(cache, PROCESS_LOCAL_CACHES):
+        return [checks.Error(
+            "RESPONSE_CACHE['VERSION_CACHE'] names a cache local to each "
+            "process.",
+            hint='Name a CACHES entry every process shares, such as a '
+                 'database or Redis cache.',
+            id='core.E001',
+        )]
+    if (isinstance(cache, DatabaseCache)
+            and not _cache_settings()['VERSION_TTL']):
+        return [checks.Warning(
+            "RESPONSE_CACHE['VERSION_CACHE'] is a database cache and "
+            "VERSION_TTL is 0, so every conditional request and cached "
+            "authentication runs a query.",
+            hint='Set VERSION_TTL, or name a Redis cache.',
+            id='core.W001',
+        )]
+    return []
@@ -0,0 +1,173 @@
+"""
+Resource versions, ETags and cached response bodies for GET endpoints
+"""
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.cache import LRUCache
+from core.export import StreamingExportRenderer
+from core.routers import replica_may_lag
+
+VERSION_PREFIX = 'resource-version:'
+
+
+def _cache_settings() -> dict:
+    return {
+        'VERSION_CACHE': 'shared',
+        'VERSION_TTL': 1,
+        'BODY_CACHE': None,
+        'MAX_SIZE': 1000,
+        'TTL': 300,
+        **getattr(settings, 'RESPONSE_CACHE', {}),
+    }
+
+
+_local_bodies = LRUCache(max_size=_cache_settings()['MAX_SIZE'],
+                         ttl=_cache_settings()['TTL'])
+# Versions read from the shared cache, with the time they were read
+local_versions = LRUCache(max_size=10000)
+
+
+def body_cache():
+    """
+    The cache alias named in RESPONSE_CACHE['BODY_CACHE'], or an
+    in-process LRU cache when none is configured
+    """
+    alias = _cache_settings()['BODY_CACHE']
+    return caches[alias] if alias else _local_bodies
+
+
+def version_cache():
+    """
+    The cache alias named in RESPONSE_CACHE['VERSION_CACHE'], shared by
+    every process
+    """
+    return caches[_cache_settings()['VERSION_CACHE']]
+
+
+def get_version(resource: str,
+                ttl: float | None = None) -> tuple[str, float]:
+    """
+    Return the version tag and modification time of a resource.
+
+    A version read from the shared cache is reused for ``ttl`` seconds,
+    RESPONSE_CACHE['VERSION_TTL'] by default, so bumps made by other
+    processes are seen up to that much later.
+    """
+    if ttl is None:
+        ttl = _cache_settings()['VERSION_TTL']
+    local = local_versions.get(resource)
+    if local is not None and time.monotonic() - local[1] < ttl:
+        return local[0]
+    version = version_cache().get(VERSION_PREFIX + resource)
+    if version is None:
+        # Unknown after a restart or eviction, so start a fresh version
+        return _set_version(resource)
+    local_versions.set(resource, (version, time.monotonic()))
+    return version
+
+
+def _set_version(resource: str) -> tuple[str, float]:
+    cache = version_cache()
+    modified = time.time()
+    previous = cache.get(VERSION_PREFIX + resource)
+    if previous is not None:
+        # Last-Modified has a resolution of one second, so every version
+        # must fall in a later second than the one it replaces
+        modified = max(modified, int(previous[1]) + 1)
+    version = (uuid.uuid4().hex, modified)
+    cache.set(VERSION_PREFIX + resource, version, None)
+    local_versions.set(resource, (version, time.monotonic()))
+    return version
+
+
+def bump_version(resource: str):
+    """
+    Give a resource a new version, now and when the transaction commits.
+
+    The second bump covers readers that saw the first one but queried
+    before the commit, so cached the old rows under the new version.
+    """
+    _set_version(resource)
+    transaction.on_commit(lambda: _set_version(resource))
+
+
+class ConditionalGetMixin:
+    """
+    Serve list and retrieve with ETag and Last-Modified headers.
+
+    The ETag is derived from the version of ``cache_resource``, that of
+    the user's access where ``access_version`` gives one, the URL and the
+    negotiated media type, so a matching ``If-None-Match`` is answered
+    with 304 from the versions alone, without a query while they are
+    fresh in this process. Rendered bodies are kept in ``body_cache()``
+    under the same key. Every write to the resource must call
+    ``bump_version``; ``core.signals`` does so for saves and deletes.
+    """
+    cache_resource: str
+
+    def access_version(self, request) -> tuple[str, float] | None:
+        """
+        The version of what the user may see, when responses differ
+        between users
+        """
+        return None
+
+    def list(self, request, *args, **kwargs):
+        if isinstance(request.accepted_renderer, StreamingExportRenderer):
+            return super().list(request, *args, **kwargs)
+        return self.conditional_response(super().list, request,
+                                         *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request,
+                                         *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        tag, modified = get_version(self.cache_resource)
+        access = self.access_version(request)
+        if access is not None:
+            access_tag, access_modified = access
+            tag = f'{tag}:{access_tag}'
+            modified = max(modified, access_modified)
+        key = 'response:' + hashlib.sha256('\n'.join([
+            self.cache_resource, tag, request.build_absolute_uri(),
+            request.accepted_media_type]).encode()).hexdigest()
+        etag = quote_etag(key[-32:])
+        last_modified = int(modified)
+
+        response = get_conditional_response(request, etag=etag,
+                                            last_modified=last_modified)
+        if response is None and replica_may_lag(modified):
+            # The replica may not have the write behind this version yet,
+            # so neither cache nor tag what it returns with the version
+            return handler(request, *args, **kwargs)
+        if response is None:
+            response = self.cached_response(key, handler, request,
+                                            *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def cached_response(self, key, handler, request, *args, **kwargs):
+        cache = body_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    key, (rendered.content, rendered['Content-Type'])))
+        return response
@@ -0,0 +1,89 @@
+"""
+PostgreSQL backend that can draw connections from a pool.
+
+Set ``OPTIONS['pool']`` to True, or to a dict of ConnectionPool
+arguments, to enable it. Django then checks a connection out of the
+pool when it first needs one in a thread and gives it back where it
+would otherwise close it, at the end of each request. Without the
+option this behaves exactly like django.db.backends.postgresql.
+"""
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.creation import DatabaseCreation
+
+from core.db.pool import ConnectionPool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def close_pools(alias: str | None = None):
+    """
+    Close the idle connections of every pool, or of one alias's pools
+    """
+    with _pools_lock:
+        for key in [key for key in _pools if alias in (None, key[0])]:
+            _pools.pop(key).close()
+
+
+class PoolDatabaseCreation(DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Pooled connections to the test database would block DROP DATABASE
+        close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = PoolDatabaseCreation
+
+    @property
+    def pool_options(self) -> dict | None:
+        options = self.settings_dict['OPTIONS'].get('pool')
+        if not options:
+            return None
+        if self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured(
+                'Pooling and persistent connections are mutually exclusive, '
+                'set CONN_MAX_AGE to 0 when OPTIONS["pool"] is set.')
+        return {} if options is True else options
+
+    @property
+    def pool(self) -> ConnectionPool | None:
+        """
+        The pool for this alias and its current settings, if enabled
+        """
+        options = self.pool_options
+        if options is None:
+            return None
+        params = self.get_connection_params()
+        # The test runner renames the database, which needs its own pool
+        key = (self.alias, params.get('database'), params.get('host'),
+               params.get('port'), params.get('user'))
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(
+                    lambda: super(DatabaseWrapper, self).get_new_connection(
+                        params), **options)
+        return pool
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        return pool.getconn()
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
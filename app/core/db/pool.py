@@ -0,0 +1,177 @@
+"""
+A thread-safe pool of psycopg2 connections
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from psycopg2 import extensions
+
+from django.db.utils import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    """No connection became free before the checkout timeout"""
+
+
+class ConnectionPool:
+    """
+    Keep up to ``max_size`` connections open and hand them to threads.
+
+    Idle connections are reused most recently returned first, so a quiet
+    period lets the extra ones age out after ``max_idle`` seconds while
+    ``min_size`` stay open. A connection that sat idle for longer than
+    ``check_after`` seconds is pinged before being handed out, and one
+    returned mid-transaction is rolled back or dropped.
+    """
+
+    def __init__(self, connect, min_size: int = 0, max_size: int = 10,
+                 timeout: float = 30.0, max_idle: float = 600.0,
+                 check_after: float = 30.0):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self._idle = deque()
+        self._size = 0
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        """Connections open, whether idle or checked out"""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def _check_fork(self):
+        # A forked child must not share its parent's sockets
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle.clear()
+            self._size = 0
+
+    def getconn(self):
+        """
+        Return a healthy connection, opening one if the pool has room
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                self._check_fork()
+                conn = self._reserve(deadline)
+            if conn is None:
+                break
+            conn, returned = conn
+            # Checked outside the lock, a ping is a network round trip
+            if self._usable(conn, time.monotonic() - returned):
+                return conn
+            with self._cond:
+                self._discard(conn)
+                self._cond.notify()
+        try:
+            return self._connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def _reserve(self, deadline: float):
+        # Pop an idle connection, or claim a slot for a new one (None)
+        while True:
+            if self._idle:
+                return self._idle.pop()
+            if self._size < self.max_size:
+                self._size += 1
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PoolTimeout(
+                    f'No connection available within {self.timeout}s '
+                    f'({self.max_size} in use)')
+            self._cond.wait(remaining)
+
+    def putconn(self, conn):
+        """
+        Give a connection back, rolling back any open transaction
+        """
+        status = (extensions.TRANSACTION_STATUS_UNKNOWN if conn.closed
+                  else conn.info.transaction_status)
+        if status not in (extensions.TRANSACTION_STATUS_IDLE,
+                          extensions.TRANSACTION_STATUS_UNKNOWN):
+            try:
+                conn.rollback()
+                status = conn.info.transaction_status
+            except Exception:
+                status = extensions.TRANSACTION_STATUS_UNKNOWN
+        with self._cond:
+            if self._pid != os.getpid():
+                return
+            now = time.monotonic()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, now))
+            self._expire(now)
+            self._cond.notify()
+
+    def warm(self) -> int:
+        """
+        Open ``min_size`` connections, at least one, and check each works
+        """
+        conns = [self.getconn() for _ in range(max(self.min_size, 1))]
+        try:
+            for conn in conns:
+                if not self._ping(conn):
+                    raise OperationalError('Pooled connection failed its '
+                                           'check')
+        finally:
+            for conn in conns:
+                self.putconn(conn)
+        return self.size
+
+    def close(self):
+        """
+        Close every idle connection
+        """
+        with self._cond:
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+
+    def _usable(self, conn, idle_for: float) -> bool:
+        if conn.closed:
+            return False
+        if idle_for < self.check_after:
+            return True
+        return self._ping(conn)
+
+    @staticmethod
+    def _ping(conn) -> bool:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if conn.info.transaction_status != \
+                    extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            return False
+        return True
+
+    def _expire(self, now: float):
+        # The oldest idle connections sit at the left of the deque
+        while (self._idle and len(self._idle) > self.min_size
+               and now - self._idle[0][1] > self.max_idle):
+            self._discard(self._idle.popleft()[0])
+
+    def _discard(self, conn):
+        self._size -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
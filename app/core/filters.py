@@ -0,0 +1,92 @@
+"""
+Filter backends shared by the API apps
+"""
+import datetime
+
+from django.contrib.postgres.search import SearchQuery
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as translate
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from core.models import SEARCH_CONFIG
+
+
+class FieldFilter(BaseFilterBackend):
+    """
+    Filter on the lookups in ``view.filter_fields``.
+
+    ``filter_fields`` maps model field names to the lookups allowed on
+    them, given as ``?name__icontains=acme`` or ``?name=Acme`` for an
+    exact match. Values are converted by the model field, so an invalid
+    date is a 400 response rather than a server error.
+    """
+
+    def get_filters(self, view) -> list[tuple[str, str, str]]:
+        """
+        Return (query parameter, field, lookup) for each allowed lookup
+        """
+        return [(field if lookup == 'exact' else f'{field}__{lookup}',
+                 field, lookup)
+                for field, lookups in getattr(view, 'filter_fields',
+                                              {}).items()
+                for lookup in lookups]
+
+    def filter_queryset(self, request, queryset, view):
+        filters = {}
+        errors = {}
+        for param, field, lookup in self.get_filters(view):
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            model_field = queryset.model._meta.get_field(field)
+            try:
+                value = model_field.to_python(value)
+            except DjangoValidationError as exc:
+                errors[param] = exc.messages
+                continue
+            if (isinstance(value, datetime.datetime)
+                    and timezone.is_naive(value)):
+                value = timezone.make_aware(value)
+            filters[f'{field}__{lookup}'] = value
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(**filters)
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': param,
+            'required': False,
+            'in': 'query',
+            'description': f'{field} {lookup}',
+            'schema': {'type': 'string'},
+        } for param, field, lookup in self.get_filters(view)]
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Match ``?search=`` against the model's ``search_vector`` column.
+
+    The query uses web search syntax: quoted phrases, ``or`` and
+    ``-excluded`` words. The column is a generated tsvector with a GIN
+    index, so the match is an index lookup at any table size.
+    """
+    search_param = 'search'
+    search_description = translate('Full text search terms')
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return queryset
+        return queryset.filter(search_vector=SearchQuery(
+            terms, config=SEARCH_CONFIG, search_type='websearch'))
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': str(self.search_description),
+            'schema': {'type': 'string'},
+        }]
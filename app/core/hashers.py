@@ -0,0 +1,95 @@
+"""
+Password hashers with their cost taken from settings.
+
+Each hasher keeps the algorithm name of the Django hasher it extends,
+so existing hashes keep verifying. When the configured cost differs
+from the one a hash was made with, ``must_update`` is true and Django
+rehashes the password on the next successful login.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    BCryptSHA256PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+    make_password,
+)
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+
+def _cost(name: str, default: int) -> int:
+    return getattr(settings, 'PASSWORD_HASHER_COST', {}).get(name, default)
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 using PASSWORD_HASHER_COST['PBKDF2_ITERATIONS']"""
+
+    @property
+    def iterations(self) -> int:
+        return _cost('PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id using the PASSWORD_HASHER_COST['ARGON2_*'] parameters"""
+
+    @property
+    def time_cost(self) -> int:
+        return _cost('ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self) -> int:
+        return _cost('ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self) -> int:
+        return _cost('ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
+
+
+class TunableBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """BCrypt-SHA256 using PASSWORD_HASHER_COST['BCRYPT_ROUNDS']"""
+
+    @property
+    def rounds(self) -> int:
+        return _cost('BCRYPT_ROUNDS', BCryptSHA256PasswordHasher.rounds)
+
+
+class TunableScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt using PASSWORD_HASHER_COST['SCRYPT_WORK_FACTOR']"""
+
+    @property
+    def work_factor(self) -> int:
+        return _cost('SCRYPT_WORK_FACTOR', ScryptPasswordHasher.work_factor)
+
+
+def _get_hash_pool(workers: int) -> ProcessPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # Spawned rather than forked, as the web server may be running
+            # threads that a forked child would inherit mid-operation
+            _hash_pool = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup)
+        return _hash_pool
+
+
+def make_passwords(passwords: list[str]) -> list[str]:
+    """
+    Hash a batch of passwords across PASSWORD_HASH_WORKERS processes.
+
+    Small batches, or a single worker, hash in the calling thread, as
+    starting the pool costs more than it saves.
+    """
+    workers = getattr(settings, 'PASSWORD_HASH_WORKERS', 1)
+    if workers <= 1 or len(passwords) < 2 * workers:
+        return [make_password(password) for password in passwords]
+    chunksize = -(-len(passwords) // (workers * 4))
+    return list(_get_hash_pool(workers).map(make_password, passwords,
+                                            chunksize=chunksize))
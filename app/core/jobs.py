@@ -0,0 +1,134 @@
+"""
+A job queue kept in Postgres and run by the run_worker command.
+
+Workers claim jobs with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any
+number of them can poll the table without taking the same job twice or
+waiting on each other's locks. A failed job is retried with exponential
+backoff until it has used its attempts.
+"""
+import datetime
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import Job, JobSecret
+
+logger = logging.getLogger(__name__)
+
+
+def queue_settings() -> dict:
+    return {
+        'MAX_ATTEMPTS': 3,
+        'RETRY_DELAY': 10,
+        'TIMEOUT': 3600,
+        'POLL_INTERVAL': 1,
+        **getattr(settings, 'JOB_QUEUE', {}),
+    }
+
+
+def enqueue(func, *args, user=None, max_attempts: int | None = None,
+            secrets: dict | None = None, **kwargs) -> Job:
+    """
+    Queue func(*args, **kwargs, **secrets) to run on a worker.
+
+    func must be a module level function and the arguments must be JSON
+    serializable. ``secrets`` are kept in a JobSecret rather than the
+    payload and deleted when the job finishes. The job becomes visible
+    to workers when the current transaction commits.
+    """
+    with transaction.atomic():
+        job = Job.objects.create(
+            name=f'{func.__module__}.{func.__qualname__}',
+            payload={'args': list(args), 'kwargs': kwargs},
+            max_attempts=max_attempts or queue_settings()['MAX_ATTEMPTS'],
+            created_by=user)
+        if secrets:
+            JobSecret.objects.create(job=job, kwargs=secrets)
+    return job
+
+
+def claim(worker: str) -> Job | None:
+    """
+    Lock the next ready job for ``worker`` and mark it running.
+
+    Running jobs whose worker has not finished them within
+    JOB_QUEUE['TIMEOUT'] seconds are assumed lost and claimed again.
+    """
+    now = timezone.now()
+    stale = now - datetime.timedelta(seconds=queue_settings()['TIMEOUT'])
+    with transaction.atomic():
+        job = (Job.objects.select_for_update(skip_locked=True)
+               .filter(Q(status=Job.Status.QUEUED, run_after__lte=now)
+                       | Q(status=Job.Status.RUNNING, locked_at__lt=stale))
+               .order_by('run_after', 'id')
+               .first())
+        if job is None:
+            return None
+        job.status = Job.Status.RUNNING
+        job.attempts += 1
+        job.locked_by = worker
+        job.locked_at = now
+        job.save(update_fields=['status', 'attempts', 'locked_by',
+                                'locked_at'])
+    return job
+
+
+def run(job: Job) -> Job:
+    """
+    Run a claimed job and record its result or failure
+    """
+    try:
+        func = import_string(job.name)
+        payload = job.payload or {}
+        secret = JobSecret.objects.filter(job=job).first()
+        kwargs = {**payload.get('kwargs', {}),
+                  **(secret.kwargs if secret else {})}
+        result = func(*payload.get('args', []), **kwargs)
+    except Exception as exc:
+        logger.exception('Job %s (%s) failed on attempt %s', job.id,
+                         job.name, job.attempts)
+        job.error = f'{type(exc).__name__}: {exc}'
+        if job.attempts < job.max_attempts:
+            delay = queue_settings()['RETRY_DELAY'] * 2 ** (job.attempts - 1)
+            job.status = Job.Status.QUEUED
+            job.run_after = timezone.now() + datetime.timedelta(
+                seconds=delay)
+        else:
+            _finish(job, Job.Status.FAILED)
+    else:
+        job.result = result
+        job.error = ''
+        _finish(job, Job.Status.SUCCEEDED)
+    job.locked_by = ''
+    job.locked_at = None
+    job.save()
+    return job
+
+
+def _finish(job: Job, status: str):
+    job.status = status
+    job.date_finished = timezone.now()
+    # Arguments may hold personal data, such as the names of new users
+    job.payload = None
+    JobSecret.objects.filter(job=job).delete()
+
+
+def run_next(worker: str) -> Job | None:
+    """
+    Claim and run the next ready job, returning it, or None when there
+    is nothing to do
+    """
+    job = claim(worker)
+    if job is None:
+        return None
+    if job.attempts > job.max_attempts:
+        # A lost job that had no attempts left
+        job.error = job.error or 'Timed out'
+        _finish(job, Job.Status.FAILED)
+        job.save()
+        return job
+    return run(job)
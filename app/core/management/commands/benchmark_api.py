@@ -0,0 +1,258 @@
+"""
+Django command to load test the API and record a latency baseline.
+"""
+import json
+import platform
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.conditional import body_cache
+from core.models import BusinessClient, Database, Project
+
+BATCH_SIZE = 5000
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """
+    Nearest rank percentile of an ordered list
+    """
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summarise(latencies: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'requests_per_second': round(len(ordered) / elapsed, 2),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the API endpoints"""
+    help = ('Seed users, clients, databases and projects inside a rolled '
+            'back transaction, drive the API endpoints and report '
+            'p50/p95/p99 latency and requests/s as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--clients', type=int, default=1000)
+        parser.add_argument('--databases', type=int, default=2000)
+        parser.add_argument('--projects', type=int, default=5000)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Requests per endpoint')
+        parser.add_argument('--token-requests', type=int, default=20,
+                            help='Logins, each paying for a password hash')
+        parser.add_argument('--concurrency', type=int, default=1,
+                            help='Above 1, needs --allow-writes')
+        parser.add_argument('--allow-writes', action='store_true',
+                            help='Commit the seed and delete it afterwards, '
+                                 'so concurrent requests, each on its own '
+                                 'connection, can read it')
+        parser.add_argument('--endpoints', nargs='+',
+                            help='Only run these endpoints')
+        parser.add_argument('--no-response-cache', action='store_true',
+                            help='Empty the response body cache before '
+                                 'every request')
+        parser.add_argument('--output', help='Write the results here')
+        parser.add_argument('--compare', help='Baseline results to compare')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Allowed p95 slowdown against the '
+                                 'baseline, as a fraction')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        prefix = f'bench-{uuid.uuid4().hex[:8]}'
+        volumes = {name: options[name] for name in
+                   ('users', 'clients', 'databases', 'projects')}
+        if options['allow_writes']:
+            try:
+                results = self.benchmark(prefix, volumes, options)
+            finally:
+                self.cleanup(prefix)
+        elif options['concurrency'] > 1:
+            raise CommandError(
+                'Concurrent requests cannot read a seed that is rolled back, '
+                'pass --allow-writes to commit it')
+        else:
+            # The test client runs each request on this thread's
+            # connection, so the requests read the uncommitted seed
+            with transaction.atomic():
+                results = self.benchmark(prefix, volumes, options)
+                transaction.set_rollback(True)
+
+        report = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'volumes': volumes,
+                'concurrency': options['concurrency'],
+                'response_cache': not options['no_response_cache'],
+            },
+            'results': results,
+        }
+        text = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.write(text + '\n')
+        else:
+            self.stdout.write(text)
+
+        if options['compare']:
+            self.compare(results, options['compare'], options['tolerance'])
+
+    def benchmark(self, prefix: str, volumes: dict, options) -> dict:
+        admin, password = self.seed(prefix, volumes)
+        token = Token.objects.create(user=admin)
+        # The test client sends requests for the 'testserver' host
+        hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+        with override_settings(ALLOWED_HOSTS=hosts):
+            return self.run_endpoints(
+                self.endpoints(prefix, admin, password), token.key, options)
+
+    def seed(self, prefix: str, volumes: dict):
+        """
+        Bulk insert the requested rows, all named after the prefix
+        """
+        user_model = get_user_model()
+        password = uuid.uuid4().hex
+        # One hash shared by every seeded user instead of one per user
+        encoded = make_password(password)
+        admin = user_model.objects.create_superuser(
+            username=f'{prefix}-admin', password=password)
+        users = user_model.objects.bulk_create(
+            [user_model(username=f'{prefix}-user{i}', password=encoded,
+                        email=f'user{i}@example.com')
+             for i in range(volumes['users'])], batch_size=BATCH_SIZE)
+        users.append(admin)
+        clients = BusinessClient.objects.bulk_create(
+            [BusinessClient(name=f'{prefix} client {i}')
+             for i in range(max(volumes['clients'], 1))],
+            batch_size=BATCH_SIZE)
+        databases = Database.objects.bulk_create(
+            [Database(name=f'{prefix} database {i}',
+                      description=f'Records of client {i % len(clients)}',
+                      owned_by=clients[i % len(clients)],
+                      created_by=users[i % len(users)])
+             for i in range(volumes['databases'])], batch_size=BATCH_SIZE)
+        if databases:
+            Project.objects.bulk_create(
+                [Project(name=f'{prefix} project {i}',
+                         description=f'Work on database {i}',
+                         database=databases[i % len(databases)],
+                         client=clients[i % len(clients)],
+                         created_by=users[i % len(users)])
+                 for i in range(volumes['projects'])],
+                batch_size=BATCH_SIZE)
+        return admin, password
+
+    def cleanup(self, prefix: str):
+        Project.objects.filter(name__startswith=prefix).delete()
+        Database.objects.filter(name__startswith=prefix).delete()
+        BusinessClient.objects.filter(name__startswith=prefix).delete()
+        get_user_model().objects.filter(username__startswith=prefix).delete()
+
+    def endpoints(self, prefix: str, admin, password: str) -> dict:
+        """
+        Map endpoint names to (method, url, body)
+        """
+        client = BusinessClient.objects.filter(
+            name__startswith=prefix).first()
+        return {
+            'token': ('post', reverse('user:token'),
+                      {'username': admin.username, 'password': password}),
+            'me': ('get', reverse('user:me'), None),
+            'manage-list': ('get', reverse('user:manage-list'), None),
+            'manage-detail': ('get', reverse('user:manage-detail',
+                                             args=[admin.id]), None),
+            'clients-list': ('get', reverse('client:clients-list'), None),
+            'clients-detail': ('get', reverse('client:clients-detail',
+                                              args=[client.id]), None),
+            'clients-search': ('get', reverse('client:clients-list') +
+                               '?search=client&ordering=name', None),
+            'databases-list': ('get', reverse('database:databases-list'),
+                               None),
+            'projects-list': ('get', reverse('project:projects-list'), None),
+        }
+
+    def run_endpoints(self, endpoints: dict, key: str, options) -> dict:
+        selected = options['endpoints'] or list(endpoints)
+        unknown = set(selected) - set(endpoints)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {sorted(unknown)}')
+
+        local = threading.local()
+        headers = {'Authorization': f'Token {key}'}
+
+        def call(endpoint):
+            method, url, body = endpoint
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            if options['no_response_cache']:
+                body_cache().clear()
+            start = time.perf_counter()
+            response = getattr(local.client, method)(
+                url, body, headers=headers)
+            return time.perf_counter() - start, response.status_code >= 400
+
+        results = {}
+        for name in selected:
+            requests = (options['token_requests'] if name == 'token'
+                        else options['requests'])
+            calls = [endpoints[name]] * requests
+            start = time.perf_counter()
+            if options['concurrency'] > 1:
+                with ThreadPoolExecutor(options['concurrency']) as pool:
+                    samples = list(pool.map(call, calls))
+            else:
+                samples = [call(endpoint) for endpoint in calls]
+            elapsed = time.perf_counter() - start
+            results[name] = summarise(
+                [latency for latency, _ in samples],
+                sum(failed for _, failed in samples), elapsed)
+            self.stderr.write(
+                f'{name:16} {results[name]["requests_per_second"]:9.1f} '
+                f'req/s  p95 {results[name]["p95_ms"]:8.1f} ms')
+        return results
+
+    def compare(self, results: dict, path: str, tolerance: float):
+        """
+        Report endpoints whose p95 grew by more than the tolerance
+        """
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = []
+        for name, current in results.items():
+            if name not in baseline:
+                continue
+            ratio = current['p95_ms'] / baseline[name]['p95_ms']
+            line = (f'{name:16} p95 {baseline[name]["p95_ms"]:8.1f} -> '
+                    f'{current["p95_ms"]:8.1f} ms ({ratio - 1:+.0%})')
+            if ratio > 1 + tolerance:
+                regressions.append(name)
+                self.stderr.write(self.style.ERROR(line))
+            else:
+                self.stderr.write(line)
+        if regressions:
+            raise CommandError(
+                f'p95 regressed beyond {tolerance:.0%}: '
+                f'{", ".join(regressions)}')
@@ -0,0 +1,100 @@
+"""
+Django command to compare WSGI and ASGI throughput under concurrency.
+"""
+import asyncio
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+from rest_framework.authtoken.models import Token
+
+from core.models import BusinessClient
+
+
+def summarise(latencies: list[float], elapsed: float) -> str:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return (f'{len(latencies) / elapsed:8.1f} req/s  '
+            f'p50 {statistics.median(latencies) * 1000:7.1f} ms  '
+            f'p95 {p95 * 1000:7.1f} ms')
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the sync and async views"""
+    help = ('Drive a sync view through the WSGI handler and its async '
+            'variant through the ASGI handler with concurrent clients')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--wsgi-path', default='/api/client/clients/')
+        parser.add_argument('--asgi-path',
+                            default='/api/client/async/clients/')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        if not BusinessClient.objects.exists():
+            self.stderr.write(self.style.WARNING(
+                'No clients to list, run seed_data first'))
+        # Staff see every client, so the listings are not empty
+        user = get_user_model().objects.create_user(
+            username=f'benchmark-{uuid.uuid4().hex[:12]}',
+            password=uuid.uuid4().hex, is_staff=True)
+        token = Token.objects.create(user=user)
+        headers = {'Authorization': f'Token {token.key}'}
+        # The test clients send requests for the 'testserver' host
+        hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+        try:
+            with override_settings(ALLOWED_HOSTS=hosts):
+                wsgi = self.run_wsgi(options['wsgi_path'], headers,
+                                     options['requests'],
+                                     options['concurrency'])
+                asgi = asyncio.run(self.run_asgi(
+                    options['asgi_path'], headers, options['requests'],
+                    options['concurrency']))
+        finally:
+            token.delete()
+            user.delete()
+
+        self.stdout.write(f'Concurrency {options["concurrency"]}, '
+                          f'{options["requests"]} requests each')
+        self.stdout.write(f'WSGI {summarise(*wsgi)}')
+        self.stdout.write(self.style.SUCCESS(f'ASGI {summarise(*asgi)}'))
+
+    def run_wsgi(self, path, headers, requests, concurrency):
+        # Test clients keep cookies and are not thread safe
+        local = threading.local()
+
+        def fetch(_):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            start = time.perf_counter()
+            response = local.client.get(path, headers=headers)
+            assert response.status_code == 200, response.status_code
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(fetch, range(requests)))
+        return latencies, time.perf_counter() - start
+
+    async def run_asgi(self, path, headers, requests, concurrency):
+        client = AsyncClient()
+        gate = asyncio.Semaphore(concurrency)
+
+        async def fetch():
+            async with gate:
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                assert response.status_code == 200, response.status_code
+                return time.perf_counter() - start
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(fetch() for _ in range(requests)))
+        return list(latencies), time.perf_counter() - start
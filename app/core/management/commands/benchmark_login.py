@@ -0,0 +1,77 @@
+"""
+Django command to measure auth token issuance throughput.
+"""
+import multiprocessing
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import connections
+from rest_framework.authtoken.models import Token
+
+from user.serializers import AuthTokenSerializer
+
+
+def issue_tokens(username: str, password: str, requests: int) -> float:
+    """
+    Issue tokens the way CreateTokenView does and return the seconds taken
+    """
+    start = time.perf_counter()
+    for _ in range(requests):
+        serializer = AuthTokenSerializer(
+            data={'username': username, 'password': password})
+        serializer.is_valid(raise_exception=True)
+        Token.objects.get_or_create(user=serializer.validated_data['user'])
+    return time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the login path"""
+    help = ('Measure tokens issued per second per worker with the '
+            'configured password hasher')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20,
+                            help='Logins per worker')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes, one per core')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        requests = options['requests']
+        workers = options['workers']
+        hasher = get_hasher()
+        self.stdout.write(f'Hasher: {hasher.algorithm} '
+                          f'({settings.PASSWORD_HASHERS[0]})')
+
+        username = f'benchmark-{uuid.uuid4().hex[:12]}'
+        password = uuid.uuid4().hex
+        user = get_user_model().objects.create_user(username=username,
+                                                    password=password)
+        try:
+            if workers == 1:
+                timings = [issue_tokens(username, password, requests)]
+            else:
+                # Children must not inherit the parent's connection
+                connections.close_all()
+                context = multiprocessing.get_context('fork')
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=context) as pool:
+                    timings = list(pool.map(issue_tokens,
+                                            [username] * workers,
+                                            [password] * workers,
+                                            [requests] * workers))
+        finally:
+            Token.objects.filter(user=user).delete()
+            user.delete()
+
+        per_worker = [requests / elapsed for elapsed in timings]
+        self.stdout.write(
+            f'Tokens/s per worker: {sum(per_worker) / workers:.2f}')
+        self.stdout.write(f'Tokens/s total: {sum(per_worker):.2f}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Mean latency: {1000 / (sum(per_worker) / workers):.1f} ms'))
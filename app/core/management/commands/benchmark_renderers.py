@@ -0,0 +1,73 @@
+"""
+Django command to measure JSON renderer and parser throughput.
+"""
+import datetime
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+
+def user_rows(count: int) -> list[dict]:
+    """
+    Rows shaped like the admin user list response
+    """
+    start = timezone.now()
+    return [{'id': i, 'username': f'user{i}', 'first_name': 'Exämple',
+             'last_name': 'User', 'email': f'user{i}@example.com',
+             'is_active': True, 'is_staff': i % 10 == 0,
+             'date_created': start - datetime.timedelta(seconds=i)}
+            for i in range(count)]
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the JSON renderers"""
+    help = ('Compare JSONRenderer/JSONParser with the orjson backed '
+            'FastJSONRenderer/FastJSONParser')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+',
+                            default=[1000, 10000, 100000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        if orjson is None:
+            raise CommandError('orjson is not installed')
+        repeat = options['repeat']
+        for rows in options['rows']:
+            data = user_rows(rows)
+            body = JSONRenderer().render(data)
+            if FastJSONRenderer().render(data) != body:
+                self.stderr.write(f'Bodies differ at {rows} rows')
+            megabytes = len(body) / 1e6
+
+            stdlib = best_of(repeat, lambda: JSONRenderer().render(data))
+            fast = best_of(repeat, lambda: FastJSONRenderer().render(data))
+            self.stdout.write(
+                f'render {rows:>7} rows  json {megabytes / stdlib:7.1f} MB/s'
+                f'  orjson {megabytes / fast:7.1f} MB/s  '
+                f'{stdlib / fast:5.1f}x')
+
+            stdlib = best_of(repeat, lambda: JSONParser().parse(
+                io.BytesIO(body)))
+            fast = best_of(repeat, lambda: FastJSONParser().parse(
+                io.BytesIO(body)))
+            self.stdout.write(
+                f'parse  {rows:>7} rows  json {megabytes / stdlib:7.1f} MB/s'
+                f'  orjson {megabytes / fast:7.1f} MB/s  '
+                f'{stdlib / fast:5.1f}x')
@@ -0,0 +1,72 @@
+"""
+Django command to compare the serializer and values() list paths.
+"""
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from client.serializers import ClientSerializer
+from core.models import BusinessClient
+from core.values import RowSerializer
+from user.serializers import AdminSerialiser
+
+
+class Command(BaseCommand):
+    """Django command to benchmark list serialization"""
+    help = ('Render client and user lists through the serializers and '
+            'through the values() rows, inside a rolled back transaction')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+',
+                            default=[1000, 10000, 100000])
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        with transaction.atomic():
+            created = 0
+            for rows in sorted(options['rows']):
+                self.populate(created, rows)
+                created = rows
+                self.compare('clients', ClientSerializer,
+                             BusinessClient.objects.order_by('id'), rows)
+                self.compare('users', AdminSerialiser,
+                             get_user_model().objects.order_by('id'), rows)
+            transaction.set_rollback(True)
+
+    def populate(self, start: int, stop: int):
+        prefix = uuid.uuid4().hex[:8]
+        BusinessClient.objects.bulk_create(
+            [BusinessClient(name=f'benchmark-{prefix}-{i}')
+             for i in range(start, stop)], batch_size=5000)
+        get_user_model().objects.bulk_create(
+            [get_user_model()(username=f'benchmark-{prefix}-{i}',
+                              email=f'user{i}@example.com',
+                              password='!')
+             for i in range(start, stop)], batch_size=5000)
+
+    def compare(self, label, serializer_class, queryset, rows):
+        queryset = queryset[:rows]
+        renderer = JSONRenderer()
+        compiled = RowSerializer.compile(serializer_class)
+
+        start = time.perf_counter()
+        expected = renderer.render(
+            serializer_class(queryset, many=True).data)
+        serializer_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        body = renderer.render(
+            compiled.to_representation(compiled.values(queryset)))
+        values_time = time.perf_counter() - start
+
+        if body != expected:
+            self.stderr.write(f'{label}: bodies differ at {rows} rows')
+        self.stdout.write(
+            f'{label:8} {rows:>7} rows  serializer '
+            f'{serializer_time * 1000:9.1f} ms  values '
+            f'{values_time * 1000:9.1f} ms  '
+            f'{serializer_time / values_time:5.1f}x')
@@ -0,0 +1,26 @@
+"""
+Django command to generate the OpenAPI schema served by core.schema.
+"""
+from django.core.management.base import BaseCommand
+
+from core import schema
+
+
+class Command(BaseCommand):
+    """Django command to precompute the OpenAPI schema"""
+    help = ('Write the OpenAPI schema of the current URLconf and '
+            'serializers to SCHEMA_CACHE_DIR, unless it is already there')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Generate the schema even if it exists')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        key = schema.fingerprint()
+        path = schema.schema_path(key)
+        if path.exists() and not options['force']:
+            self.stdout.write(f'Schema {key} is up to date')
+            return
+        path = schema.write(schema.generate(), key)
+        self.stdout.write(self.style.SUCCESS(f'Wrote schema {key} to {path}'))
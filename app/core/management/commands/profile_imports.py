@@ -0,0 +1,111 @@
+"""
+Django command to profile imports and the time to a worker's first response.
+"""
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter, so nothing is imported yet, and call the
+# WSGI application the way a server would
+SCRIPT = '''
+import io, json, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+setup = time.perf_counter()
+from django.conf import settings
+settings.ALLOWED_HOSTS = ['*']
+status = []
+body = application({
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[1], 'QUERY_STRING': '',
+    'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+    'wsgi.input': io.BytesIO(), 'wsgi.url_scheme': 'http',
+}, lambda code, headers, exc_info=None: status.append(code))
+b''.join(body)
+first_request = time.perf_counter()
+print(json.dumps({
+    'setup_ms': (setup - start) * 1000,
+    'first_request_ms': (first_request - start) * 1000,
+    'status': status[0],
+    'modules': len(sys.modules),
+}))
+'''
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """
+    Return (self us, cumulative us, module) from ``-X importtime`` output
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, module = line[len('import time:'):].split('|')
+        # Keep the indent showing which import made this one
+        imports.append((int(own), int(cumulative), module[1:].rstrip()))
+    return imports
+
+
+class Command(BaseCommand):
+    """Django command to profile worker start up"""
+    help = ('Report the slowest imports made while loading settings, '
+            'INSTALLED_APPS and the URLconf, and the time to the first '
+            'response')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25)
+        parser.add_argument('--sort', choices=['self', 'cumulative'],
+                            default='cumulative')
+        parser.add_argument('--path', default='/api/user/me/',
+                            help='Path requested as the first request')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs to take the fastest timings of')
+        parser.add_argument('--api-only', action='store_true',
+                            help='Profile with API_ONLY=1')
+        parser.add_argument('--compare', action='store_true',
+                            help='Profile with and without API_ONLY=1')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        if options['compare']:
+            full = self.profile(options, api_only=False)
+            api_only = self.profile(options, api_only=True)
+            saving = 1 - (api_only['first_request_ms']
+                          / full['first_request_ms'])
+            self.stdout.write(self.style.SUCCESS(
+                f'API_ONLY=1 reaches the first response {saving:.0%} '
+                f'sooner'))
+            return
+        self.profile(options, api_only=options['api_only'])
+
+    def profile(self, options, api_only: bool) -> dict:
+        env = {**os.environ, 'API_ONLY': '1' if api_only else '0'}
+        runs = []
+        for _ in range(max(options['repeat'], 1)):
+            proc = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', SCRIPT,
+                 options['path']],
+                env=env, capture_output=True, text=True)
+            if proc.returncode:
+                raise CommandError(proc.stderr.strip().splitlines()[-1])
+            timings = json.loads(proc.stdout.strip().splitlines()[-1])
+            runs.append((timings, proc.stderr))
+        # The fastest run has the least noise and a warm bytecode cache
+        timings, stderr = min(runs, key=lambda run:
+                              run[0]['first_request_ms'])
+
+        self.stdout.write(
+            f'API_ONLY={int(api_only)}: setup {timings["setup_ms"]:.0f} ms, '
+            f'first response {timings["first_request_ms"]:.0f} ms '
+            f'({timings["status"]}), {timings["modules"]} modules')
+        column = 0 if options['sort'] == 'self' else 1
+        imports = sorted(parse_importtime(stderr),
+                         key=lambda row: row[column], reverse=True)
+        self.stdout.write(f'{"self ms":>9} {"cumul ms":>9}  module')
+        for own, cumulative, module in imports[:options['top']]:
+            self.stdout.write(
+                f'{own / 1000:9.1f} {cumulative / 1000:9.1f}  {module}')
+        return timings
@@ -0,0 +1,56 @@
+"""
+Django command to repair the database and project counters of clients.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.conditional import bump_version
+from core.models import BusinessClient, Database, Project
+
+
+def _count(model, column: str):
+    return Coalesce(Subquery(
+        model.objects.filter(**{column: OuterRef('pk')})
+        .order_by().values(column).annotate(n=Count('*')).values('n')),
+        Value(0))
+
+
+class Command(BaseCommand):
+    """Django command to recount client counters"""
+    help = ('Recompute BusinessClient.database_count and project_count '
+            'from the rows and fix any that drifted')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        with transaction.atomic():
+            # Writers wait, so no row is counted twice or missed
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'LOCK TABLE {Database._meta.db_table}, '
+                    f'{Project._meta.db_table} IN SHARE MODE')
+            drifted = BusinessClient.objects.annotate(
+                actual_databases=_count(Database, 'owned_by'),
+                actual_projects=_count(Project, 'client'),
+            ).filter(~Q(database_count=F('actual_databases'))
+                     | ~Q(project_count=F('actual_projects')))
+            ids = list(drifted.values_list('id', flat=True))
+            if ids and not options['dry_run']:
+                BusinessClient.objects.filter(id__in=ids).update(
+                    database_count=_count(Database, 'owned_by'),
+                    project_count=_count(Project, 'client'))
+                bump_version('client')
+
+        if not ids:
+            self.stdout.write(self.style.SUCCESS('All counters are correct'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                f'{len(ids)} clients have drifted counters'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Fixed the counters of {len(ids)} clients'))
@@ -0,0 +1,59 @@
+"""
+Django command to run queued background jobs.
+"""
+import os
+import signal
+import socket
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.jobs import queue_settings, run_next
+
+
+class Command(BaseCommand):
+    """Django command to run background jobs"""
+    help = 'Claim and run jobs from the queue until stopped'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once no job is ready')
+        parser.add_argument('--max-jobs', type=int, default=None,
+                            help='Exit after running this many jobs')
+        parser.add_argument('--interval', type=float, default=None,
+                            help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        interval = options['interval']
+        if interval is None:
+            interval = queue_settings()['POLL_INTERVAL']
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+        # Finish the current job before exiting
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.stdout.write(f'Worker {worker} waiting for jobs')
+        done = 0
+        while not self.stopping:
+            close_old_connections()
+            job = run_next(worker)
+            if job is None:
+                if options['burst']:
+                    break
+                time.sleep(interval)
+                continue
+            style = (self.style.SUCCESS if job.status == job.Status.SUCCEEDED
+                     else self.style.WARNING)
+            self.stdout.write(style(
+                f'Job {job.id} {job.name} {job.status} '
+                f'(attempt {job.attempts} of {job.max_attempts})'))
+            done += 1
+            if options['max_jobs'] and done >= options['max_jobs']:
+                break
+        self.stdout.write(f'Worker {worker} stopped after {done} jobs')
+
+    def stop(self, signum, frame):
+        self.stopping = True
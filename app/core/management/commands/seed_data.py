@@ -0,0 +1,239 @@
+"""
+Django command to fill the database with generated related data.
+"""
+import csv
+import datetime
+import io
+import multiprocessing
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from core.conditional import bump_version
+from core.models import BusinessClient, Database, Project
+
+FIRST_NAMES = ('Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey',
+               'Jamie', 'Robin', 'Avery', 'Quinn', 'Riley', 'Charlie')
+LAST_NAMES = ('Smith', 'Jones', 'Brown', 'Garcia', 'Miller', 'Davis',
+              'Wilson', 'Moore', 'Clark', 'Lewis', 'Walker', 'Young')
+COMPANIES = ('Acme', 'Apex', 'Summit', 'Harbor', 'Northwind', 'Vertex',
+             'Cobalt', 'Granite', 'Pioneer', 'Meridian', 'Bluewater')
+INDUSTRIES = ('Chemicals', 'Pharma', 'Energy', 'Foods', 'Water', 'Paper',
+              'Mining', 'Power', 'Refining', 'Biotech')
+AREAS = ('Boiler', 'Reactor', 'Packaging', 'Utilities', 'Batch',
+         'Distillation', 'Filtration', 'Tank farm', 'Compressor', 'Dryer')
+WORK = ('Migration', 'Upgrade', 'Alarm rationalisation', 'Graphics refresh',
+        'Controller replacement', 'Batch recipe update', 'Audit')
+
+# Columns written for each table, in load order
+TABLES = {
+    'users': ('username', 'password', 'email', 'first_name', 'last_name',
+              'is_superuser', 'is_staff', 'is_active', 'date_created'),
+    'clients': ('name', 'date_created'),
+    'databases': ('name', 'description', 'owned_by', 'created_by',
+                  'date_created'),
+    'projects': ('name', 'description', 'database', 'client', 'created_by',
+                 'date_created'),
+}
+
+
+def table_model(table: str):
+    return {'users': get_user_model(), 'clients': BusinessClient,
+            'databases': Database, 'projects': Project}[table]
+
+
+def reserve_ids(model, count: int, using: str) -> int:
+    """
+    Take ``count`` consecutive ids from the table's sequence and return
+    the first, so that rows and their references can be generated
+    independently of the order they are inserted in
+    """
+    table = model._meta.db_table
+    column = model._meta.pk.column
+    connection = connections[using]
+    with transaction.atomic(using), connection.cursor() as cursor:
+        # Inserts take the sequence between nextval and setval otherwise,
+        # and their ids land inside the reserved range
+        cursor.execute(f'LOCK TABLE {connection.ops.quote_name(table)} '
+                       'IN SHARE ROW EXCLUSIVE MODE')
+        cursor.execute(
+            'SELECT setval(pg_get_serial_sequence(%s, %s), '
+            'nextval(pg_get_serial_sequence(%s, %s)) + %s)',
+            [table, column, table, column, max(count - 1, 0)])
+        last = cursor.fetchone()[0]
+    return last - count + 1
+
+
+class Seeder:
+    """
+    Generate the rows of a table from their position, so that any slice
+    can be built by any worker
+    """
+
+    def __init__(self, prefix: str, password: str, counts: dict,
+                 first_ids: dict, days: int, method: str, using: str):
+        self.prefix = prefix
+        self.password = password
+        self.counts = counts
+        self.first_ids = first_ids
+        self.days = days
+        self.method = method
+        self.using = using
+        self.now = timezone.now()
+
+    def created(self, rng: random.Random) -> datetime.datetime:
+        return self.now - datetime.timedelta(
+            seconds=rng.randrange(max(self.days, 1) * 86400))
+
+    def pick(self, table: str, rng: random.Random) -> int:
+        return self.first_ids[table] + rng.randrange(self.counts[table])
+
+    def owner(self, database: int) -> int:
+        """The client id owning the database at position ``database``"""
+        return self.first_ids['clients'] + database % self.counts['clients']
+
+    def users(self, i: int, rng: random.Random) -> tuple:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        username = f'{first}.{last}.{self.prefix}{i}'.lower()
+        return (username, self.password, f'{username}@example.com', first,
+                last, False, i % 500 == 0, i % 50 != 0, self.created(rng))
+
+    def clients(self, i: int, rng: random.Random) -> tuple:
+        return (f'{rng.choice(COMPANIES)} {rng.choice(INDUSTRIES)} '
+                f'{self.prefix}-{i}', self.created(rng))
+
+    def databases(self, i: int, rng: random.Random) -> tuple:
+        area = rng.choice(AREAS)
+        return (f'{area.upper().replace(" ", "_")}_{self.prefix}_{i}',
+                f'{area} control system, site {rng.randrange(1, 40)}',
+                self.owner(i), self.pick('users', rng), self.created(rng))
+
+    def projects(self, i: int, rng: random.Random) -> tuple:
+        database = rng.randrange(self.counts['databases'])
+        work = rng.choice(WORK)
+        return (f'{work} {self.prefix}-{i}',
+                f'{work} of database {database} for the '
+                f'{rng.choice(AREAS).lower()} area',
+                self.first_ids['databases'] + database, self.owner(database),
+                self.pick('users', rng), self.created(rng))
+
+    def load(self, table: str, start: int, stop: int) -> int:
+        """Insert the rows at positions start to stop of the table"""
+        rng = random.Random(f'{self.prefix}:{table}:{start}')
+        make_row = getattr(self, table)
+        rows = [(self.first_ids[table] + i, *make_row(i, rng))
+                for i in range(start, stop)]
+        model = table_model(table)
+        fields = [model._meta.pk] + [model._meta.get_field(name)
+                                     for name in TABLES[table]]
+        with transaction.atomic(using=self.using):
+            if self.method == 'copy':
+                self.copy(model, fields, rows)
+            else:
+                model.objects.using(self.using).bulk_create(
+                    [model(**dict(zip([field.attname for field in fields],
+                                      row))) for row in rows])
+        return len(rows)
+
+    def copy(self, model, fields, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        connection = connections[self.using]
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(field.column) for field in fields)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {quote(model._meta.db_table)} ({columns}) '
+                'FROM STDIN WITH (FORMAT csv)', buffer)
+
+
+def _load(seeder: Seeder, table: str, start: int, stop: int) -> int:
+    return seeder.load(table, start, stop)
+
+
+class Command(BaseCommand):
+    """Django command to seed the database"""
+    help = ('Generate users, clients, databases and projects with COPY '
+            'or bulk_create, in batches and optionally in parallel')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--clients', type=int, default=1000)
+        parser.add_argument('--databases', type=int, default=10000)
+        parser.add_argument('--projects', type=int, default=50000)
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes loading batches')
+        parser.add_argument('--method', choices=['copy', 'bulk'],
+                            default='copy')
+        parser.add_argument('--password', default=None,
+                            help='Password of every seeded user, '
+                                 'generated when not given')
+        parser.add_argument('--prefix', default=None,
+                            help='Makes the generated names unique')
+        parser.add_argument('--days', type=int, default=365,
+                            help='Spread creation dates over this many days')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        counts = {table: options[table] for table in TABLES}
+        if counts['databases'] and not (counts['clients'] and
+                                        counts['users']):
+            raise CommandError('Databases need at least one client and user')
+        if counts['projects'] and not (counts['databases'] and
+                                       counts['users']):
+            raise CommandError('Projects need at least one database and '
+                               'user')
+        using = options['database']
+        prefix = options['prefix'] or uuid.uuid4().hex[:6]
+        password = options['password'] or uuid.uuid4().hex
+        # One hash for every user rather than a full hash per row
+        seeder = Seeder(prefix, make_password(password), counts,
+                        {table: reserve_ids(table_model(table), count, using)
+                         for table, count in counts.items()},
+                        options['days'], options['method'], using)
+
+        workers = options['workers']
+        executor = None
+        if workers > 1:
+            # Forked workers must open their own connections
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context('fork'))
+        try:
+            for table, count in counts.items():
+                self.load_table(seeder, table, count, options['batch_size'],
+                                executor)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        # Bulk loads send no signals, so the cached lists are replaced here
+        bump_version('user')
+        bump_version('client')
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded prefix {prefix!r}, user password {password!r}'))
+
+    def load_table(self, seeder: Seeder, table: str, count: int,
+                   batch_size: int, executor):
+        start = time.perf_counter()
+        batches = [(offset, min(offset + batch_size, count))
+                   for offset in range(0, count, batch_size)]
+        if executor is None:
+            loaded = sum(seeder.load(table, *batch) for batch in batches)
+        else:
+            loaded = sum(executor.map(
+                _load, [seeder] * len(batches), [table] * len(batches),
+                *zip(*batches, strict=True) if batches else ([], [])))
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f'{table:10} {loaded:>10} rows  '
+                          f'{loaded / max(elapsed, 1e-9):12.0f} rows/s')
@@ -4,6 +4,7 @@ Django command to wait for the database to be available.
 import time
 from psycopg2 import OperationalError as psycopg2Error
 
+from django.db import connections
 from django.db.utils import OperationalError
 from django.core.management.base import BaseCommand
 
@@ -18,8 +19,18 @@ class Command(BaseCommand):
         while db_up is False:
             try:
                 self.check(databases=['default'])
+                self.warm_pool()
                 db_up = True
             except (psycopg2Error, OperationalError):
                 self.stdout.write('Database unavailable, waiting 1 second...')
                 time.sleep(1)
         self.stdout.write(self.style.SUCCESS('Database available!'))
+
+    def warm_pool(self):
+        """Open and check the pooled connections, if pooling is enabled"""
+        pool = getattr(connections['default'], 'pool', None)
+        if pool is None:
+            return
+        size = pool.warm()
+        self.stdout.write(f'Connection pool ready: {size} of '
+                          f'{pool.max_size} connections open')
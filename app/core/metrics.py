@@ -0,0 +1,200 @@
+"""
+In-process request metrics rendered in the Prometheus text format
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+def log_linear_bounds(lowest: float, highest: float,
+                      sub_buckets: int = 4) -> list[float]:
+    """
+    Bucket upper bounds in the style of an HDR histogram: every power of
+    two between lowest and highest is split into equal linear steps, so
+    the relative error is the same at every magnitude
+    """
+    bounds = []
+    magnitude = lowest
+    while magnitude < highest:
+        step = magnitude / sub_buckets
+        bounds.extend(magnitude + step * i for i in range(1, sub_buckets + 1))
+        magnitude *= 2
+    return bounds
+
+
+SECONDS_BOUNDS = log_linear_bounds(0.0001, 60)
+QUERY_BOUNDS = log_linear_bounds(1, 1024, sub_buckets=2)
+
+
+class Histogram:
+    """
+    Fixed bucket histogram, cheap enough to record on every request
+    """
+
+    def __init__(self, bounds: list[float]):
+        self.bounds = bounds
+        # The final slot counts observations above the last bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+
+    def snapshot(self) -> tuple[list[int], float]:
+        with self._lock:
+            return list(self.counts), self.total
+
+
+class RequestSample:
+    """
+    Costs collected while one request is handled
+    """
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'serializing')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+
+current_sample: ContextVar[RequestSample | None] = ContextVar(
+    'current_sample', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper counting and timing the queries of the
+    request being measured.
+
+    The sample is found through a context variable, which asgiref copies
+    into the threads running the sync code of async requests, so queries
+    are recorded whichever thread runs them.
+    """
+    sample = current_sample.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample.db_time += time.perf_counter() - start
+        sample.queries += 1
+
+
+@contextmanager
+def measure_serialization():
+    """
+    Add the time spent in the block, less its queries, to the serializer
+    time of the request being measured.
+
+    Blocks nested in another one, such as nested serializers, are
+    already counted by the outer block.
+    """
+    sample = current_sample.get()
+    if sample is None or sample.serializing:
+        yield
+        return
+    sample.serializing = True
+    db_time = sample.db_time
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample.serializer_time += (time.perf_counter() - start
+                                   - (sample.db_time - db_time))
+        sample.serializing = False
+
+
+def install_query_recorder(connection):
+    """
+    Record the queries of a connection, once per connection wrapper
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+METRICS = {
+    'api_request_duration_seconds': (
+        'Wall time to produce the response', SECONDS_BOUNDS),
+    'api_db_queries': (
+        'SQL queries run for the request', QUERY_BOUNDS),
+    'api_db_duration_seconds': (
+        'Time spent in SQL queries', SECONDS_BOUNDS),
+    'api_serializer_duration_seconds': (
+        'Time spent building response data in serializers',
+        SECONDS_BOUNDS),
+}
+
+
+class MetricsRegistry:
+    """
+    Histograms for every metric, keyed by endpoint
+    """
+
+    def __init__(self):
+        self._histograms = {name: {} for name in METRICS}
+        self._lock = threading.Lock()
+
+    def _histogram(self, name: str, endpoint: str) -> Histogram:
+        histograms = self._histograms[name]
+        histogram = histograms.get(endpoint)
+        if histogram is None:
+            with self._lock:
+                histogram = histograms.setdefault(
+                    endpoint, Histogram(METRICS[name][1]))
+        return histogram
+
+    def record(self, endpoint: str, sample: RequestSample, elapsed: float):
+        self._histogram('api_request_duration_seconds',
+                        endpoint).observe(elapsed)
+        self._histogram('api_serializer_duration_seconds',
+                        endpoint).observe(sample.serializer_time)
+        self._histogram('api_db_queries',
+                        endpoint).observe(sample.queries)
+        self._histogram('api_db_duration_seconds',
+                        endpoint).observe(sample.db_time)
+
+    def clear(self):
+        with self._lock:
+            for histograms in self._histograms.values():
+                histograms.clear()
+
+    def render(self) -> str:
+        """
+        Return every histogram in the Prometheus text exposition format
+        """
+        lines = []
+        for name, (description, bounds) in METRICS.items():
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} histogram')
+            for endpoint, histogram in sorted(
+                    self._histograms[name].items()):
+                label = _escape(endpoint)
+                counts, total = histogram.snapshot()
+                cumulative = 0
+                for bound, count in zip(bounds, counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{endpoint="{label}",'
+                                 f'le="{bound:g}"}} {cumulative}')
+                cumulative += counts[-1]
+                lines.append(f'{name}_bucket{{endpoint="{label}",'
+                             f'le="+Inf"}} {cumulative}')
+                lines.append(f'{name}_sum{{endpoint="{label}"}} {total:g}')
+                lines.append(
+                    f'{name}_count{{endpoint="{label}"}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+registry = MetricsRegistry()
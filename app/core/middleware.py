@@ -0,0 +1,108 @@
+"""
+Django middleware for the API
+"""
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+
+from core import routers
+from core.metrics import (
+    RequestSample,
+    current_sample,
+    install_query_recorder,
+    registry,
+)
+
+
+def _endpoint(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unresolved'
+
+
+class MetricsMiddleware:
+    """
+    Record latency, SQL and serializer cost per resolved URL name.
+
+    Queries are recorded by core.metrics.record_query, which every
+    connection runs (see core.signals), into the sample of the current
+    context, under WSGI and ASGI alike. Serializer time is recorded the
+    same way by the serializers, through
+    core.metrics.measure_serialization.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Connections opened before the signal handler was connected
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        sample = RequestSample()
+        token = current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        registry.record(_endpoint(request), sample,
+                        time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        sample = RequestSample()
+        token = current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        registry.record(_endpoint(request), sample,
+                        time.perf_counter() - start)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let core.routers.ReplicaRouter send the reads of safe requests to
+    replicas, and pin clients to the primary after they write
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = routers.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing = routers.finish(token)
+        if routing.wrote:
+            routers.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        # The ORM threads of async views copy the context, and with it
+        # the same routing
+        token = routers.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing = routers.finish(token)
+        if routing.wrote:
+            routers.pin(request, response)
+        return response
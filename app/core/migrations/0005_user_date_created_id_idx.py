@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0004_rename_business_client_project_client'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['date_created', 'id'], name='user_date_created_id_idx'),
+        ),
+    ]
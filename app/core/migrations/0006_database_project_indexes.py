@@ -0,0 +1,89 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_user_date_created_id_idx'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.AddIndex(
+            model_name='database',
+            index=models.Index(fields=['owned_by', 'date_created'], name='database_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='database',
+            index=models.Index(fields=['created_by', 'date_created'], name='database_creator_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='database',
+            index=models.Index(fields=['date_created', 'id'], name='database_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='database',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='database_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='database',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('description'), name='gin_trgm_ops'), name='database_description_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['client', 'date_created'], name='project_client_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['database', 'date_created'], name='project_database_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['created_by', 'date_created'], name='project_creator_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['date_created', 'id'], name='project_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='project_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('description'), name='gin_trgm_ops'), name='project_description_trgm_idx'),
+        ),
+        # The composite indexes above lead with the FK columns
+        migrations.AlterField(
+            model_name='database',
+            name='created_by',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.RESTRICT, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='database',
+            name='owned_by',
+            field=models.ForeignKey(db_index=False, help_text='200 characters or fewer.', max_length=200, on_delete=django.db.models.deletion.RESTRICT, to='core.businessclient', verbose_name='Company Name'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='client',
+            field=models.ForeignKey(db_index=False, help_text='Required. 50 characters or fewer.', max_length=50, on_delete=django.db.models.deletion.RESTRICT, to='core.businessclient', verbose_name='Client Name'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='created_by',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.RESTRICT, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='database',
+            field=models.ForeignKey(db_index=False, help_text='Required. 50 characters or fewer.', max_length=50, on_delete=django.db.models.deletion.RESTRICT, to='core.database', verbose_name='Database Name'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:53
+
+from django.db import migrations, models
+
+# (child table, foreign key column, counter column on core_businessclient)
+COUNTERS = [
+    ('core_database', 'owned_by_id', 'database_count'),
+    ('core_project', 'client_id', 'project_count'),
+]
+
+
+def counter_sql(table: str, column: str, counter: str) -> str:
+    """
+    Statement level triggers keeping a client counter in step with the
+    child rows. The transition tables let a bulk insert, COPY, update or
+    delete adjust each affected client once per statement.
+    """
+    function = f'{table}_{counter}'
+    apply = f"""
+        UPDATE core_businessclient AS client
+        SET {counter} = client.{counter} + delta.n
+        FROM (SELECT id, sum(n) AS n FROM (%s) AS changes
+              GROUP BY id HAVING sum(n) <> 0) AS delta
+        WHERE client.id = delta.id;"""
+    added = f'SELECT {column} AS id, 1 AS n FROM new_rows'
+    removed = f'SELECT {column} AS id, -1 AS n FROM old_rows'
+    # Each branch only reads the transition tables its event defines
+    return f"""
+CREATE FUNCTION {function}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN{apply % added}
+    ELSIF TG_OP = 'DELETE' THEN{apply % removed}
+    ELSE{apply % f'{added} UNION ALL {removed}'}
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER {function}_insert AFTER INSERT ON {table}
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+
+CREATE TRIGGER {function}_update AFTER UPDATE ON {table}
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+
+CREATE TRIGGER {function}_delete AFTER DELETE ON {table}
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+
+UPDATE core_businessclient AS client SET {counter} = (
+    SELECT count(*) FROM {table} WHERE {column} = client.id);
+"""
+
+
+def drop_counter_sql(table: str, column: str, counter: str) -> str:
+    return f'DROP FUNCTION {table}_{counter}() CASCADE;'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businessclient',
+            name='database_count',
+            field=models.PositiveIntegerField(db_default=0, default=0, editable=False, verbose_name='databases'),
+        ),
+        migrations.AddField(
+            model_name='businessclient',
+            name='project_count',
+            field=models.PositiveIntegerField(db_default=0, default=0, editable=False, verbose_name='projects'),
+        ),
+        *[migrations.RunSQL(counter_sql(*counter),
+                            drop_counter_sql(*counter))
+          for counter in COUNTERS],
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:12
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0010_memberships'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='businessclient',
+            index=models.Index(fields=['date_created', 'id'], name='businessclient_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('username'), name='gin_trgm_ops'), name='user_username_trgm_idx'),
+        ),
+    ]
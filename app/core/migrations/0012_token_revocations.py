@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenRevocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.BigIntegerField(verbose_name='user id')),
+                ('revoked_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='revoked at')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['revoked_at'], name='tokenrevocation_revoked_idx')],
+            },
+        ),
+    ]
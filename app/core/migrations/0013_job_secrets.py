@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-18 19:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_token_revocations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSecret',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='secret', serialize=False, to='core.job')),
+                ('kwargs', models.JSONField(verbose_name='keyword arguments')),
+            ],
+        ),
+    ]
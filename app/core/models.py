@@ -2,18 +2,40 @@
 Database models
 """
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin
 )
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.utils import timezone
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.exceptions import FieldError
 from django.utils.translation import gettext_lazy as translate
 #  from django.contrib.postgres.fields import ArrayField
 
+# Text search configuration of the search_vector columns and their queries
+SEARCH_CONFIG = 'english'
+
+
+def search_vector_field(*weighted_fields: tuple[str, str]):
+    """
+    A tsvector column Postgres keeps up to date from the given
+    (field, weight) pairs
+    """
+    vectors = [SearchVector(field, config=SEARCH_CONFIG, weight=weight)
+               for field, weight in weighted_fields]
+    expression = vectors[0]
+    for vector in vectors[1:]:
+        expression = expression + vector
+    return models.GeneratedField(expression=expression,
+                                 output_field=SearchVectorField(),
+                                 db_persist=True)
+
 
 class UserManager(BaseUserManager):
     """Manage for users"""
@@ -96,6 +118,35 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "username"
     REQUIRED_FIELDS = []
 
+    # Set while an upgraded hash of the same password is saved
+    password_rehashed = False
+
+    def check_password(self, raw_password: str) -> bool:
+        """
+        Check the password, saving an upgraded hash without it counting
+        as a change of credentials
+        """
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self._password = None
+            self.password_rehashed = True
+            try:
+                self.save(update_fields=['password'])
+            finally:
+                self.password_rehashed = False
+
+        return check_password(raw_password, self.password, setter)
+
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of the admin user listing
+            models.Index(fields=['date_created', 'id'],
+                         name='user_date_created_id_idx'),
+            # Serves the admin's username search and autocompletes
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'),
+                     name='user_username_trgm_idx'),
+        ]
+
 
 class BusinessClient(models.Model):
     name = models.CharField(
@@ -110,6 +161,38 @@ class BusinessClient(models.Model):
         },)
     date_created = models.DateTimeField(translate("date created"),
                                         default=timezone.now)
+    search_vector = search_vector_field(('name', 'A'))
+    # Maintained by triggers on the database and project tables, see
+    # migration 0009 and the recount command
+    database_count = models.PositiveIntegerField(
+        translate("databases"), default=0, db_default=0, editable=False)
+    project_count = models.PositiveIntegerField(
+        translate("projects"), default=0, db_default=0, editable=False)
+
+    COUNTER_FIELDS = frozenset(['database_count', 'project_count'])
+
+    def __str__(self) -> str:
+        return self.name
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Never write back counters that may be stale on this instance
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and not field.generated
+                and field.name not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'],
+                     name='businessclient_search_idx'),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'),
+                     name='businessclient_name_trgm_idx'),
+            # Backs the date hierarchy of the admin changelist
+            models.Index(fields=['date_created', 'id'],
+                         name='businessclient_created_id_idx'),
+        ]
 
 
 class Database(models.Model):
@@ -136,6 +219,7 @@ class Database(models.Model):
         BusinessClient,
         verbose_name=translate("Company Name"),
         on_delete=models.RESTRICT,
+        db_index=False,  # Covered by database_owner_created_idx
         max_length=200,
         help_text=translate(
             "200 characters or fewer."
@@ -143,9 +227,30 @@ class Database(models.Model):
     created_by = models.ForeignKey(
             settings.AUTH_USER_MODEL,
             on_delete=models.RESTRICT,
+            db_index=False,  # Covered by database_creator_created_idx
         )
     date_created = models.DateTimeField(translate("date created"),
                                         default=timezone.now)
+    search_vector = search_vector_field(('name', 'A'), ('description', 'B'))
+
+    def __str__(self) -> str:
+        return self.name
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owned_by', 'date_created'],
+                         name='database_owner_created_idx'),
+            models.Index(fields=['created_by', 'date_created'],
+                         name='database_creator_created_idx'),
+            models.Index(fields=['date_created', 'id'],
+                         name='database_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='database_search_idx'),
+            # Serve name__icontains / description__icontains searches
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'),
+                     name='database_name_trgm_idx'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'),
+                     name='database_description_trgm_idx'),
+        ]
 
 
 class Project(models.Model):
@@ -172,6 +277,7 @@ class Project(models.Model):
         Database,
         verbose_name=translate("Database Name"),
         on_delete=models.RESTRICT,
+        db_index=False,  # Covered by project_database_created_idx
         max_length=50,
         help_text=translate(
             "Required. 50 characters or fewer."
@@ -180,6 +286,7 @@ class Project(models.Model):
         BusinessClient,
         verbose_name=translate("Client Name"),
         on_delete=models.RESTRICT,
+        db_index=False,  # Covered by project_client_created_idx
         max_length=50,
         help_text=translate(
             "Required. 50 characters or fewer."
@@ -187,6 +294,149 @@ class Project(models.Model):
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.RESTRICT,
+        db_index=False,  # Covered by project_creator_created_idx
+    )
+    date_created = models.DateTimeField(translate("date created"),
+                                        default=timezone.now)
+    search_vector = search_vector_field(('name', 'A'), ('description', 'B'))
+
+    def __str__(self) -> str:
+        return self.name
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['client', 'date_created'],
+                         name='project_client_created_idx'),
+            models.Index(fields=['database', 'date_created'],
+                         name='project_database_created_idx'),
+            models.Index(fields=['created_by', 'date_created'],
+                         name='project_creator_created_idx'),
+            models.Index(fields=['date_created', 'id'],
+                         name='project_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='project_search_idx'),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'),
+                     name='project_name_trgm_idx'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'),
+                     name='project_description_trgm_idx'),
+        ]
+
+
+class Membership(models.Model):
+    """
+    Grants a user a client, with its databases and projects
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='memberships',
+        db_index=False,  # Covered by membership_user_client_uniq
+    )
+    client = models.ForeignKey(
+        BusinessClient,
+        verbose_name=translate("Client Name"),
+        on_delete=models.CASCADE,
+        related_name='memberships',
     )
     date_created = models.DateTimeField(translate("date created"),
                                         default=timezone.now)
+
+    class Meta:
+        constraints = [
+            # Lists a user's clients with an index only scan
+            models.UniqueConstraint(fields=['user', 'client'],
+                                    name='membership_user_client_uniq'),
+        ]
+
+
+class Job(models.Model):
+    """
+    Background job run by the run_worker command
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', translate('Queued')
+        RUNNING = 'running', translate('Running')
+        SUCCEEDED = 'succeeded', translate('Succeeded')
+        FAILED = 'failed', translate('Failed')
+
+    name = models.CharField(
+        translate("task"),
+        max_length=200,
+        help_text=translate("Dotted path of the function to run."),)
+    payload = models.JSONField(
+        translate("payload"),
+        null=True,
+        help_text=translate("Arguments of the call, removed once the job "
+                            "is finished."),)
+    status = models.CharField(translate("status"),
+                              max_length=10,
+                              choices=Status.choices,
+                              default=Status.QUEUED)
+    result = models.JSONField(translate("result"), null=True, blank=True)
+    error = models.TextField(translate("error"), blank=True)
+    attempts = models.PositiveSmallIntegerField(translate("attempts"),
+                                                default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        translate("maximum attempts"), default=3)
+    run_after = models.DateTimeField(translate("run after"),
+                                     default=timezone.now)
+    locked_by = models.CharField(translate("worker"),
+                                 max_length=200,
+                                 blank=True)
+    locked_at = models.DateTimeField(translate("started"),
+                                     null=True,
+                                     blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+    date_created = models.DateTimeField(translate("date created"),
+                                        default=timezone.now)
+    date_finished = models.DateTimeField(translate("date finished"),
+                                         null=True,
+                                         blank=True)
+
+    class Meta:
+        indexes = [
+            # The queue: jobs ready to run, and running ones that may be
+            # stuck, are found without scanning finished jobs
+            models.Index(fields=['run_after', 'id'],
+                         condition=models.Q(status='queued'),
+                         name='job_queued_idx'),
+            models.Index(fields=['locked_at'],
+                         condition=models.Q(status='running'),
+                         name='job_running_idx'),
+            models.Index(fields=['date_created', 'id'],
+                         name='job_created_id_idx'),
+        ]
+
+
+class JobSecret(models.Model):
+    """
+    Keyword arguments of a job kept out of its payload, such as the
+    passwords of new users, and deleted once the job is finished
+    """
+    job = models.OneToOneField(Job,
+                               primary_key=True,
+                               on_delete=models.CASCADE,
+                               related_name='secret')
+    kwargs = models.JSONField(translate("keyword arguments"))
+
+
+class TokenRevocation(models.Model):
+    """
+    Access tokens of a user issued up to ``revoked_at`` are invalid
+    """
+    # Not a foreign key: deleting a user must revoke their tokens too
+    user_id = models.BigIntegerField(translate("user id"))
+    revoked_at = models.DateTimeField(translate("revoked at"),
+                                      default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Revocations older than the token lifetime are pruned
+            models.Index(fields=['revoked_at'],
+                         name='tokenrevocation_revoked_idx'),
+        ]
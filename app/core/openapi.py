@@ -0,0 +1,42 @@
+"""
+OpenAPI annotations for views, and the imports API only workers skip
+"""
+import importlib
+import sys
+import types
+
+from django.conf import settings
+
+if settings.API_ONLY:
+    def extend_schema(*args, **kwargs):
+        """
+        Leave the view as it is, since API only workers serve no schema
+        and do not install drf_spectacular
+        """
+        return lambda view: view
+else:
+    from drf_spectacular.utils import extend_schema  # noqa: F401
+
+ADMINDOCS_VIEWS = 'django.contrib.admindocs.views'
+
+
+def defer_admindocs():
+    """
+    Stand in for django.contrib.admindocs.views until simplify_regex is
+    first called.
+
+    DRF's schema generators import it when any view is loaded, and it
+    imports the admin, although only schema generation uses it.
+    """
+    if ADMINDOCS_VIEWS in sys.modules:
+        return
+    stub = types.ModuleType(ADMINDOCS_VIEWS)
+
+    def simplify_regex(pattern: str) -> str:
+        if sys.modules.get(ADMINDOCS_VIEWS) is stub:
+            del sys.modules[ADMINDOCS_VIEWS]
+        return importlib.import_module(ADMINDOCS_VIEWS).simplify_regex(
+            pattern)
+
+    stub.simplify_regex = simplify_regex
+    sys.modules[ADMINDOCS_VIEWS] = stub
@@ -0,0 +1,214 @@
+"""
+Pagination classes shared by the API apps
+"""
+import json
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from functools import reduce
+from operator import or_
+from typing import override
+
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+KeysetCursor = namedtuple('KeysetCursor', ['reverse', 'position'])
+
+
+def _field(key: str) -> str:
+    return key.lstrip('-')
+
+
+def _flip(key: str) -> str:
+    return key[1:] if key.startswith('-') else f'-{key}'
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (seek) pagination over a composite ordering.
+
+    Unlike DRF's CursorPagination, which seeks on the first ordering
+    field and skips ties with an OFFSET, the cursor here stores the
+    full ordering key of the boundary row. Each page is a single
+    range scan on the matching composite index, so the cost of a page
+    does not depend on how deep the client has paged. An ordering
+    filter on the view may choose the key; ``id`` breaks ties.
+    """
+    ordering = ('date_created', 'id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    @override
+    def get_ordering(self, request, queryset, view) -> tuple:
+        """
+        Return the ordering asked for through an ordering filter, or the
+        default, with ``id`` appended to make every key unique
+        """
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            # The class default, as paginate_queryset sets self.ordering
+            return tuple(type(self).ordering)
+        ordering = tuple(ordering)
+        if not any(_field(key) in ('id', 'pk') for key in ordering):
+            ordering += ('id',)
+        return ordering
+
+    @override
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            self.cursor = KeysetCursor(reverse=False, position=None)
+
+        reverse = self.cursor.reverse
+        order_by = [_flip(key) if reverse else key for key in self.ordering]
+        queryset = queryset.order_by(*order_by)
+        if self.cursor.position is not None:
+            queryset = queryset.filter(
+                self._seek_filter(self.cursor.position, reverse))
+
+        # Fetch one extra row to know whether another page follows
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if reverse:
+            self.has_previous = has_more
+            self.has_next = self.cursor.position is not None
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor.position is not None
+        return self.page
+
+    def _seek_filter(self, position, reverse: bool) -> Q:
+        """
+        Build the row comparison ``(a, b, ...) > (x, y, ...)``, with the
+        comparison flipped for descending keys.
+
+        The leading ``a >= x`` term is redundant but lets the planner
+        use it as the index range bound instead of filtering an OR.
+        """
+        fields = [_field(key) for key in self.ordering]
+        ops = [('lt' if key.startswith('-') != reverse else 'gt')
+               for key in self.ordering]
+        branches = []
+        for index, field in enumerate(fields):
+            equal = {f: position[i] for i, f in enumerate(fields[:index])}
+            equal[f'{field}__{ops[index]}'] = position[index]
+            branches.append(Q(**equal))
+        lead_op = {'gt': 'gte', 'lt': 'lte'}[ops[0]]
+        leading = Q(**{f'{fields[0]}__{lead_op}': position[0]})
+        return leading & reduce(or_, branches)
+
+    def _position(self, instance) -> list:
+        return [getattr(instance, _field(key)) for key in self.ordering]
+
+    @override
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url,
+                                      self.cursor_query_param)
+        return self.encode_cursor(
+            KeysetCursor(reverse=False, position=self._position(
+                self.page[-1])))
+
+    @override
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url,
+                                      self.cursor_query_param)
+        return self.encode_cursor(
+            KeysetCursor(reverse=True, position=self._position(
+                self.page[0])))
+
+    @override
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(b64decode(encoded.encode('ascii')))
+            reverse = bool(payload['r'])
+            values = payload['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = tuple(
+                self.model._meta.get_field(_field(key)).to_python(value)
+                for key, value in zip(self.ordering, values))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return KeysetCursor(reverse=reverse, position=position)
+
+    @override
+    def encode_cursor(self, cursor):
+        values = [value.isoformat() if hasattr(value, 'isoformat')
+                  else value for value in cursor.position]
+        payload = json.dumps({'r': int(cursor.reverse), 'p': values},
+                             separators=(',', ':'))
+        encoded = b64encode(payload.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   encoded)
+
+
+def estimated_rows(model) -> int:
+    """
+    Postgres' estimate of the rows of a model's table, as of its last
+    VACUUM or ANALYZE, or -1 when it has not been analyzed
+    """
+    with connections[router.db_for_read(model)].cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [model._meta.db_table])
+        row = cursor.fetchone()
+    return row[0] if row else -1
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists that counts at most ``exact_limit``
+    rows.
+
+    An exact COUNT(*) reads every matching row, which takes seconds at
+    millions of rows. Unfiltered lists of tables estimated above the
+    limit report the table estimate instead, and filtered lists that
+    reach the limit report the planner's estimate of their rows.
+    """
+    exact_limit = 10000
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+        estimate = estimated_rows(queryset.model)
+        if estimate <= self.exact_limit:
+            return super().count
+        if not queryset.query.where:
+            return estimate
+        counted = queryset.order_by()[:self.exact_limit + 1].count()
+        if counted <= self.exact_limit:
+            return counted
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return max(counted, int(plan[0]['Plan']['Plan Rows']))
@@ -0,0 +1,156 @@
+"""
+Send the reads of safe requests to read replicas and writes to 'default'.
+
+ReplicaRoutingMiddleware marks each request. Reads go to a replica only
+for GET, HEAD and OPTIONS requests from clients that have not written in
+the last READ_REPLICAS['PIN_SECONDS'], so clients read their own writes.
+Once a request writes, its remaining reads use the primary as well.
+Queries outside a request, such as those of commands and jobs, always
+use the primary.
+"""
+import contextvars
+import hashlib
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_PREFIX = 'db-pin:'
+PIN_COOKIE = 'db_pin'
+# The app label of the entries of Django's database cache
+CACHE_APP = 'django_cache'
+
+
+def replica_settings() -> dict:
+    return {
+        'ALIASES': [],
+        'PIN_SECONDS': 5,
+        'CACHE': 'shared',
+        'PRIMARY_APPS': [],
+        **getattr(settings, 'READ_REPLICAS', {}),
+    }
+
+
+class Routing:
+    """
+    Where the queries of one request go
+    """
+    __slots__ = ('replica', 'wrote')
+
+    def __init__(self, replica: str | None = None):
+        self.replica = replica
+        self.wrote = False
+
+
+_routing = contextvars.ContextVar('db_routing', default=None)
+
+
+def reading_replica() -> bool:
+    """
+    Whether reads made now go to a replica
+    """
+    routing = _routing.get()
+    return (routing is not None and routing.replica is not None
+            and not routing.wrote)
+
+
+def replica_may_lag(since: float) -> bool:
+    """
+    Whether reads made now may miss a write made at ``since``
+    """
+    return (reading_replica()
+            and time.time() - since < replica_settings()['PIN_SECONDS'])
+
+
+def _pin_key(request) -> str | None:
+    # Token clients send their token and browsers their session cookie
+    credential = (request.META.get('HTTP_AUTHORIZATION')
+                  or request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+    if not credential:
+        return None
+    return PIN_PREFIX + hashlib.sha256(credential.encode()).hexdigest()
+
+
+def is_pinned(request) -> bool:
+    """
+    Whether the client of a request wrote within the pin window
+    """
+    key = _pin_key(request)
+    if key is not None and caches[replica_settings()['CACHE']].get(key):
+        return True
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def pin(request, response):
+    """
+    Read the client's next requests from the primary for PIN_SECONDS
+    """
+    seconds = replica_settings()['PIN_SECONDS']
+    key = _pin_key(request)
+    if key is not None:
+        # For clients that drop cookies
+        caches[replica_settings()['CACHE']].set(key, True, seconds)
+    # Seen by whichever process serves the next request
+    response.set_cookie(PIN_COOKIE, str(time.time() + seconds),
+                        max_age=seconds, httponly=True, samesite='Lax')
+
+
+def start(request) -> contextvars.Token:
+    """
+    Route the queries of a request until ``finish`` is called
+    """
+    aliases = replica_settings()['ALIASES']
+    replica = None
+    if (aliases and request.method in ('GET', 'HEAD', 'OPTIONS')
+            and not is_pinned(request)):
+        # One replica per request, so its reads see a single snapshot
+        replica = random.choice(aliases)
+    return _routing.set(Routing(replica))
+
+
+def finish(token: contextvars.Token) -> Routing:
+    routing = _routing.get()
+    _routing.reset(token)
+    return routing
+
+
+class ReplicaRouter:
+    """
+    Database router reading from replicas where ``start`` allowed it
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if (routing is None or routing.replica is None or routing.wrote
+                or model._meta.app_label
+                in replica_settings()['PRIMARY_APPS']
+                # Reads inside a transaction must see its writes
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        # Cache entries written by a read, such as a new resource version,
+        # are read from the primary anyway
+        if routing is not None and model._meta.app_label != CACHE_APP:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        aliases = {DEFAULT_DB_ALIAS, *replica_settings()['ALIASES']}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas receive the schema from the primary
+        if db in replica_settings()['ALIASES']:
+            return False
+        return None
@@ -0,0 +1,201 @@
+"""
+The OpenAPI schema, generated once per change to the API and served from
+memory.
+
+Generating the schema introspects every view and serializer, which takes
+hundreds of milliseconds. ``fingerprint`` instead hashes the installed
+versions, the API settings and the source of every module of the
+project, as views, serializers, models, filters and pagination all shape
+the schema, so it changes whenever the schema can. The schema of each
+fingerprint is written to SCHEMA_CACHE_DIR, by ``manage.py build_schema``
+when the image is built or by the first request otherwise, and each
+process renders and compresses it once per format.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+import django
+import drf_spectacular
+import rest_framework
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.functional import cached_property
+from django.utils.http import quote_etag
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.plumbing import set_query_parameters
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import (
+    SCHEMA_KWARGS,
+    SpectacularAPIView,
+    SpectacularSwaggerView,
+)
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+# A client fetching the schema URL of the current fingerprint never needs
+# to ask again
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, no-cache'
+
+_lock = threading.Lock()
+_fingerprint = None
+_schemas = {}
+_documents = {}
+
+
+def _sources() -> list[Path]:
+    """
+    The modules of the project, leaving out its tests
+    """
+    base = Path(settings.BASE_DIR)
+    return sorted(path for path in base.rglob('*.py')
+                  if 'tests' not in path.relative_to(base).parts)
+
+
+def fingerprint() -> str:
+    """
+    Hash everything the generated schema depends on, computed once per
+    process
+    """
+    global _fingerprint
+    if _fingerprint is not None:
+        return _fingerprint
+    digest = hashlib.sha256()
+    for value in (django.get_version(), rest_framework.VERSION,
+                  drf_spectacular.__version__,
+                  repr(getattr(settings, 'REST_FRAMEWORK', {})),
+                  repr(getattr(settings, 'SPECTACULAR_SETTINGS', {}))):
+        digest.update(value.encode())
+    base = Path(settings.BASE_DIR)
+    for path in _sources():
+        digest.update(str(path.relative_to(base)).encode())
+        digest.update(path.read_bytes())
+    _fingerprint = digest.hexdigest()[:16]
+    return _fingerprint
+
+
+def schema_path(key: str) -> Path:
+    return Path(settings.SCHEMA_CACHE_DIR) / f'openapi-{key}.json'
+
+
+def generate() -> dict:
+    return SchemaGenerator().get_schema(request=None, public=True)
+
+
+def write(schema: dict, key: str) -> Path:
+    """
+    Write the schema of a fingerprint, replacing those of older ones
+    """
+    path = schema_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix('.tmp')
+    temporary.write_bytes(JSONRenderer().render(schema))
+    temporary.replace(path)
+    for stale in path.parent.glob('openapi-*.json'):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return path
+
+
+def get_schema() -> dict:
+    """
+    The schema of the current fingerprint, read from SCHEMA_CACHE_DIR or
+    generated and written there
+    """
+    key = fingerprint()
+    if key in _schemas:
+        return _schemas[key]
+    with _lock:
+        if key not in _schemas:
+            path = schema_path(key)
+            try:
+                schema = json.loads(path.read_bytes())
+            except (OSError, ValueError):
+                schema = generate()
+                try:
+                    write(schema, key)
+                except OSError:
+                    logger.warning('Could not write the schema to %s',
+                                   path, exc_info=True)
+            _schemas[key] = schema
+    return _schemas[key]
+
+
+class Document:
+    """
+    The schema rendered in one format, with its ETags
+    """
+
+    def __init__(self, content: bytes, content_type: str):
+        self.content = content
+        self.content_type = content_type
+        self.etag = quote_etag(hashlib.sha256(content).hexdigest()[:32])
+
+    @cached_property
+    def gzipped(self) -> bytes:
+        return gzip.compress(self.content, mtime=0)
+
+    @property
+    def gzip_etag(self) -> str:
+        return self.etag[:-1] + '-gzip"'
+
+
+def get_document(renderer) -> Document:
+    """
+    The schema rendered by a renderer, rendered once per process
+    """
+    key = (fingerprint(), type(renderer))
+    document = _documents.get(key)
+    if document is None:
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type += f'; charset={renderer.charset}'
+        document = _documents[key] = Document(
+            renderer.render(get_schema(), renderer_context={}), content_type)
+    return document
+
+
+class PrecomputedSchemaView(SpectacularAPIView):
+    """
+    Serve the precomputed schema with ETags and gzip. Requests for
+    another language or version are generated as before.
+    """
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('lang') or request.GET.get('version'):
+            return super().get(request, *args, **kwargs)
+        document = get_document(request.accepted_renderer)
+        gzipped = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        etag = document.gzip_etag if gzipped else document.etag
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                document.gzipped if gzipped else document.content,
+                content_type=document.content_type)
+            if gzipped:
+                response['Content-Encoding'] = 'gzip'
+        response['ETag'] = etag
+        response['Cache-Control'] = (
+            IMMUTABLE if request.GET.get('v') == fingerprint()
+            else REVALIDATE)
+        patch_vary_headers(response, ['Accept', 'Accept-Encoding'])
+        return response
+
+
+class PrecomputedSwaggerView(SpectacularSwaggerView):
+    """
+    Swagger UI loading the schema from a URL naming its fingerprint, so
+    browsers cache it until the API changes
+    """
+
+    def _get_schema_url(self, request):
+        return set_query_parameters(super()._get_schema_url(request),
+                                    v=fingerprint())
@@ -0,0 +1,36 @@
+"""
+Serializers for the core API views
+"""
+from typing import override
+from rest_framework import serializers
+
+from core.metrics import measure_serialization
+from core.models import Job
+
+
+class MeasuredSerializerMixin:
+    """
+    Record the time taken to build the serializer's output as the
+    serializer time of the request.
+
+    List serializers call the child's to_representation per item, so
+    lists are measured too.
+    """
+
+    @override
+    def to_representation(self, instance) -> dict:
+        with measure_serialization():
+            return super().to_representation(instance)
+
+
+class JobSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializer for the state of a background job
+    """
+
+    class Meta:
+        model = Job
+        fields = ['id', 'name', 'status', 'attempts', 'max_attempts',
+                  'result', 'error', 'run_after', 'date_created',
+                  'date_finished']
+        read_only_fields = fields
@@ -0,0 +1,89 @@
+"""
+Signal handlers for the core models
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from core import tokens
+from core.access import access_resource
+from core.authentication import invalidate_token, invalidate_user
+from core.conditional import bump_version
+from core.metrics import install_query_recorder
+from core.models import BusinessClient, Database, Membership, Project
+
+# Fields that change what a cached token is allowed to do
+AUTH_FIELDS = frozenset(['password', 'is_active', 'is_staff',
+                         'is_superuser'])
+# Fields saved on their own that no API response shows
+UNLISTED_FIELDS = frozenset(['last_login'])
+
+
+@receiver(connection_created)
+def connection_opened(sender, connection, **kwargs):
+    """Record the queries of the connection for the request metrics"""
+    install_query_recorder(connection)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance: Token, **kwargs):
+    """Forget a deleted token and the access tokens it refreshed"""
+    invalidate_token(instance.key)
+    # Other processes drop their copy when the user's version changes
+    invalidate_user(instance.user_id)
+    tokens.revoke(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, created=False, update_fields=None,
+               **kwargs):
+    """Forget the tokens of a user whose access may have changed"""
+    if update_fields is not None and not AUTH_FIELDS & set(update_fields):
+        return
+    if instance.password_rehashed:
+        return
+    invalidate_user(instance.pk)
+    if not created:
+        tokens.revoke(instance.pk)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleted(sender, instance, **kwargs):
+    """Revoke the access tokens of a deleted user"""
+    tokens.revoke(instance.pk)
+
+
+@receiver(post_save, sender=BusinessClient)
+@receiver(post_delete, sender=BusinessClient)
+def client_changed(sender, **kwargs):
+    """Invalidate cached client responses"""
+    bump_version('client')
+
+
+@receiver(post_save, sender=Database)
+@receiver(post_delete, sender=Database)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def client_counts_changed(sender, **kwargs):
+    """Invalidate cached client responses, which show the counters"""
+    bump_version('client')
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cached user responses"""
+    if update_fields is not None and set(update_fields) <= UNLISTED_FIELDS:
+        return
+    if instance.password_rehashed:
+        return
+    bump_version('user')
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def membership_changed(sender, instance: Membership, **kwargs):
+    """Drop the cached client IDs of the member"""
+    bump_version(access_resource(instance.user_id))
@@ -0,0 +1,137 @@
+"""
+Tests for per-user access to clients, databases and projects
+"""
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.access import allowed_client_ids, grant
+from core.cache import LRUCache
+from core.conditional import body_cache
+from core.models import BusinessClient, Database, Membership, Project
+
+CLIENTS_URL = reverse('client:clients-list')
+DATABASES_URL = reverse('database:databases-list')
+PROJECTS_URL = reverse('project:projects-list')
+
+
+class MembershipAccessTests(TestCase):
+    """
+    Test members only see the clients they are granted
+    """
+
+    def setUp(self):
+        cache.clear()
+        body_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            username='member', password='testpass123')
+        self.acme = BusinessClient.objects.create(name='Acme')
+        self.apex = BusinessClient.objects.create(name='Apex')
+        Membership.objects.create(user=self.user, client=self.acme)
+        for client in (self.acme, self.apex):
+            database = Database.objects.create(
+                name=f'{client.name} DB', description='Sample',
+                owned_by=client, created_by=self.user)
+            Project.objects.create(
+                name=f'{client.name} Project', description='Sample',
+                client=client, database=database, created_by=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_lists_scoped(self):
+        """Test the rows of other clients are hidden"""
+        res = self.client.get(CLIENTS_URL)
+        self.assertEqual([row['name'] for row in res.data], ['Acme'])
+        res = self.client.get(DATABASES_URL)
+        self.assertEqual([row['name'] for row in res.data['results']],
+                         ['Acme DB'])
+        res = self.client.get(PROJECTS_URL)
+        self.assertEqual([row['name'] for row in res.data['results']],
+                         ['Acme Project'])
+
+    def test_other_client_not_found(self):
+        """Test a client the user is not a member of is a 404"""
+        url = reverse('client:clients-detail', args=[self.apex.id])
+        self.assertEqual(self.client.get(url).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.delete(url).status_code,
+                         status.HTTP_404_NOT_FOUND)
+
+    def test_allowed_ids_cached(self):
+        """Test the allowed IDs are read once until memberships change"""
+        with self.assertNumQueries(1):
+            self.assertEqual(allowed_client_ids(self.user),
+                             {self.acme.id})
+        # The access version is still fresh in this process
+        with self.assertNumQueries(0):
+            allowed_client_ids(self.user)
+
+        Membership.objects.create(user=self.user, client=self.apex)
+        self.assertEqual(allowed_client_ids(self.user),
+                         {self.acme.id, self.apex.id})
+
+        self.user.memberships.all().delete()
+        self.assertEqual(allowed_client_ids(self.user), frozenset())
+
+    def test_revoked_by_other_process(self):
+        """Test a membership removed in another process is dropped"""
+        self.assertEqual(allowed_client_ids(self.user), {self.acme.id})
+        # A new connection to the cache and empty local versions stand in
+        # for another process, whose bump this process's cache never saw
+        other = caches.create_connection('shared')
+        with patch('core.conditional.version_cache', return_value=other), \
+                patch('core.conditional.local_versions', LRUCache()):
+            Membership.objects.filter(user=self.user).delete()
+        # Seen once this process's copy of the version is VERSION_TTL old
+        later = time.monotonic() + 1
+        with patch('core.conditional.time.monotonic', return_value=later):
+            self.assertEqual(allowed_client_ids(self.user), frozenset())
+            url = reverse('client:clients-detail', args=[self.acme.id])
+            self.assertEqual(self.client.get(url).status_code,
+                             status.HTTP_404_NOT_FOUND)
+
+    def test_grant_changes_etag(self):
+        """Test a new membership is not answered from the old ETag"""
+        etag = self.client.get(CLIENTS_URL)['ETag']
+        grant(self.user, [self.apex])
+        res = self.client.get(CLIENTS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+
+    def test_cached_bodies_not_shared(self):
+        """Test a staff response is not served to a member"""
+        admin = get_user_model().objects.create_user(
+            username='staff', password='testpass123', is_staff=True)
+        staff_client = APIClient()
+        staff_client.force_authenticate(admin)
+        self.assertEqual(len(staff_client.get(CLIENTS_URL).data), 2)
+        self.assertEqual(len(self.client.get(CLIENTS_URL).data), 1)
+
+    def test_created_client_granted(self):
+        """Test a member can see the clients they create"""
+        res = self.client.post(CLIENTS_URL, {'name': 'Avid'})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Membership.objects.filter(
+            user=self.user, client__name='Avid').exists())
+        self.assertEqual(len(self.client.get(CLIENTS_URL).data), 2)
+
+    def test_create_under_other_client_denied(self):
+        """Test a database or project is not filed under another client"""
+        res = self.client.post(DATABASES_URL, {
+            'name': 'Apex DB2', 'description': 'Sample',
+            'owned_by': self.apex.id})
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        res = self.client.post(PROJECTS_URL, {
+            'name': 'Acme Project2', 'description': 'Sample',
+            'client': self.acme.id,
+            'database': Database.objects.get(name='Apex DB').id})
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Project.objects.filter(
+            name='Acme Project2').exists())
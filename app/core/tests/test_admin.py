@@ -1,12 +1,16 @@
 """
 Tests for the Django admin modifications
 """
+from unittest.mock import patch
 
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.test import Client
 
+from core.models import BusinessClient, Database, Project
+from core.pagination import EstimatedCountPaginator
+
 
 class AdminSiteTests(TestCase):
     """
@@ -60,3 +64,81 @@ class AdminSiteTests(TestCase):
         url = reverse('admin:core_user_add')
         res = self.client.get(url)
         self.assertEqual(res.status_code, 200)
+
+    def test_model_changelists(self):
+        """
+        Test the client, database and project pages search and list
+        related names without a query per row
+        """
+        acme = BusinessClient.objects.create(name='Acme')
+        for i in range(3):
+            database = Database.objects.create(
+                name=f'Acme DB{i}', description='Sample', owned_by=acme,
+                created_by=self.user)
+            Project.objects.create(
+                name=f'Acme Project{i}', description='Sample', client=acme,
+                database=database, created_by=self.user)
+        for model in ('businessclient', 'database', 'project'):
+            url = reverse(f'admin:core_{model}_changelist')
+            res = self.client.get(url, {'q': 'acme'})
+            self.assertContains(res, 'Acme')
+            self.assertContains(res, 'date_created__year')
+
+        url = reverse('admin:core_project_changelist')
+        with self.assertNumQueries(7):
+            self.client.get(url)
+        Project.objects.create(
+            name='Acme Project3', description='Sample', client=acme,
+            database=database, created_by=self.admin_user)
+        with self.assertNumQueries(7):
+            self.client.get(url)
+
+    def test_autocomplete(self):
+        """
+        Test foreign keys are chosen by searching clients
+        """
+        BusinessClient.objects.create(name='Acme')
+        BusinessClient.objects.create(name='Apex')
+        res = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'core', 'model_name': 'database',
+            'field_name': 'owned_by', 'term': 'acm'})
+        self.assertEqual([row['text'] for row in res.json()['results']],
+                         ['Acme'])
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    """
+    Test admin counts on tables too large to count
+    """
+
+    def setUp(self):
+        for name in ('Acme', 'Apex', 'Avid'):
+            BusinessClient.objects.create(name=name)
+
+    def paginator(self, queryset):
+        paginator = EstimatedCountPaginator(queryset, 100)
+        paginator.exact_limit = 1
+        return paginator
+
+    @patch('core.pagination.estimated_rows', return_value=5000000)
+    def test_large_table_estimated(self, estimated_rows):
+        """Test an unfiltered large table reports its estimate"""
+        with self.assertNumQueries(0):
+            count = self.paginator(BusinessClient.objects.order_by('id')).count
+        self.assertEqual(count, 5000000)
+
+    @patch('core.pagination.estimated_rows', return_value=5000000)
+    def test_filter_counted_to_limit(self, estimated_rows):
+        """Test a filter below the limit is counted exactly"""
+        queryset = BusinessClient.objects.filter(name='Acme').order_by('id')
+        self.assertEqual(self.paginator(queryset).count, 1)
+
+        queryset = BusinessClient.objects.filter(
+            name__startswith='A').order_by('id')
+        self.assertGreaterEqual(self.paginator(queryset).count, 2)
+
+    def test_small_table_counted(self):
+        """Test tables under the limit are counted exactly"""
+        paginator = EstimatedCountPaginator(
+            BusinessClient.objects.order_by('id'), 100)
+        self.assertEqual(paginator.count, 3)
@@ -0,0 +1,136 @@
+"""
+Tests for the cached token authentication
+"""
+import time
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase, SimpleTestCase
+from django.contrib.auth import get_user_model
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from core.authentication import (
+    CachedTokenAuthentication,
+    invalidate_user,
+    token_cache,
+)
+from core.cache import LRUCache
+from core.conditional import local_versions
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test tokens are served from the cache until invalidated"""
+
+    def setUp(self):
+        token_cache.clear()
+        local_versions.clear()
+        self.user = get_user_model().objects.create_user(
+            username='testUser',
+            password='testpass123',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def authenticate(self):
+        request = APIRequestFactory().get(
+            '/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        return self.auth.authenticate(request)
+
+    def test_cached_lookup_skips_database(self):
+        """Test later requests run no query"""
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_deactivated_user_invalidated(self):
+        """Test deactivating a user drops the cached token"""
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_password_change_invalidated(self):
+        """Test changing the password drops the cached token"""
+        self.authenticate()
+        self.user.set_password('newpass123')
+        self.user.save(update_fields=['password'])
+        # The token, as the new auth version is known in this process
+        with self.assertNumQueries(1):
+            self.authenticate()
+
+    def test_unrelated_update_keeps_cache(self):
+        """Test saving fields that do not affect access keeps the entry"""
+        self.authenticate()
+        self.user.first_name = 'Changed'
+        self.user.save(update_fields=['first_name'])
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    def test_deleted_token_invalidated(self):
+        """Test deleting the token drops the cached entry"""
+        self.authenticate()
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_invalidated_under_cache_pressure(self):
+        """Test invalidation works after other entries filled the cache"""
+        self.authenticate()
+        for number in range(token_cache.max_size):
+            token_cache.get(self.token.key)
+            token_cache.set(f'filler{number}', None)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_invalidated_by_other_process(self):
+        """Test a change made in another process drops the local entry"""
+        self.authenticate()
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False)
+        # A new connection to the cache and empty local versions stand in
+        # for another process
+        other = caches.create_connection('shared')
+        with patch('core.conditional.version_cache', return_value=other), \
+                patch('core.conditional.local_versions', LRUCache()):
+            invalidate_user(self.user.pk)
+        # Still served until this process's copy is VERSION_TTL old
+        self.authenticate()
+        later = time.monotonic() + 1
+        with patch('core.conditional.time.monotonic', return_value=later), \
+                self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_version_ttl_bounds_staleness(self):
+        """Test the auth version is read again after its own TTL"""
+        self.authenticate()
+        with self.settings(TOKEN_AUTH_CACHE={'VERSION_TTL': 0}), \
+                self.assertNumQueries(1):
+            self.authenticate()
+
+
+class LRUCacheTests(SimpleTestCase):
+    """Test the in-process LRU cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest unused entry is evicted when full"""
+        cache = LRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_expired_entry_missing(self):
+        """Test entries past their time to live are not returned"""
+        cache = LRUCache(max_size=2, ttl=0)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
@@ -2,13 +2,22 @@
 Test custom Django management commands
 """
 
+import json
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as psycopg2Error
 
-from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models import F
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.management.commands.profile_imports import parse_importtime
+from core.management.commands.seed_data import reserve_ids
+from core.models import BusinessClient, Database, Project
 
 
 @patch("core.management.commands.wait_for_db.Command.check")
@@ -44,3 +53,204 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+    @patch('core.management.commands.wait_for_db.connections')
+    def test_wait_for_db_warms_pool(self, patched_connections,
+                                    patched_check: patch):
+        """Test the connection pool is warmed once the database is up"""
+        pool = patched_connections['default'].pool
+        pool.warm.side_effect = [OperationalError, 2]
+        pool.max_size = 10
+
+        with patch('time.sleep'):
+            out = StringIO()
+            call_command('wait_for_db', stdout=out)
+
+        self.assertEqual(pool.warm.call_count, 2)
+        self.assertIn('2 of 10 connections', out.getvalue())
+
+
+@override_settings(PASSWORD_HASHER_COST={'PBKDF2_ITERATIONS': 1000})
+class BenchmarkLoginCommandTests(TestCase):
+    """
+    Test the login benchmark command.
+    """
+    def test_benchmark_login(self):
+        """Test tokens are issued and the benchmark user removed"""
+        out = StringIO()
+        call_command('benchmark_login', requests=3, stdout=out)
+
+        self.assertIn('Tokens/s total', out.getvalue())
+        self.assertFalse(get_user_model().objects.filter(
+            username__startswith='benchmark-').exists())
+
+
+class BenchmarkSerializersCommandTests(TestCase):
+    """
+    Test the serializer benchmark command.
+    """
+    def test_benchmark_serializers(self):
+        """Test both paths render the same bodies and rows are removed"""
+        out, err = StringIO(), StringIO()
+        call_command('benchmark_serializers', rows=[5, 20], stdout=out,
+                     stderr=err)
+
+        self.assertEqual(out.getvalue().count(' rows '), 4)
+        self.assertEqual(err.getvalue(), '')
+        self.assertFalse(get_user_model().objects.filter(
+            username__startswith='benchmark-').exists())
+
+
+class BenchmarkRenderersCommandTests(SimpleTestCase):
+    """
+    Test the JSON renderer benchmark command.
+    """
+    def test_benchmark_renderers(self):
+        """Test render and parse throughput is reported for each size"""
+        out, err = StringIO(), StringIO()
+        call_command('benchmark_renderers', rows=[10], repeat=1,
+                     stdout=out, stderr=err)
+
+        self.assertIn('render      10 rows', out.getvalue())
+        self.assertIn('parse       10 rows', out.getvalue())
+        self.assertEqual(err.getvalue(), '')
+
+
+class BenchmarkApiCommandTests(TestCase):
+    """
+    Test the API load testing command.
+    """
+    def test_benchmark_api(self):
+        """Test every endpoint is reported and the seed is removed"""
+        out, err = StringIO(), StringIO()
+        call_command('benchmark_api', users=3, clients=2, databases=2,
+                     projects=2, requests=3, token_requests=1,
+                     stdout=out, stderr=err)
+
+        report = json.loads(out.getvalue())
+        self.assertIn('token', report['results'])
+        self.assertIn('clients-list', report['results'])
+        for result in report['results'].values():
+            self.assertEqual(result['errors'], 0)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+        self.assertFalse(get_user_model().objects.exists())
+
+    def test_benchmark_api_concurrency_needs_writes(self):
+        """Test concurrent runs must be allowed to commit the seed"""
+        with self.assertRaisesMessage(CommandError, '--allow-writes'):
+            call_command('benchmark_api', users=0, clients=1, databases=0,
+                         projects=0, requests=2, concurrency=2,
+                         stdout=StringIO(), stderr=StringIO())
+        self.assertFalse(BusinessClient.objects.exists())
+
+    def test_benchmark_api_compare(self):
+        """Test a slower run than the baseline is a regression"""
+        baseline = {'results': {'me': {'p95_ms': 0.001}}}
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as file:
+            json.dump(baseline, file)
+            file.flush()
+
+            with self.assertRaisesMessage(CommandError, 'me'):
+                call_command('benchmark_api', users=0, clients=1,
+                             databases=0, projects=0, requests=2,
+                             endpoints=['me'], compare=file.name,
+                             stdout=StringIO(), stderr=StringIO())
+
+
+class SeedDataCommandTests(TestCase):
+    """
+    Test the seed data command.
+    """
+    def seed(self, **options):
+        call_command('seed_data', users=5, clients=2, databases=4,
+                     projects=6, batch_size=3, password='seedpass123',
+                     stdout=StringIO(), **options)
+
+    def test_seed_data_copy(self):
+        """Test related rows are loaded with COPY"""
+        self.seed()
+
+        self.assertEqual(get_user_model().objects.count(), 5)
+        self.assertEqual(BusinessClient.objects.count(), 2)
+        self.assertEqual(Database.objects.count(), 4)
+        self.assertEqual(Project.objects.count(), 6)
+        self.assertFalse(Project.objects.exclude(
+            client=F('database__owned_by')).exists())
+        user = get_user_model().objects.first()
+        self.assertTrue(user.check_password('seedpass123'))
+
+    def test_seed_data_bulk_create(self):
+        """Test the bulk_create method loads the same volumes"""
+        self.seed(method='bulk', prefix='bulk')
+
+        self.assertEqual(get_user_model().objects.count(), 5)
+        self.assertEqual(Project.objects.count(), 6)
+        self.assertTrue(BusinessClient.objects.filter(
+            name__endswith='bulk-1').exists())
+
+    def test_reserve_ids(self):
+        """Test reserved ranges are skipped by later inserts"""
+        first = reserve_ids(BusinessClient, 10, 'default')
+        self.assertEqual(reserve_ids(BusinessClient, 5, 'default'),
+                         first + 10)
+        client = BusinessClient.objects.create(name='After')
+        self.assertEqual(client.id, first + 15)
+
+    def test_seed_data_needs_parents(self):
+        """Test projects cannot be seeded without databases"""
+        with self.assertRaises(CommandError):
+            call_command('seed_data', users=1, clients=1, databases=0,
+                         projects=1, stdout=StringIO())
+
+
+class ProfileImportsCommandTests(SimpleTestCase):
+    """
+    Test the import profiling command.
+    """
+    def test_parse_importtime(self):
+        """Test -X importtime lines are parsed"""
+        stderr = ('import time: self [us] | cumulative | imported package\n'
+                  'import time:       120 |        450 |   django.urls\n'
+                  'unrelated line\n')
+
+        self.assertEqual(parse_importtime(stderr),
+                         [(120, 450, '  django.urls')])
+
+    def test_profile_imports(self):
+        """Test start up is timed and the slowest imports listed"""
+        out = StringIO()
+        call_command('profile_imports', top=3, repeat=1, api_only=True,
+                     stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertIn('API_ONLY=1: setup', lines[0])
+        self.assertIn('401', lines[0])
+        self.assertEqual(len(lines), 5)
+
+    def test_api_only_skips_admin_and_schema(self):
+        """Test API only workers import neither the admin nor the schema"""
+        out = StringIO()
+        call_command('profile_imports', top=10000, repeat=1, api_only=True,
+                     stdout=out)
+
+        modules = {line.split()[-1]
+                   for line in out.getvalue().splitlines()[2:]}
+        self.assertIn('rest_framework.views', modules)
+        for module in ('django.contrib.admin',
+                       'django.contrib.admindocs.views', 'drf_spectacular'):
+            self.assertNotIn(module, modules)
+
+
+class BuildSchemaCommandTests(SimpleTestCase):
+    """
+    Test the schema build command.
+    """
+    def test_build_schema(self):
+        """Test the schema is written once per fingerprint"""
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(SCHEMA_CACHE_DIR=directory):
+            out = StringIO()
+            call_command('build_schema', stdout=out)
+            self.assertIn('Wrote schema', out.getvalue())
+            call_command('build_schema', stdout=out)
+            self.assertIn('is up to date', out.getvalue())
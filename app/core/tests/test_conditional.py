@@ -0,0 +1,132 @@
+"""
+Tests for ETags and cached responses
+"""
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import LRUCache
+from core.checks import check_version_cache
+from core.conditional import (
+    body_cache,
+    bump_version,
+    get_version,
+    local_versions,
+    version_cache,
+)
+from core.models import BusinessClient
+
+CLIENTS_URL = reverse('client:clients-list')
+MANAGE_URL = reverse('user:manage-list')
+
+
+class ConditionalGetTests(TestCase):
+    """
+    Test conditional GETs on the client and user endpoints
+    """
+
+    def setUp(self):
+        cache.clear()
+        body_cache().clear()
+        local_versions.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            username='exampleadmin', password='goodpass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        BusinessClient.objects.create(name='First')
+
+    def test_not_modified_without_queries(self):
+        """Test a matching If-None-Match is a 304 without a query"""
+        res = self.client.get(CLIENTS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', res)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(CLIENTS_URL,
+                                  HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+
+    def test_cached_body_served(self):
+        """Test a repeated GET is answered from the body cache"""
+        first = self.client.get(CLIENTS_URL)
+        with self.assertNumQueries(0):
+            second = self.client.get(CLIENTS_URL)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_write_changes_etag(self):
+        """Test saving a client invalidates the ETag and the body"""
+        etag = self.client.get(CLIENTS_URL)['ETag']
+        BusinessClient.objects.create(name='Second')
+        res = self.client.get(CLIENTS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+        self.assertEqual(len(res.json()), 2)
+
+    def test_bulk_create_changes_etag(self):
+        """Test bulk writes, which send no signals, invalidate too"""
+        etag = self.client.get(CLIENTS_URL)['ETag']
+        self.client.post(reverse('client:clients-bulk'),
+                         [{'name': 'Second'}], format='json')
+        res = self.client.get(CLIENTS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_url_and_format(self):
+        """Test pages and formats get their own ETags"""
+        etag = self.client.get(MANAGE_URL)['ETag']
+        self.assertNotEqual(
+            self.client.get(MANAGE_URL, {'page_size': 1})['ETag'], etag)
+        self.assertNotEqual(
+            self.client.get(MANAGE_URL, {'format': 'api'})['ETag'], etag)
+
+    def test_last_login_keeps_user_version(self):
+        """Test logging in does not invalidate the user list"""
+        version = get_version('user')
+        self.admin.save(update_fields=['last_login'])
+        self.assertEqual(get_version('user'), version)
+        self.admin.save()
+        self.assertNotEqual(get_version('user'), version)
+
+    def test_versions_move_to_later_second(self):
+        """Test Last-Modified increases even for writes in one second"""
+        modified = get_version('client')[1]
+        bump_version('client')
+        self.assertGreaterEqual(get_version('client')[1], int(modified) + 1)
+
+    def test_bump_from_other_process(self):
+        """Test a write made by another process changes the ETag"""
+        etag = self.client.get(CLIENTS_URL)['ETag']
+        # A new connection to the cache and empty local versions stand in
+        # for another process
+        other = caches.create_connection('shared')
+        with patch('core.conditional.version_cache', return_value=other), \
+                patch('core.conditional.local_versions', LRUCache()):
+            bump_version('client')
+        # Seen once this process's copy of the version is VERSION_TTL old
+        res = self.client.get(CLIENTS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        later = time.monotonic() + 1
+        with patch('core.conditional.time.monotonic', return_value=later):
+            res = self.client.get(CLIENTS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_check_rejects_local_cache(self):
+        """Test versions kept in a per-process cache fail the checks"""
+        self.assertEqual(check_version_cache(None), [])
+        with override_settings(RESPONSE_CACHE={'VERSION_CACHE': 'default'}):
+            self.assertIs(version_cache(), caches['default'])
+            errors = check_version_cache(None)
+        self.assertEqual([error.id for error in errors], ['core.E001'])
+
+    def test_check_warns_uncached_database_versions(self):
+        """Test versions read from the database on every request warn"""
+        with override_settings(RESPONSE_CACHE={'VERSION_TTL': 0}):
+            errors = check_version_cache(None)
+        self.assertEqual([error.id for error in errors], ['core.W001'])
@@ -0,0 +1,117 @@
+"""
+Tests for the client database and project counters
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import BusinessClient, Database, Project
+
+CLIENTS_URL = reverse('client:clients-list')
+
+
+class ClientCounterTests(TestCase):
+    """Test the counters follow the database and project rows"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='user1', password='testpass123', is_staff=True)
+        self.acme = BusinessClient.objects.create(name='Acme')
+        self.apex = BusinessClient.objects.create(name='Apex')
+
+    def create_database(self, name: str, client: BusinessClient):
+        return Database.objects.create(name=name, description='Plant',
+                                       owned_by=client,
+                                       created_by=self.user)
+
+    def assertCounts(self, client: BusinessClient, databases: int,
+                     projects: int):
+        client.refresh_from_db()
+        self.assertEqual((client.database_count, client.project_count),
+                         (databases, projects))
+
+    def test_create_and_delete(self):
+        """Test creating and deleting rows moves the counters"""
+        database = self.create_database('DB1', self.acme)
+        project = Project.objects.create(name='P1', description='Upgrade',
+                                         database=database,
+                                         client=self.acme,
+                                         created_by=self.user)
+        self.assertCounts(self.acme, 1, 1)
+
+        project.delete()
+        database.delete()
+        self.assertCounts(self.acme, 0, 0)
+
+    def test_bulk_create_and_queryset_delete(self):
+        """Test bulk statements are counted per client"""
+        Database.objects.bulk_create([
+            Database(name=f'DB{i}', description='Plant',
+                     owned_by=self.acme if i % 3 else self.apex,
+                     created_by=self.user) for i in range(6)])
+        self.assertCounts(self.acme, 4, 0)
+        self.assertCounts(self.apex, 2, 0)
+
+        Database.objects.filter(owned_by=self.acme).delete()
+        self.assertCounts(self.acme, 0, 0)
+        self.assertCounts(self.apex, 2, 0)
+
+    def test_reassignment(self):
+        """Test moving a database to another client moves the count"""
+        database = self.create_database('DB1', self.acme)
+
+        database.owned_by = self.apex
+        database.save()
+        self.assertCounts(self.acme, 0, 0)
+        self.assertCounts(self.apex, 1, 0)
+
+        Database.objects.update(owned_by=self.acme)
+        self.assertCounts(self.acme, 1, 0)
+        self.assertCounts(self.apex, 0, 0)
+
+    def test_saving_stale_client_keeps_counters(self):
+        """Test saving a client loaded before a change keeps the count"""
+        stale = BusinessClient.objects.get(id=self.acme.id)
+        self.create_database('DB1', self.acme)
+
+        stale.name = 'Acme Corp'
+        stale.save()
+
+        self.assertCounts(self.acme, 1, 0)
+        self.assertEqual(self.acme.name, 'Acme Corp')
+
+    def test_recount_repairs_drift(self):
+        """Test the recount command fixes counters that drifted"""
+        self.create_database('DB1', self.acme)
+        BusinessClient.objects.filter(id=self.acme.id).update(
+            database_count=7)
+        BusinessClient.objects.filter(id=self.apex.id).update(
+            project_count=2)
+
+        out = StringIO()
+        call_command('recount', dry_run=True, stdout=out)
+        self.assertIn('2 clients have drifted', out.getvalue())
+        self.assertCounts(self.acme, 7, 0)
+
+        out = StringIO()
+        call_command('recount', stdout=out)
+        self.assertIn('Fixed the counters of 2 clients', out.getvalue())
+        self.assertCounts(self.acme, 1, 0)
+        self.assertCounts(self.apex, 0, 0)
+
+    def test_counters_in_client_list(self):
+        """Test the client list shows fresh counters"""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.get(CLIENTS_URL)
+
+        self.create_database('DB1', self.acme)
+        res = client.get(CLIENTS_URL)
+
+        acme = next(row for row in res.data if row['name'] == 'Acme')
+        self.assertEqual(acme['database_count'], 1)
+        self.assertEqual(acme['project_count'], 0)
@@ -0,0 +1,113 @@
+"""
+Tests for the database connection pool
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from psycopg2 import extensions
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from core.db.pool import ConnectionPool, PoolTimeout
+
+
+def fake_connection(status=extensions.TRANSACTION_STATUS_IDLE):
+    conn = MagicMock(closed=0)
+    conn.info = SimpleNamespace(transaction_status=status)
+
+    def rollback():
+        conn.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    conn.rollback.side_effect = rollback
+    return conn
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    """
+    Test the pool without a database
+    """
+
+    def setUp(self):
+        self.connect = MagicMock(side_effect=lambda: fake_connection())
+        self.pool = ConnectionPool(self.connect, max_size=2, timeout=0.01)
+
+    def test_connection_reused(self):
+        """Test a returned connection is handed out again"""
+        conn = self.pool.getconn()
+        self.pool.putconn(conn)
+        self.assertIs(self.pool.getconn(), conn)
+        self.assertEqual(self.connect.call_count, 1)
+
+    def test_max_size_times_out(self):
+        """Test checkout fails once max_size connections are out"""
+        self.pool.getconn()
+        self.pool.getconn()
+        with self.assertRaises(PoolTimeout):
+            self.pool.getconn()
+
+    def test_open_transaction_rolled_back(self):
+        """Test a connection returned mid-transaction is rolled back"""
+        conn = self.pool.getconn()
+        conn.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+        self.pool.putconn(conn)
+        conn.rollback.assert_called_once()
+        self.assertEqual(self.pool.idle, 1)
+
+    def test_broken_connection_discarded(self):
+        """Test a closed connection frees its slot"""
+        conn = self.pool.getconn()
+        conn.closed = 1
+        self.pool.putconn(conn)
+        self.assertEqual((self.pool.size, self.pool.idle), (0, 0))
+
+    def test_stale_connection_checked(self):
+        """Test an idle connection failing its ping is replaced"""
+        self.pool.check_after = 0
+        conn = self.pool.getconn()
+        self.pool.putconn(conn)
+        conn.cursor.side_effect = Exception('server closed the connection')
+        self.assertIsNot(self.pool.getconn(), conn)
+        conn.close.assert_called_once()
+        self.assertEqual(self.pool.size, 1)
+
+    def test_idle_connections_expire(self):
+        """Test connections above min_size close after max_idle"""
+        self.pool.max_idle = 0
+        conns = [self.pool.getconn(), self.pool.getconn()]
+        for conn in conns:
+            self.pool.putconn(conn)
+        conns[0].close.assert_called_once()
+        self.assertEqual((self.pool.size, self.pool.idle), (1, 1))
+
+    def test_forked_child_starts_empty(self):
+        """Test a child process does not reuse the parent's sockets"""
+        conn = self.pool.getconn()
+        self.pool.putconn(conn)
+        with patch('core.db.pool.os.getpid', return_value=-1):
+            self.assertIsNot(self.pool.getconn(), conn)
+        conn.close.assert_not_called()
+
+    def test_warm(self):
+        """Test warming opens min_size connections"""
+        self.pool.min_size = 2
+        self.assertEqual(self.pool.warm(), 2)
+        self.assertEqual(self.pool.idle, 2)
+
+
+class PooledBackendTests(TestCase):
+    """
+    Test the backend against the test database
+    """
+
+    def test_pool_reuses_connection(self):
+        """Test closing gives the connection back to the pool"""
+        options = connection.settings_dict['OPTIONS']
+        with patch.dict(options, {'pool': {'max_size': 2}}), \
+                patch.dict(connection.settings_dict, {'CONN_MAX_AGE': 0}):
+            pool = connection.pool
+            conn = pool.getconn()
+            pool.putconn(conn)
+            self.assertIs(pool.getconn(), conn)
+            pool.putconn(conn)
+            pool.close()
+            self.assertTrue(conn.closed)
@@ -0,0 +1,70 @@
+"""
+Tests for the settings driven password hashers
+"""
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import check_password
+
+from core.hashers import TunablePBKDF2PasswordHasher, make_passwords
+
+LOW_COST = {'PBKDF2_ITERATIONS': 1000, 'ARGON2_TIME_COST': 1,
+            'ARGON2_MEMORY_COST': 1024, 'ARGON2_PARALLELISM': 1}
+
+
+@override_settings(PASSWORD_HASHER_COST=LOW_COST)
+class HasherTests(TestCase):
+    """Test hasher cost and rehashing on login"""
+
+    def test_iterations_from_settings(self):
+        """Test the PBKDF2 iteration count comes from settings"""
+        self.assertEqual(TunablePBKDF2PasswordHasher().iterations, 1000)
+
+    def test_rehash_on_login_when_cost_changes(self):
+        """Test logging in upgrades a hash made with an older cost"""
+        user = get_user_model().objects.create_user(
+            username='user1', password='testpass123')
+        self.assertIn('$1000$', user.password)
+
+        with override_settings(PASSWORD_HASHER_COST={
+                **LOW_COST, 'PBKDF2_ITERATIONS': 2000}):
+            self.assertIsNotNone(
+                authenticate(username='user1', password='testpass123'))
+
+        user.refresh_from_db()
+        self.assertIn('$2000$', user.password)
+
+    def test_rehash_on_login_when_hasher_changes(self):
+        """Test logging in moves a PBKDF2 hash to the preferred hasher"""
+        user = get_user_model().objects.create_user(
+            username='user1', password='testpass123')
+        with override_settings(PASSWORD_HASHERS=[
+                'core.hashers.TunableArgon2PasswordHasher',
+                'core.hashers.TunablePBKDF2PasswordHasher']):
+            self.assertIsNotNone(
+                authenticate(username='user1', password='testpass123'))
+            user.refresh_from_db()
+            self.assertTrue(user.password.startswith('argon2'))
+            self.assertTrue(user.check_password('testpass123'))
+
+
+class MakePasswordsTests(SimpleTestCase):
+    """Test hashing batches of passwords"""
+
+    @override_settings(PASSWORD_HASH_WORKERS=1)
+    def test_make_passwords_inline(self):
+        """Test a single worker hashes in the calling thread"""
+        hashes = make_passwords(['first123', 'second123'])
+
+        self.assertTrue(check_password('first123', hashes[0]))
+        self.assertTrue(check_password('second123', hashes[1]))
+
+    @override_settings(PASSWORD_HASH_WORKERS=2)
+    def test_make_passwords_process_pool(self):
+        """Test a batch hashed in worker processes keeps its order"""
+        passwords = [f'password{i}' for i in range(4)]
+
+        hashes = make_passwords(passwords)
+
+        self.assertEqual(len(set(hashes)), 4)
+        for password, encoded in zip(passwords, hashes):
+            self.assertTrue(check_password(password, encoded))
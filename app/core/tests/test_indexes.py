@@ -0,0 +1,104 @@
+"""
+Tests that the list queries are served by the model indexes
+"""
+from unittest import skipUnless
+
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from core import models
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Postgres query plans')
+class IndexUsageTests(TestCase):
+    """
+    Check the query plans with EXPLAIN.
+
+    The test tables are tiny, so sequential scans are disabled to make
+    the planner show which index it would use on a full table.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            username='user1', password='testpass123')
+        cls.business_client = models.BusinessClient.objects.create(
+            name='TestClientName')
+        cls.database = models.Database.objects.create(
+            name='Database123',
+            description='Sample database detailed description',
+            owned_by=cls.business_client,
+            created_by=user,
+        )
+        models.Project.objects.create(
+            name='Project123',
+            description='Sample project detailed description',
+            database=cls.database,
+            client=cls.business_client,
+            created_by=user,
+        )
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute('RESET enable_seqscan')
+
+    def assertUsesIndex(self, queryset, index_name: str):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn('Seq Scan', plan)
+
+    def test_databases_by_client(self):
+        """Test listing a client's databases uses the composite index"""
+        self.assertUsesIndex(
+            models.Database.objects.filter(
+                owned_by=self.business_client).order_by('date_created'),
+            'database_owner_created_idx')
+
+    def test_projects_by_client(self):
+        """Test listing a client's projects uses the composite index"""
+        self.assertUsesIndex(
+            models.Project.objects.filter(
+                client=self.business_client).order_by('date_created'),
+            'project_client_created_idx')
+
+    def test_projects_by_database(self):
+        """Test listing a database's projects uses the composite index"""
+        self.assertUsesIndex(
+            models.Project.objects.filter(
+                database=self.database).order_by('date_created'),
+            'project_database_created_idx')
+
+    def test_projects_by_date(self):
+        """Test ordering all projects by creation date uses an index"""
+        self.assertUsesIndex(
+            models.Project.objects.order_by('date_created', 'id')[:10],
+            'project_created_id_idx')
+
+    def test_name_search(self):
+        """Test a substring search on name uses the trigram index"""
+        self.assertUsesIndex(
+            models.Database.objects.filter(name__icontains='base12'),
+            'database_name_trgm_idx')
+        self.assertUsesIndex(
+            models.Project.objects.filter(description__icontains='detail'),
+            'project_description_trgm_idx')
+
+    def test_full_text_search(self):
+        """Test search queries use the GIN index on the search vector"""
+        query = SearchQuery('sample', config=models.SEARCH_CONFIG,
+                            search_type='websearch')
+        self.assertUsesIndex(
+            models.BusinessClient.objects.filter(search_vector=query),
+            'businessclient_search_idx')
+        self.assertUsesIndex(
+            models.Database.objects.filter(search_vector=query),
+            'database_search_idx')
+        self.assertUsesIndex(
+            models.Project.objects.filter(search_vector=query),
+            'project_search_idx')
@@ -0,0 +1,171 @@
+"""
+Tests for the background job queue
+"""
+import datetime
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.jobs import claim, enqueue, run_next
+from core.models import Job, JobSecret
+
+JOBS_URL = reverse('core:jobs-list')
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def fail():
+    raise ValueError('boom')
+
+
+@override_settings(JOB_QUEUE={'MAX_ATTEMPTS': 2, 'RETRY_DELAY': 10,
+                              'TIMEOUT': 60})
+class JobQueueTests(TestCase):
+    """Test queueing, claiming and retrying jobs"""
+
+    def test_run_job(self):
+        """Test a queued job runs and stores its result"""
+        job = enqueue(add, 2, b=3)
+
+        done = run_next('worker1')
+
+        self.assertEqual(done.id, job.id)
+        self.assertEqual(done.status, Job.Status.SUCCEEDED)
+        self.assertEqual(done.result, 5)
+        self.assertEqual(done.attempts, 1)
+        self.assertIsNone(done.payload)
+        self.assertIsNone(run_next('worker1'))
+
+    def test_secrets_kept_out_of_payload(self):
+        """Test secrets are passed to the job and deleted after it"""
+        job = enqueue(add, 2, secrets={'b': 3})
+
+        self.assertEqual(job.payload, {'args': [2], 'kwargs': {}})
+        done = run_next('worker1')
+
+        self.assertEqual(done.result, 5)
+        self.assertFalse(JobSecret.objects.exists())
+
+    def test_claim_marks_running(self):
+        """Test a claimed job is not claimed again"""
+        enqueue(add, 1, 1)
+
+        job = claim('worker1')
+
+        self.assertEqual(job.status, Job.Status.RUNNING)
+        self.assertEqual(job.locked_by, 'worker1')
+        self.assertIsNone(claim('worker2'))
+
+    def test_jobs_run_in_order(self):
+        """Test the oldest ready job is claimed first"""
+        first = enqueue(add, 1, 1)
+        later = enqueue(add, 2, 2)
+        Job.objects.filter(id=later.id).update(
+            run_after=timezone.now() - datetime.timedelta(minutes=1))
+
+        self.assertEqual(claim('worker1').id, later.id)
+        self.assertEqual(claim('worker1').id, first.id)
+
+    def test_failed_job_is_retried_with_backoff(self):
+        """Test a failure requeues the job until attempts run out"""
+        job = enqueue(fail)
+
+        run_next('worker1')
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(job.error, 'ValueError: boom')
+        self.assertGreater(job.run_after,
+                           timezone.now() + datetime.timedelta(seconds=5))
+        self.assertIsNone(run_next('worker1'))
+
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        run_next('worker1')
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.date_finished)
+        self.assertIsNone(job.payload)
+
+    def test_lost_job_is_claimed_again(self):
+        """Test a job running past the timeout is run again"""
+        job = enqueue(add, 1, 2)
+        claim('worker1')
+        Job.objects.filter(id=job.id).update(
+            locked_at=timezone.now() - datetime.timedelta(minutes=5))
+
+        done = run_next('worker2')
+
+        self.assertEqual(done.id, job.id)
+        self.assertEqual(done.status, Job.Status.SUCCEEDED)
+        self.assertEqual(done.attempts, 2)
+
+    @patch('core.management.commands.run_worker.close_old_connections')
+    def test_run_worker_burst(self, close_old_connections):
+        """Test the worker command runs the queue and exits"""
+        enqueue(add, 1, 2)
+        enqueue(add, 3, 4)
+        out = StringIO()
+
+        call_command('run_worker', burst=True, stdout=out)
+
+        self.assertIn('stopped after 2 jobs', out.getvalue())
+        self.assertFalse(Job.objects.exclude(
+            status=Job.Status.SUCCEEDED).exists())
+
+
+class JobApiTests(TestCase):
+    """Test following jobs through the API"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            username='admin', password='testpass123')
+
+    def test_list_and_retrieve_jobs(self):
+        """Test the admin sees jobs, newest first"""
+        self.client.force_authenticate(self.admin)
+        first = enqueue(add, 1, 2)
+        second = enqueue(add, 3, 4)
+
+        res = self.client.get(JOBS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([job['id'] for job in res.data['results']],
+                         [second.id, first.id])
+        self.assertNotIn('payload', res.data['results'][0])
+
+        res = self.client.get(reverse('core:jobs-detail', args=[first.id]))
+        self.assertEqual(res.data['status'], 'queued')
+
+    def test_filter_jobs_by_status(self):
+        """Test jobs can be filtered on their status"""
+        self.client.force_authenticate(self.admin)
+        enqueue(add, 1, 2)
+        run_next('worker1')
+        queued = enqueue(add, 3, 4)
+
+        res = self.client.get(JOBS_URL, {'status': 'queued'})
+
+        self.assertEqual([job['id'] for job in res.data['results']],
+                         [queued.id])
+
+    def test_jobs_require_admin(self):
+        """Test regular users cannot see jobs"""
+        user = get_user_model().objects.create_user(
+            username='user1', password='testpass123')
+        self.client.force_authenticate(user)
+
+        res = self.client.get(JOBS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,146 @@
+"""
+Tests for the request metrics
+"""
+import re
+import time
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.conditional import body_cache, get_version, local_versions
+from core.metrics import (
+    Histogram,
+    RequestSample,
+    current_sample,
+    measure_serialization,
+    registry,
+)
+from core.middleware import MetricsMiddleware
+from core.models import BusinessClient
+
+METRICS_URL = reverse('api-metrics')
+
+
+class HistogramTests(SimpleTestCase):
+    """Test histogram bucketing"""
+
+    def test_observations_bucketed(self):
+        """Test values land in the first bucket at or above them"""
+        histogram = Histogram([1, 2, 4])
+        for value in [0.5, 1, 3, 10]:
+            histogram.observe(value)
+        counts, total = histogram.snapshot()
+        self.assertEqual(counts, [2, 0, 1, 1])
+        self.assertEqual(total, 14.5)
+
+    def test_middleware_overhead(self):
+        """Test recording a request costs well under 50 microseconds"""
+        middleware = MetricsMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get('/')
+        calls = 2000
+        best = float('inf')
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(calls):
+                middleware(request)
+            best = min(best, (time.perf_counter() - start) / calls)
+        self.assertLess(best, 50e-6)
+
+
+class SerializationTimingTests(SimpleTestCase):
+    """Test the serializer time recorded for a request"""
+
+    def setUp(self):
+        self.sample = RequestSample()
+        token = current_sample.set(self.sample)
+        self.addCleanup(current_sample.reset, token)
+
+    @patch('core.metrics.time.perf_counter', side_effect=[0.0, 1.0])
+    def test_nested_blocks_counted_once(self, perf_counter):
+        """Test nested serializers add nothing to the outer block"""
+        with measure_serialization():
+            with measure_serialization():
+                pass
+        self.assertEqual(self.sample.serializer_time, 1.0)
+        self.assertFalse(self.sample.serializing)
+
+    @patch('core.metrics.time.perf_counter', side_effect=[0.0, 1.0])
+    def test_queries_excluded(self, perf_counter):
+        """Test queries run while serializing are not counted"""
+        with measure_serialization():
+            self.sample.db_time += 0.25
+        self.assertEqual(self.sample.serializer_time, 0.75)
+
+
+class MetricsApiTests(TestCase):
+    """Test the metrics endpoint"""
+
+    def setUp(self):
+        registry.clear()
+        body_cache().clear()
+        local_versions.clear()
+        self.admin = get_user_model().objects.create_superuser(
+            username='admin', password='testpass123')
+        self.client = APIClient()
+
+    def test_metrics_admin_only(self):
+        """Test non staff users cannot read the metrics"""
+        user = get_user_model().objects.create_user(
+            username='user1', password='testpass123')
+        self.client.force_authenticate(user=user)
+        res = self.client.get(METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_request_recorded_per_endpoint(self):
+        """Test a request is recorded under its URL name"""
+        self.client.force_authenticate(user=self.admin)
+        get_version('client')
+        self.client.get(reverse('client:clients-list'))
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['Content-Type'].startswith('text/plain'))
+        body = res.content.decode()
+        self.assertIn('# TYPE api_request_duration_seconds histogram', body)
+        self.assertIn('api_db_queries_count{endpoint="client:clients-list"} 1',
+                      body)
+        # The clients, whose version was just read in this process
+        self.assertIn('api_db_queries_sum{endpoint="client:clients-list"} 1',
+                      body)
+        self.assertIn(
+            'api_serializer_duration_seconds_count'
+            '{endpoint="client:clients-list"} 1', body)
+
+    async def test_asgi_records_queries(self):
+        """Test queries are recorded for requests served over ASGI"""
+        token = await Token.objects.acreate(user=self.admin)
+        await sync_to_async(get_version)('client')
+        res = await self.async_client.get(
+            reverse('client:clients-list'),
+            headers={'Authorization': f'Token {token.key}'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        body = await sync_to_async(registry.render)()
+        self.assertIn('api_db_queries_count{endpoint="client:clients-list"} 1',
+                      body)
+        self.assertNotIn(
+            'api_db_queries_sum{endpoint="client:clients-list"} 0\n', body)
+
+    def test_serializer_time_recorded(self):
+        """Test building the response data is recorded as serializer time"""
+        self.client.force_authenticate(user=self.admin)
+        client = BusinessClient.objects.create(name='Client1')
+        self.client.get(reverse('client:clients-detail', args=[client.id]))
+        body = self.client.get(METRICS_URL).content.decode()
+
+        total = re.search(
+            r'api_serializer_duration_seconds_sum'
+            r'\{endpoint="client:clients-detail"\} (\S+)', body)
+        self.assertGreater(float(total.group(1)), 0)
@@ -0,0 +1,135 @@
+"""
+Conformance tests for the orjson renderer and parser
+"""
+import datetime
+import decimal
+import io
+import uuid
+from unittest import skipIf
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from core.conditional import body_cache
+from core.models import BusinessClient
+from core.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+PAYLOADS = [
+    {'name': 'Client', 'id': 1, 'active': True, 'parent': None},
+    ReturnDict([('date_created', datetime.datetime(
+        2024, 2, 3, 4, 5, 6, 789, tzinfo=datetime.timezone.utc))],
+        serializer=None),
+    [datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo('Australia/Sydney')),
+     datetime.datetime(2024, 1, 1, tzinfo=ZoneInfo('Europe/London')),
+     datetime.datetime(2024, 1, 1, 12, 30),
+     datetime.date(2024, 1, 1), datetime.time(12, 30, 1, 5)],
+    {'price': decimal.Decimal('12.50'), 'wait': datetime.timedelta(
+        seconds=90), 'key': uuid.UUID(int=1)},
+    {'detail': gettext_lazy('Not found.'), 1: 'one', 'set': {3}},
+    ['Exämple ✓', 'line break ', 'quote " and \\ and \n'],
+    [0.1, 1.5, -0.0, 10 ** 20, -(2 ** 70)],
+]
+
+
+@skipIf(orjson is None, 'orjson is not installed')
+class FastJSONRendererTests(SimpleTestCase):
+    """
+    Test the renderer matches JSONRenderer byte for byte
+    """
+
+    def test_payloads_match(self):
+        """Test each payload renders exactly as JSONRenderer does"""
+        for payload in PAYLOADS:
+            with self.subTest(payload=payload):
+                self.assertEqual(FastJSONRenderer().render(payload),
+                                 JSONRenderer().render(payload))
+
+    def test_indent_falls_back(self):
+        """Test indented output, as used by the browsable API, matches"""
+        media_type = 'application/json; indent=4'
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOADS[0], media_type),
+            JSONRenderer().render(PAYLOADS[0], media_type))
+
+    @override_settings(JSON_BACKEND='json')
+    def test_stdlib_backend(self):
+        """Test the stdlib backend can be selected"""
+        for payload in PAYLOADS:
+            self.assertEqual(FastJSONRenderer().render(payload),
+                             JSONRenderer().render(payload))
+
+
+@skipIf(orjson is None, 'orjson is not installed')
+class FastJSONParserTests(SimpleTestCase):
+    """
+    Test the parser accepts and rejects what JSONParser does
+    """
+
+    def parse(self, parser_class, body: bytes):
+        try:
+            return parser_class().parse(io.BytesIO(body))
+        except ParseError as exc:
+            return type(exc)
+
+    def test_bodies_match(self):
+        """Test valid and invalid bodies give the same result"""
+        bodies = [b'{"name": "Client", "ids": [1, 2]}', b'[]', b'"\\u00e9"',
+                  '{"name": "Exämple"}'.encode(), b'12345678901234567890123',
+                  b'"\\ud800"', b'{"a": NaN}', b'{"a": 1,}', b'']
+        for body in bodies:
+            with self.subTest(body=body):
+                self.assertEqual(self.parse(FastJSONParser, body),
+                                 self.parse(JSONParser, body))
+
+
+@skipIf(orjson is None, 'orjson is not installed')
+class ApiConformanceTests(TestCase):
+    """
+    Test responses of the user and client endpoints render identically
+    """
+
+    def setUp(self):
+        cache.clear()
+        body_cache().clear()
+        self.admin = get_user_model().objects.create_superuser(
+            username='exampleadmin', password='goodpass',
+            first_name='Ädmin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.business = BusinessClient.objects.create(name='Client ✓')
+
+    def assertConforms(self, res):
+        self.assertEqual(res.content, JSONRenderer().render(res.data))
+
+    def test_client_responses(self):
+        """Test client list, detail, create and error responses"""
+        self.assertConforms(self.client.get(reverse('client:clients-list')))
+        self.assertConforms(self.client.get(
+            reverse('client:clients-detail', args=[self.business.id])))
+        self.assertConforms(self.client.post(
+            reverse('client:clients-list'), {'name': 'New'}, format='json'))
+        self.assertConforms(self.client.post(
+            reverse('client:clients-list'), {'name': 'New'}, format='json'))
+        self.assertConforms(self.client.post(
+            reverse('client:clients-bulk'), [{'name': 'A'}, {}],
+            format='json'))
+
+    def test_user_responses(self):
+        """Test profile, admin list, detail and error responses"""
+        self.assertConforms(self.client.get(reverse('user:me')))
+        self.assertConforms(self.client.get(reverse('user:manage-list')))
+        self.assertConforms(self.client.get(
+            reverse('user:manage-detail', args=[self.admin.id])))
+        self.assertConforms(self.client.get(
+            reverse('user:manage-detail', args=[self.admin.id + 100])))
+        self.assertConforms(self.client.post(reverse('user:token'), {
+            'username': 'exampleadmin', 'password': 'badpass'}))
@@ -0,0 +1,104 @@
+"""
+Tests for read replica routing
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from core import routers
+from core.middleware import ReplicaRoutingMiddleware
+
+REPLICAS = {'ALIASES': ['replica_1'], 'PIN_SECONDS': 5, 'CACHE': 'default',
+            'PRIMARY_APPS': ['authtoken']}
+
+
+def read_db():
+    return get_user_model().objects.all().db
+
+
+@override_settings(READ_REPLICAS=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+    """
+    Test where queries are routed, without running any
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.seen = []
+
+        def view(request):
+            self.seen.append(read_db())
+            if request.GET.get('write'):
+                router.db_for_write(get_user_model())
+                self.seen.append(read_db())
+            return HttpResponse()
+        self.middleware = ReplicaRoutingMiddleware(view)
+
+    def test_outside_request_reads_primary(self):
+        """Test commands and jobs read from the primary"""
+        self.assertEqual(read_db(), 'default')
+
+    def test_safe_request_reads_replica(self):
+        """Test a GET reads from a replica and a POST from the primary"""
+        self.middleware(self.factory.get('/'))
+        self.middleware(self.factory.post('/'))
+        self.assertEqual(self.seen, ['replica_1', 'default'])
+
+    def test_write_pins_request(self):
+        """Test reads after a write in the same request use the primary"""
+        self.middleware(self.factory.get('/', {'write': 1}))
+        self.assertEqual(self.seen, ['replica_1', 'default'])
+
+    def test_write_pins_credential(self):
+        """Test a token that wrote reads from the primary for a while"""
+        res = self.middleware(self.factory.post(
+            '/?write=1', HTTP_AUTHORIZATION='Token abc'))
+        self.assertIn(routers.PIN_COOKIE, res.cookies)
+        self.middleware(self.factory.get('/', HTTP_AUTHORIZATION='Token abc'))
+        self.middleware(self.factory.get('/', HTTP_AUTHORIZATION='Token xyz'))
+        self.assertEqual(self.seen[-2:], ['default', 'replica_1'])
+
+        cache.clear()
+        self.middleware(self.factory.get('/', HTTP_AUTHORIZATION='Token abc'))
+        self.assertEqual(self.seen[-1], 'replica_1')
+
+    def test_write_pins_cookie(self):
+        """Test a client is pinned by a cookie on any process"""
+        res = self.middleware(self.factory.get('/', {'write': 1}))
+        cookie = res.cookies[routers.PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 5)
+
+        request = self.factory.get('/')
+        request.COOKIES[routers.PIN_COOKIE] = cookie.value
+        self.middleware(request)
+        request.COOKIES[routers.PIN_COOKIE] = str(time.time() - 1)
+        self.middleware(request)
+        self.assertEqual(self.seen[-2:], ['default', 'replica_1'])
+
+    def test_primary_apps(self):
+        """Test tokens are read from the primary"""
+        self.middleware.get_response = lambda request: HttpResponse(
+            Token.objects.all().db)
+        res = self.middleware(self.factory.get('/'))
+        self.assertEqual(res.content, b'default')
+
+    def test_replica_may_lag(self):
+        """Test recent versions may be missing from a replica"""
+        token = routers.start(self.factory.get('/'))
+        try:
+            self.assertTrue(routers.replica_may_lag(time.time()))
+            self.assertFalse(routers.replica_may_lag(time.time() - 60))
+        finally:
+            routers.finish(token)
+        self.assertFalse(routers.replica_may_lag(time.time()))
+
+    def test_replicas_not_migrated(self):
+        """Test migrations only run on the primary"""
+        self.assertFalse(router.allow_migrate('replica_1', 'core'))
+        self.assertTrue(router.allow_migrate('default', 'core'))
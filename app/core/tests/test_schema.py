@@ -0,0 +1,89 @@
+"""
+Tests for the precomputed OpenAPI schema
+"""
+import gzip
+import json
+import tempfile
+from unittest.mock import patch
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from core import schema
+
+SCHEMA_URL = reverse('api-schema')
+DOCS_URL = reverse('api-docs')
+
+
+class PrecomputedSchemaTests(SimpleTestCase):
+    """
+    Test the schema is generated once and served from memory
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        overridden = override_settings(SCHEMA_CACHE_DIR=self.directory)
+        overridden.enable()
+        self.addCleanup(overridden.disable)
+        schema._schemas.clear()
+        schema._documents.clear()
+
+    def test_generated_once(self):
+        """Test the schema is written once and read back from disk"""
+        with patch('core.schema.generate', wraps=schema.generate) as gen:
+            first = schema.get_schema()
+            schema.get_schema()
+            self.assertEqual(gen.call_count, 1)
+            self.assertTrue(schema.schema_path(schema.fingerprint()).exists())
+
+            schema._schemas.clear()
+            self.assertEqual(schema.get_schema(), first)
+            self.assertEqual(gen.call_count, 1)
+
+    def test_fingerprint_covers_project(self):
+        """Test models, filters and pagination change the fingerprint"""
+        sources = schema._sources()
+        for module in ('core/models.py', 'core/filters.py',
+                       'core/pagination.py', 'user/serializers.py'):
+            self.assertIn(settings.BASE_DIR / module, sources)
+        self.assertFalse(any('tests' in path.parts for path in sources))
+
+    def test_stale_schemas_removed(self):
+        """Test writing a schema removes those of older fingerprints"""
+        schema.write({'openapi': '3.0.3'}, 'old')
+        schema.write({'openapi': '3.0.3'}, 'new')
+        self.assertFalse(schema.schema_path('old').exists())
+        self.assertTrue(schema.schema_path('new').exists())
+
+    def test_etag_and_cache_headers(self):
+        """Test the schema revalidates unless its fingerprint is named"""
+        res = self.client.get(SCHEMA_URL, {'format': 'json'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('openapi', json.loads(res.content))
+        self.assertEqual(res['Cache-Control'], schema.REVALIDATE)
+
+        res = self.client.get(SCHEMA_URL, {'format': 'json'},
+                              HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        res = self.client.get(SCHEMA_URL, {'v': schema.fingerprint()})
+        self.assertEqual(res['Cache-Control'], schema.IMMUTABLE)
+
+    def test_gzip(self):
+        """Test clients accepting gzip get the compressed schema"""
+        plain = self.client.get(SCHEMA_URL)
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+        self.assertNotEqual(res['ETag'], plain['ETag'])
+        self.assertIn('Accept-Encoding', res['Vary'])
+
+    def test_docs_load_versioned_schema(self):
+        """Test Swagger UI asks for the schema of the current fingerprint"""
+        res = self.client.get(DOCS_URL)
+        # The template escapes the URL for a JavaScript string
+        self.assertContains(res, f'v\\u003D{schema.fingerprint()}')
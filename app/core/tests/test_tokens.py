@@ -0,0 +1,136 @@
+"""
+Tests for signed access tokens
+"""
+import time
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import tokens
+from core.authentication import token_cache
+from core.conditional import body_cache
+
+REFRESH_URL = reverse('user:token-refresh')
+ME_URL = reverse('user:me')
+CLIENTS_URL = reverse('client:clients-list')
+
+
+@override_settings(ACCESS_TOKENS={'ENABLED': True, 'LIFETIME': 300,
+                                  'REVOCATION_SYNC': 60})
+class AccessTokenTests(TestCase):
+    """
+    Test access tokens authenticate without queries until revoked
+    """
+
+    def setUp(self):
+        tokens.revocations.clear()
+        token_cache.clear()
+        body_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            username='testUser', password='testpass123', is_staff=True)
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+
+    def refresh(self) -> str:
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        res = self.client.post(REFRESH_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['expires_in'], 300)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {res.data["access"]}')
+        return res.data['access']
+
+    def test_verify(self):
+        """Test a token is verified and tampering is rejected"""
+        raw = tokens.issue(self.user)
+        token = tokens.verify(raw)
+        self.assertEqual(token.user_id, self.user.id)
+        self.assertTrue(token.flags & tokens.STAFF)
+        self.assertFalse(token.flags & tokens.SUPERUSER)
+
+        message, _, signature = raw.rpartition('.')
+        forged = message.replace('.1.', '.3.', 1)
+        self.assertIsNone(tokens.verify(f'{forged}.{signature}'))
+        self.assertIsNone(tokens.verify('a1.garbage'))
+
+    def test_expired(self):
+        """Test an expired token is rejected"""
+        raw = tokens.issue(self.user)
+        with patch('core.tokens.time.time', return_value=time.time() + 301):
+            self.assertIsNone(tokens.verify(raw))
+
+    def test_no_queries(self):
+        """Test Bearer requests run no auth query once the list is synced"""
+        self.refresh()
+        tokens.revocations.sync()
+        self.client.get(CLIENTS_URL)
+        with self.assertNumQueries(0):
+            res = self.client.get(CLIENTS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_me_loads_user(self):
+        """Test views reading the profile get the full user"""
+        self.refresh()
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['username'], 'testUser')
+
+    def test_revoked_on_password_change(self):
+        """Test changing the password revokes issued tokens"""
+        self.refresh()
+        self.user.set_password('newpass123')
+        self.user.save()
+        res = self.client.get(CLIENTS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_in_other_processes(self):
+        """Test revocations recorded elsewhere are picked up on sync"""
+        self.refresh()
+        self.user.is_staff = False
+        self.user.save(update_fields=['is_staff'])
+        tokens.revocations.clear()
+        res = self.client.get(CLIENTS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_on_token_delete(self):
+        """Test deleting the refresh token revokes its access tokens"""
+        access = self.refresh()
+        self.token.delete()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        res = self.client.get(CLIENTS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_reads_database(self):
+        """Test a cached token of a deactivated user cannot refresh"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.client.get(CLIENTS_URL)
+        # Deactivated in another process, whose invalidation this one
+        # never received
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False)
+        self.assertIn(self.token.key, token_cache)
+        res = self.client.post(REFRESH_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_needs_token(self):
+        """Test an access token cannot refresh itself"""
+        self.refresh()
+        res = self.client.post(REFRESH_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_disabled(self):
+        """Test Bearer tokens are refused when access tokens are off"""
+        access = self.refresh()
+        with self.settings(ACCESS_TOKENS={'ENABLED': False}):
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+            res = self.client.get(CLIENTS_URL)
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.client.credentials(
+                HTTP_AUTHORIZATION=f'Token {self.token.key}')
+            res = self.client.post(REFRESH_URL)
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
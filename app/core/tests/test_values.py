@@ -0,0 +1,79 @@
+"""
+Tests for the values() row serializer
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from client.serializers import ClientSerializer
+from core.models import BusinessClient, Database
+from core.values import RowSerializer
+from database.serializers import DatabaseSerializer
+from user.serializers import AdminSerialiser
+
+
+def render(data) -> bytes:
+    return JSONRenderer().render(data)
+
+
+class RowSerializerTests(TestCase):
+    """
+    Test rows render to the same JSON as the serializers
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='exampleuser', password='goodpass', email='',
+            first_name='Exämple')
+        get_user_model().objects.create_superuser(
+            username='exampleadmin', password='goodpass',
+            email='admin@example.com')
+        client = BusinessClient.objects.create(name='First "quoted"')
+        BusinessClient.objects.create(name='Second')
+        Database.objects.create(name='Sales', owned_by=client,
+                                created_by=self.user)
+
+    def assertSameJSON(self, serializer_class, queryset):
+        rows = RowSerializer.compile(serializer_class)
+        self.assertIsNotNone(rows)
+        expected = render(serializer_class(queryset, many=True).data)
+        self.assertEqual(
+            render(rows.to_representation(rows.values(queryset))), expected)
+
+    def test_client_rows(self):
+        """Test client rows match ClientSerializer"""
+        self.assertSameJSON(ClientSerializer,
+                            BusinessClient.objects.order_by('id'))
+
+    def test_user_rows(self):
+        """Test user rows match AdminSerialiser without the password"""
+        self.assertSameJSON(AdminSerialiser,
+                            get_user_model().objects.order_by('id'))
+        self.assertNotIn('password', RowSerializer.compile(
+            AdminSerialiser).names)
+
+    def test_rows_use_active_timezone(self):
+        """Test datetimes render in the timezone of the request"""
+        with timezone.override('Australia/Sydney'):
+            self.assertSameJSON(ClientSerializer,
+                                BusinessClient.objects.order_by('id'))
+
+    def test_related_rows(self):
+        """Test related names and primary keys match the serializer"""
+        self.assertSameJSON(DatabaseSerializer,
+                            Database.objects.order_by('id'))
+
+    def test_method_field_not_compiled(self):
+        """Test fields that need the instance keep the regular path"""
+        class MethodSerializer(ClientSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta(ClientSerializer.Meta):
+                fields = ClientSerializer.Meta.fields + ['label']
+
+            def get_label(self, obj):
+                return obj.name.upper()
+
+        self.assertIsNone(RowSerializer.compile(MethodSerializer))
@@ -0,0 +1,170 @@
+"""
+Short lived access tokens that authenticate without a query.
+
+An access token is the user id, their staff and superuser flags, the
+time it was issued and its expiry, signed with an HMAC of SECRET_KEY:
+
+    a1.<user id>.<flags>.<issued ms>.<expires>.<signature>
+
+Tokens cannot be recalled, so ``revoke`` records that the tokens a user
+was issued so far are invalid. Each process keeps the revocations of the
+last token lifetime in memory and reloads them from the database at most
+every ACCESS_TOKENS['REVOCATION_SYNC'] seconds, which bounds how long a
+revoked token keeps working in other processes.
+"""
+import base64
+import datetime
+import hmac
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from core.models import TokenRevocation
+
+VERSION = 'a1'
+SALT = 'core.tokens.access'
+STAFF = 1
+SUPERUSER = 2
+
+AccessToken = namedtuple('AccessToken', ['user_id', 'flags', 'issued',
+                                         'expires'])
+
+
+def token_settings() -> dict:
+    return {
+        'ENABLED': False,
+        'LIFETIME': 300,
+        'REVOCATION_SYNC': 5,
+        **getattr(settings, 'ACCESS_TOKENS', {}),
+    }
+
+
+def _sign(message: str, secret: str) -> str:
+    digest = salted_hmac(SALT, message, secret=secret,
+                         algorithm='sha256').digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+
+def issue(user) -> str:
+    """
+    Return an access token for an active user
+    """
+    flags = (STAFF if user.is_staff else 0) | (
+        SUPERUSER if user.is_superuser else 0)
+    now = time.time()
+    expires = int(now) + token_settings()['LIFETIME']
+    message = f'{VERSION}.{user.pk}.{flags}.{int(now * 1000)}.{expires}'
+    return f'{message}.{_sign(message, settings.SECRET_KEY)}'
+
+
+def verify(raw: str) -> AccessToken | None:
+    """
+    Return the token if its signature is valid and it has not expired
+    """
+    message, _, signature = raw.rpartition('.')
+    parts = message.split('.')
+    if len(parts) != 5 or parts[0] != VERSION:
+        return None
+    secrets = [settings.SECRET_KEY,
+               *getattr(settings, 'SECRET_KEY_FALLBACKS', [])]
+    if not any(hmac.compare_digest(signature, _sign(message, secret))
+               for secret in secrets):
+        return None
+    try:
+        token = AccessToken(*map(int, parts[1:]))
+    except ValueError:
+        return None
+    if token.expires <= time.time():
+        return None
+    return token
+
+
+def token_user(token: AccessToken):
+    """
+    The user of a token, with every field but its flags deferred, so
+    they are only queried when a view reads them
+    """
+    model = get_user_model()
+    known = {'id': token.user_id, 'is_active': True,
+             'is_staff': bool(token.flags & STAFF),
+             'is_superuser': bool(token.flags & SUPERUSER)}
+    names = [field.attname for field in model._meta.concrete_fields
+             if field.attname in known]
+    return model.from_db(DEFAULT_DB_ALIAS, names,
+                         [known[name] for name in names])
+
+
+class RevocationList:
+    """
+    The time up to which each user's tokens are revoked, in milliseconds
+    """
+
+    def __init__(self):
+        self._revoked = {}
+        self._synced = None
+        self._lock = threading.Lock()
+
+    def due(self) -> bool:
+        return (self._synced is None or time.monotonic() - self._synced
+                >= token_settings()['REVOCATION_SYNC'])
+
+    def sync(self):
+        """
+        Reload the revocations of the last token lifetime
+        """
+        synced = time.monotonic()
+        cutoff = timezone.now() - datetime.timedelta(
+            seconds=token_settings()['LIFETIME'])
+        rows = (TokenRevocation.objects.using(DEFAULT_DB_ALIAS)
+                .filter(revoked_at__gte=cutoff)
+                .values_list('user_id', 'revoked_at'))
+        revoked = {}
+        for user_id, revoked_at in rows:
+            revoked_ms = int(revoked_at.timestamp() * 1000)
+            revoked[user_id] = max(revoked.get(user_id, 0), revoked_ms)
+        cutoff_ms = int(cutoff.timestamp() * 1000)
+        with self._lock:
+            # Keep local revocations whose rows are not committed yet
+            for user_id, revoked_ms in self._revoked.items():
+                if revoked_ms >= cutoff_ms:
+                    revoked[user_id] = max(revoked.get(user_id, 0),
+                                           revoked_ms)
+            self._revoked = revoked
+            self._synced = synced
+
+    def add(self, user_id: int, revoked_ms: int):
+        with self._lock:
+            self._revoked[user_id] = max(self._revoked.get(user_id, 0),
+                                         revoked_ms)
+
+    def is_revoked(self, token: AccessToken) -> bool:
+        revoked_ms = self._revoked.get(token.user_id)
+        return revoked_ms is not None and token.issued <= revoked_ms
+
+    def clear(self):
+        with self._lock:
+            self._revoked = {}
+            self._synced = None
+
+
+revocations = RevocationList()
+
+
+def revoke(user_id: int):
+    """
+    Invalidate every access token issued to a user so far
+    """
+    if not token_settings()['ENABLED']:
+        return
+    now = timezone.now()
+    cutoff = now - datetime.timedelta(
+        seconds=token_settings()['LIFETIME'])
+    TokenRevocation.objects.filter(revoked_at__lt=cutoff).delete()
+    TokenRevocation.objects.create(user_id=user_id, revoked_at=now)
+    revocations.add(user_id, int(now.timestamp() * 1000))
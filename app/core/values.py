@@ -0,0 +1,183 @@
+"""
+Read-only list responses built straight from ``.values_list()`` rows
+"""
+import datetime
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import fields, relations, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.metrics import measure_serialization
+
+# Fields whose representation of a database value is the value itself
+IDENTITY_FIELDS = (fields.BooleanField, fields.CharField,
+                   fields.IntegerField, fields.ReadOnlyField)
+# Fields that need the model instance rather than a column value
+UNSUPPORTED_FIELDS = (fields.SerializerMethodField, fields.HiddenField,
+                      fields.ListField, fields.DictField, fields.JSONField,
+                      fields.FileField, fields.ModelField,
+                      relations.RelatedField, relations.ManyRelatedField,
+                      serializers.BaseSerializer)
+
+
+def _iso_datetime(field: fields.DateTimeField):
+    tz = (field.timezone if hasattr(field, 'timezone')
+          else field.default_timezone())
+    if tz is None:
+        return field.to_representation
+
+    def convert(value: datetime.datetime) -> str:
+        if not timezone.is_aware(value):
+            return field.to_representation(value)
+        text = value.astimezone(tz).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+def _iso_date(value: datetime.date) -> str:
+    return value.isoformat()
+
+
+def _converter(field: fields.Field):
+    """
+    Return a function giving the field's representation of a column
+    value, or None when the value is already that representation
+    """
+    if isinstance(field, fields.DateTimeField):
+        output_format = getattr(field, 'format',
+                                api_settings.DATETIME_FORMAT)
+        if output_format and output_format.lower() == fields.ISO_8601:
+            return _iso_datetime(field)
+    elif isinstance(field, fields.DateField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if output_format and output_format.lower() == fields.ISO_8601:
+            return _iso_date
+    elif isinstance(field, relations.PrimaryKeyRelatedField):
+        # The column already holds the primary key
+        if field.pk_field is None:
+            return None
+        return field.pk_field.to_representation
+    elif (type(field).to_representation in
+          {cls.to_representation for cls in IDENTITY_FIELDS}):
+        return None
+    return field.to_representation
+
+
+def _lookup(model, source_attrs: list[str]) -> str | None:
+    """
+    Return the values() lookup for a field source, or None when a row
+    could not reproduce attribute access on the instance
+    """
+    for position, attr in enumerate(source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        if position < len(source_attrs) - 1:
+            # DRF skips or nulls a field behind a missing relation
+            if not model_field.is_relation or model_field.null:
+                return None
+            model = model_field.related_model
+    return '__'.join(source_attrs)
+
+
+class RowSerializer:
+    """
+    The read path of a ModelSerializer compiled for ``.values_list()``.
+
+    Each readable field is reduced to a column lookup and a converter
+    reproducing its ``to_representation``. Columns that are already
+    JSON ready, such as text, numbers and booleans, are not converted.
+    """
+
+    def __init__(self, columns: list[tuple]):
+        self.columns = columns
+        self.names = tuple(name for name, _, _ in columns)
+        self.lookups = tuple(lookup for _, lookup, _ in columns)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def compile(cls, serializer_class) -> 'RowSerializer | None':
+        """
+        Return the compiled serializer, or None if a field has no column
+        equivalent
+        """
+        if not issubclass(serializer_class, serializers.ModelSerializer):
+            return None
+        model = serializer_class.Meta.model
+        columns = []
+        for field in serializer_class().fields.values():
+            if field.write_only:
+                continue
+            if (isinstance(field, UNSUPPORTED_FIELDS)
+                    and not isinstance(field,
+                                       relations.PrimaryKeyRelatedField)):
+                return None
+            lookup = (None if field.source == '*'
+                      else _lookup(model, field.source_attrs))
+            if lookup is None:
+                return None
+            columns.append((field.field_name, lookup, field))
+        return cls(columns)
+
+    def values(self, queryset, extra=(), named: bool = False):
+        """
+        Select the columns, followed by any extra ones a paginator needs
+        """
+        extra = [lookup for lookup in extra if lookup not in self.lookups]
+        return queryset.values_list(*self.lookups, *extra, named=named)
+
+    def to_representation(self, rows) -> list[dict]:
+        names = self.names
+        # Converters are built per call, as datetimes render in the
+        # timezone active for the request
+        converters = [(index, convert) for index, convert in enumerate(
+            _converter(field) for _, _, field in self.columns)
+            if convert is not None]
+        data = []
+        with measure_serialization():
+            for row in rows:
+                if converters:
+                    row = list(row)
+                    for index, convert in converters:
+                        if row[index] is not None:
+                            row[index] = convert(row[index])
+                # zip stops at the last named column, dropping extra ones
+                data.append(dict(zip(names, row)))
+        return data
+
+
+class ValuesListMixin:
+    """
+    Serve ``list`` from ``.values_list()`` rows when the serializer allows.
+
+    The rows render to the same JSON as the serializer's output, without
+    building model instances or running the field machinery per row.
+    Serializers with fields that need an instance use the regular path.
+    """
+
+    def list(self, request, *args, **kwargs):
+        rows = RowSerializer.compile(self.get_serializer_class())
+        if rows is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+        if paginator is None:
+            return Response(rows.to_representation(rows.values(queryset)))
+
+        # Cursor paginators read their position from the last row
+        ordering = ()
+        if hasattr(paginator, 'get_ordering'):
+            ordering = paginator.get_ordering(request, queryset, self)
+        keys = [field.lstrip('-') for field in ordering]
+        page = self.paginate_queryset(
+            rows.values(queryset, extra=keys, named=True))
+        if page is None:
+            return Response(rows.to_representation(rows.values(queryset)))
+        return self.get_paginated_response(rows.to_representation(page))
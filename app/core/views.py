@@ -0,0 +1,116 @@
+"""
+Views for the core app
+"""
+import json
+
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import method_decorator
+from django.utils.translation import gettext as gt
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, permissions, viewsets
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.views import APIView
+
+from core.authentication import AccessTokenAuthentication
+from core.filters import FieldFilter
+from core.metrics import registry
+from core.models import Job
+from core.pagination import KeysetPagination
+from core.serializers import JobSerializer
+
+
+class MetricsView(APIView):
+    """
+    Expose the request metrics to Prometheus
+    """
+    authentication_classes = [AccessTokenAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+    schema = None
+
+    def get(self, request):
+        return HttpResponse(registry.render(),
+                            content_type='text/plain; version=0.0.4')
+
+
+class JobPagination(KeysetPagination):
+    """Newest jobs first"""
+    ordering = ('-date_created', '-id')
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Follow background jobs as the admin
+    """
+    serializer_class = JobSerializer
+    authentication_classes = [AccessTokenAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = JobPagination
+    queryset = Job.objects.all()
+    filter_backends = [FieldFilter]
+    filter_fields = {'status': ['exact'], 'name': ['exact']}
+
+
+def parse_body(request) -> dict:
+    """
+    Return the JSON or form encoded body of a request
+    """
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            raise exceptions.ParseError(gt('Malformed JSON'))
+    return request.POST
+
+
+def api_response(data, status: int = 200) -> JsonResponse:
+    """
+    Return data encoded the way DRF's JSONRenderer encodes it
+    """
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAPIView(View):
+    """
+    Base class for async views served under ASGI.
+
+    DRF views are synchronous, so under ASGI each one holds a thread for
+    the whole request. Subclasses implement async handlers with the
+    async ORM instead. This base authenticates with
+    AccessTokenAuthentication.aauthenticate, applies a staff check and
+    turns DRF exceptions into the same JSON responses DRF would send.
+    """
+    authentication_class = AccessTokenAuthentication
+    require_authentication = True
+    require_staff = False
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.check_access(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            data = exc.detail
+            if not isinstance(data, (list, dict)):
+                data = {'detail': data}
+            response = api_response(data, status=exc.status_code)
+            if exc.status_code == 401:
+                response['WWW-Authenticate'] = 'Token'
+            return response
+
+    async def check_access(self, request):
+        """
+        Authenticate the request and check the view's permissions
+        """
+        result = None
+        if self.authentication_class is not None:
+            authenticator = self.authentication_class()
+            result = await authenticator.aauthenticate(request)
+        if result is not None:
+            request.user, request.auth = result
+        if not self.require_authentication:
+            return
+        if result is None:
+            raise exceptions.NotAuthenticated()
+        if self.require_staff and not request.user.is_staff:
+            raise exceptions.PermissionDenied()
@@ -0,0 +1,27 @@
+"""
+Serializers for the Database API View
+"""
+from rest_framework import serializers
+
+from core.models import Database
+from core.serializers import MeasuredSerializerMixin
+
+
+class DatabaseSerializer(MeasuredSerializerMixin,
+                         serializers.ModelSerializer):
+    """
+    Serializer for the database object
+    """
+    owned_by_name = serializers.CharField(source='owned_by.name',
+                                          read_only=True)
+    created_by_username = serializers.CharField(
+        source='created_by.username', read_only=True)
+
+    class Meta:
+        model = Database
+        fields = ['id', 'name', 'description', 'owned_by', 'owned_by_name',
+                  'created_by_username', 'date_created']
+        extra_kwargs = {
+            'id': {'read_only': True},
+            'date_created': {'read_only': True}
+        }
@@ -0,0 +1,125 @@
+"""
+Test for the database API
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import BusinessClient, Database
+
+
+DATABASES_URL = reverse('database:databases-list')
+
+
+def create_database(client: BusinessClient, user, **params) -> Database:
+    """
+    Create and return a new database
+    """
+    defaults = {'description': 'Sample database description'}
+    defaults.update(params)
+    return Database.objects.create(owned_by=client, created_by=user,
+                                   **defaults)
+
+
+class PublicDatabaseApiTests(TestCase):
+    """
+    Test unauthenticated database API requests
+    """
+
+    def test_auth_required(self):
+        """
+        Test authentication is required to list databases
+        """
+        res = APIClient().get(DATABASES_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateDatabaseApiTests(TestCase):
+    """
+    Test API requests that require authentication
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='testUser',
+            password='testpass123',
+            # Staff see every client, members see theirs
+            is_staff=True,
+        )
+        self.business_client = BusinessClient.objects.create(name='Client1')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_databases_nested_names(self):
+        """
+        Test the list includes the client name and creator username
+        """
+        create_database(self.business_client, self.user, name='Db1')
+        res = self.client.get(DATABASES_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        row = res.data['results'][0]
+        self.assertEqual(row['owned_by_name'], 'Client1')
+        self.assertEqual(row['created_by_username'], 'testUser')
+
+    def test_list_query_count_constant(self):
+        """
+        Test a list page costs the same queries for 2 or 20 rows
+        """
+        for i in range(2):
+            create_database(self.business_client, self.user, name=f'Db{i}')
+        with self.assertNumQueries(1):
+            self.client.get(DATABASES_URL)
+
+        for i in range(2, 20):
+            client = BusinessClient.objects.create(name=f'Client{i}')
+            create_database(client, self.user, name=f'Db{i}')
+        with self.assertNumQueries(1):
+            res = self.client.get(DATABASES_URL)
+        self.assertEqual(len(res.data['results']), 20)
+
+    def test_create_database(self):
+        """
+        Test the creator is taken from the authenticated user
+        """
+        payload = {'name': 'NewDb', 'description': 'New database',
+                   'owned_by': self.business_client.id}
+        res = self.client.post(DATABASES_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        database = Database.objects.get(name='NewDb')
+        self.assertEqual(database.created_by, self.user)
+
+    def test_search_name_and_description(self):
+        """
+        Test full text search matches stemmed words in either column
+        """
+        create_database(self.business_client, self.user, name='Invoices',
+                        description='Monthly billing records')
+        create_database(self.business_client, self.user, name='Staff',
+                        description='Employee rosters')
+        res = self.client.get(DATABASES_URL, {'search': 'invoice'})
+        self.assertEqual([row['name'] for row in res.data['results']],
+                         ['Invoices'])
+        res = self.client.get(DATABASES_URL, {'search': 'roster -billing'})
+        self.assertEqual([row['name'] for row in res.data['results']],
+                         ['Staff'])
+
+    def test_ordering_pages(self):
+        """
+        Test pages follow the requested ordering in both directions
+        """
+        for name in ['Bravo', 'Alpha', 'Delta', 'Charlie']:
+            create_database(self.business_client, self.user, name=name)
+        names = []
+        url, params = DATABASES_URL, {'ordering': '-name', 'page_size': 1}
+        while url:
+            res = self.client.get(url, params)
+            names.extend(row['name'] for row in res.data['results'])
+            last = res
+            url, params = res.data['next'], None
+        self.assertEqual(names, ['Delta', 'Charlie', 'Bravo', 'Alpha'])
+
+        res = self.client.get(last.data['previous'])
+        self.assertEqual([row['name'] for row in res.data['results']],
+                         ['Bravo'])
@@ -0,0 +1,20 @@
+"""
+URL mapping for the database app
+"""
+
+from django.urls import (
+    path,
+    include,
+)
+
+from rest_framework.routers import DefaultRouter
+from database import views
+
+router = DefaultRouter()
+router.register('databases', views.DatabaseViewSet, basename='databases')
+
+app_name = 'database'
+
+urlpatterns = [
+    path('', include(router.urls))
+]
@@ -0,0 +1,54 @@
+"""
+Views for the database API
+"""
+from typing import override
+
+from rest_framework import (
+    permissions,
+    viewsets)
+from rest_framework.filters import OrderingFilter
+from core import access
+from core.authentication import AccessTokenAuthentication
+from core.export import StreamingExportMixin
+from core.filters import FieldFilter, FullTextSearchFilter
+from core.models import Database
+from core.pagination import KeysetPagination
+from database.serializers import DatabaseSerializer
+
+
+class DatabaseViewSet(StreamingExportMixin, viewsets.ModelViewSet):
+    """
+    View for managing databases
+    """
+    serializer_class = DatabaseSerializer
+    authentication_classes = [AccessTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    # Joined so a page is one query, not one per row per relation
+    queryset = Database.objects.select_related('owned_by', 'created_by')
+    filter_backends = [FieldFilter, FullTextSearchFilter, OrderingFilter]
+    filter_fields = {'name': ['exact', 'icontains'],
+                     'date_created': ['gte', 'lte']}
+    ordering_fields = ['name', 'date_created', 'id']
+
+    @override
+    def get_queryset(self):
+        return access.scope(super().get_queryset(), self.request.user,
+                            'owned_by')
+
+    def check_clients(self, data: dict):
+        """
+        Refuse to file the database under a client the user may not see
+        """
+        if 'owned_by' in data:
+            access.check_clients(self.request.user, data['owned_by'].pk)
+
+    @override
+    def perform_create(self, serializer):
+        self.check_clients(serializer.validated_data)
+        serializer.save(created_by=self.request.user)
+
+    @override
+    def perform_update(self, serializer):
+        self.check_clients(serializer.validated_data)
+        super().perform_update(serializer)
@@ -0,0 +1,29 @@
+"""
+Serializers for the Project API View
+"""
+from rest_framework import serializers
+
+from core.models import Project
+from core.serializers import MeasuredSerializerMixin
+
+
+class ProjectSerializer(MeasuredSerializerMixin,
+                        serializers.ModelSerializer):
+    """
+    Serializer for the project object
+    """
+    client_name = serializers.CharField(source='client.name', read_only=True)
+    database_name = serializers.CharField(source='database.name',
+                                          read_only=True)
+    created_by_username = serializers.CharField(
+        source='created_by.username', read_only=True)
+
+    class Meta:
+        model = Project
+        fields = ['id', 'name', 'description', 'client', 'client_name',
+                  'database', 'database_name', 'created_by_username',
+                  'date_created']
+        extra_kwargs = {
+            'id': {'read_only': True},
+            'date_created': {'read_only': True}
+        }
@@ -0,0 +1,107 @@
+"""
+Test for the project API
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.models import BusinessClient, Database, Project
+
+
+PROJECTS_URL = reverse('project:projects-list')
+
+
+class PublicProjectApiTests(TestCase):
+    """
+    Test unauthenticated project API requests
+    """
+
+    def test_auth_required(self):
+        """
+        Test authentication is required to list projects
+        """
+        res = APIClient().get(PROJECTS_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateProjectApiTests(TestCase):
+    """
+    Test API requests that require authentication
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='testUser',
+            password='testpass123',
+            # Staff see every client, members see theirs
+            is_staff=True,
+        )
+        self.business_client = BusinessClient.objects.create(name='Client1')
+        self.database = Database.objects.create(
+            name='Db1',
+            description='Sample database description',
+            owned_by=self.business_client,
+            created_by=self.user,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_project(self, name: str) -> Project:
+        return Project.objects.create(
+            name=name,
+            description='Sample project description',
+            database=self.database,
+            client=self.business_client,
+            created_by=self.user,
+        )
+
+    def test_list_projects_nested_names(self):
+        """
+        Test the list includes client, database and creator names
+        """
+        self.create_project('Project1')
+        res = self.client.get(PROJECTS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        row = res.data['results'][0]
+        self.assertEqual(row['client_name'], 'Client1')
+        self.assertEqual(row['database_name'], 'Db1')
+        self.assertEqual(row['created_by_username'], 'testUser')
+
+    def test_list_query_count_constant(self):
+        """
+        Test a list page costs the same queries for 2 or 20 rows
+        """
+        for i in range(2):
+            self.create_project(f'Project{i}')
+        with self.assertNumQueries(1):
+            self.client.get(PROJECTS_URL)
+
+        for i in range(2, 20):
+            self.create_project(f'Project{i}')
+        with self.assertNumQueries(1):
+            res = self.client.get(PROJECTS_URL)
+        self.assertEqual(len(res.data['results']), 20)
+
+    def test_create_project(self):
+        """
+        Test the creator is taken from the authenticated user
+        """
+        payload = {'name': 'NewProject', 'description': 'New project',
+                   'client': self.business_client.id,
+                   'database': self.database.id}
+        res = self.client.post(PROJECTS_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        project = Project.objects.get(name='NewProject')
+        self.assertEqual(project.created_by, self.user)
+
+    def test_export_projects_ndjson(self):
+        """
+        Test projects can be streamed as NDJSON
+        """
+        self.create_project('Project1')
+        res = self.client.get(PROJECTS_URL, {'format': 'ndjson'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        body = b''.join(res.streaming_content).decode()
+        self.assertIn('"client_name":"Client1"', body)
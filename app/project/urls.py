@@ -0,0 +1,20 @@
+"""
+URL mapping for the project app
+"""
+
+from django.urls import (
+    path,
+    include,
+)
+
+from rest_framework.routers import DefaultRouter
+from project import views
+
+router = DefaultRouter()
+router.register('projects', views.ProjectViewSet, basename='projects')
+
+app_name = 'project'
+
+urlpatterns = [
+    path('', include(router.urls))
+]
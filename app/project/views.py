@@ -0,0 +1,59 @@
+"""
+Views for the project API
+"""
+from typing import override
+
+from rest_framework import (
+    permissions,
+    viewsets)
+from rest_framework.filters import OrderingFilter
+from core import access
+from core.authentication import AccessTokenAuthentication
+from core.export import StreamingExportMixin
+from core.filters import FieldFilter, FullTextSearchFilter
+from core.models import Project
+from core.pagination import KeysetPagination
+from project.serializers import ProjectSerializer
+
+
+class ProjectViewSet(StreamingExportMixin, viewsets.ModelViewSet):
+    """
+    View for managing projects
+    """
+    serializer_class = ProjectSerializer
+    authentication_classes = [AccessTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    # Joined so a page is one query, not one per row per relation
+    queryset = Project.objects.select_related('client', 'database',
+                                              'created_by')
+    filter_backends = [FieldFilter, FullTextSearchFilter, OrderingFilter]
+    filter_fields = {'name': ['exact', 'icontains'],
+                     'date_created': ['gte', 'lte']}
+    ordering_fields = ['name', 'date_created', 'id']
+
+    @override
+    def get_queryset(self):
+        return access.scope(super().get_queryset(), self.request.user,
+                            'client')
+
+    def check_clients(self, data: dict):
+        """
+        Refuse to file the project under a client the user may not see
+        """
+        client_ids = []
+        if 'client' in data:
+            client_ids.append(data['client'].pk)
+        if 'database' in data:
+            client_ids.append(data['database'].owned_by_id)
+        access.check_clients(self.request.user, *client_ids)
+
+    @override
+    def perform_create(self, serializer):
+        self.check_clients(serializer.validated_data)
+        serializer.save(created_by=self.request.user)
+
+    @override
+    def perform_update(self, serializer):
+        self.check_clients(serializer.validated_data)
+        super().perform_update(serializer)
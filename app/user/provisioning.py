@@ -0,0 +1,105 @@
+"""
+Bulk user provisioning
+"""
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext as gt
+from rest_framework import serializers
+
+from core.conditional import bump_version
+from core.hashers import make_passwords
+from user.serializers import UserProvisionSerializer
+
+BATCH_SIZE = 1000
+
+
+def provision_users(rows: list) -> dict:
+    """
+    Validate and create a batch of users, returning a result per row.
+
+    Valid rows are created in one transaction even if other rows fail.
+    Usernames are checked against the table with one query, and the
+    passwords are hashed across the PASSWORD_HASH_WORKERS processes.
+    """
+    results, accepted = validate_users(rows)
+    return create_users(results, accepted, pop_passwords(accepted))
+
+
+def validate_users(rows: list) -> tuple[list, list]:
+    """
+    Validate each row, returning the results of the invalid rows, with
+    None for the others, and the index and attributes of the valid ones
+    """
+    results = [None] * len(rows)
+    accepted = []
+    for index, row in enumerate(rows):
+        serializer = UserProvisionSerializer(data=row)
+        if serializer.is_valid():
+            accepted.append((index, dict(serializer.validated_data)))
+        else:
+            results[index] = {'index': index, 'status': 'error',
+                              'errors': serializer.errors}
+    return results, accepted
+
+
+def pop_passwords(accepted: list) -> list:
+    """
+    Remove the passwords from the valid rows and return them in order
+    """
+    return [attrs.pop('password') for _, attrs in accepted]
+
+
+def create_users(results: list, accepted: list, passwords: list) -> dict:
+    """
+    Hash the passwords into the valid rows and create them, leaving out
+    usernames that are taken. Runs as a job for large batches, so it
+    takes and returns JSON serializable values.
+    """
+    hashes = make_passwords(passwords)
+    for (_, attrs), password in zip(accepted, hashes):
+        attrs['password'] = password
+    user_model = get_user_model()
+    taken = set(user_model.objects.filter(
+        username__in=[attrs['username'] for _, attrs in accepted]
+    ).values_list('username', flat=True))
+    unique_msg = user_model._meta.get_field(
+        'username').error_messages['unique']
+    created = []
+    for index, attrs in accepted:
+        if attrs['username'] in taken:
+            results[index] = {'index': index, 'status': 'error',
+                              'errors': {'username': [unique_msg]}}
+        else:
+            # The first row with a username wins, later ones are taken
+            taken.add(attrs['username'])
+            created.append((index, attrs))
+
+    users = [user_model(**attrs) for _, attrs in created]
+    try:
+        with transaction.atomic():
+            user_model.objects.bulk_create(users, batch_size=BATCH_SIZE)
+    except IntegrityError:
+        # A username was taken by another request since the check
+        raise serializers.ValidationError(
+            {'non_field_errors': [gt('Users were created concurrently, '
+                                     'retry the batch.')]},
+            code='conflict')
+    if users:
+        # bulk_create sends no post_save signals
+        bump_version('user')
+    for (index, _), user in zip(created, users):
+        results[index] = {'index': index, 'status': 'created',
+                          'id': user.id, 'username': user.username}
+    return {'created': len(users), 'failed': len(results) - len(users),
+            'results': results}
+
+
+def validate_rows(data) -> list:
+    """
+    Return the request body as a list of rows
+    """
+    if not isinstance(data, list) or not data:
+        raise serializers.ValidationError(
+            {'non_field_errors': [gt('Expected a non-empty list of users.')]},
+            code='not_a_list')
+    return data
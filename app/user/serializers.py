@@ -13,9 +13,10 @@ from django.utils.translation import gettext as gt
 from rest_framework import serializers
 
 from core.models import User
+from core.serializers import MeasuredSerializerMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the user object
     """
@@ -41,7 +42,8 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
-class AdminSerialiser(serializers.ModelSerializer):
+class AdminSerialiser(MeasuredSerializerMixin,
+                      serializers.ModelSerializer):
     """Base serializer for Admin Actions on Users"""
 
     class Meta:
@@ -74,6 +76,22 @@ class UserDetailAdminSerializer(AdminSerialiser):
         """
         return get_user_model().objects.create_user(**validated_data)
 
+
+class UserProvisionSerializer(AdminSerialiser):
+    """
+    Serializer for one row of a bulk provisioning request
+    """
+
+    class Meta(AdminSerialiser.Meta):
+        extra_kwargs = {
+            **AdminSerialiser.Meta.extra_kwargs,
+            # Uniqueness is checked for the whole batch by provision_users
+            'username': {'min_length': 3,
+                         'validators': [User.username_validator]},
+            'password': {'write_only': True, 'min_length': 5,
+                         'required': True},
+        }
+
 # class UserAdminSerializer(serializers.ModelSerializer):
 
 #     class Meta:
@@ -161,3 +179,12 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs['user'] = user
         return attrs
+
+
+class AccessTokenSerializer(serializers.Serializer):
+    """
+    Serializer for a short lived access token
+    """
+    access = serializers.CharField(read_only=True)
+    expires_in = serializers.IntegerField(
+        read_only=True, help_text='Seconds until the token expires')
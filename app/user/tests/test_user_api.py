@@ -1,10 +1,19 @@
 """
 Test for the user api
 """
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth.hashers import make_password
+from django.test import AsyncClient, TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth.models import (
@@ -15,6 +24,9 @@ from user.serializers import UserDetailAdminSerializer
 
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
+TOKEN_ASYNC_URL = reverse('user:token-async')
+ASYNC_ME_URL = reverse('user:async-me')
+ASYNC_MANAGE_URL = reverse('user:async-manage-list')
 ME_URL = reverse('user:me')
 MANAGE_URL = reverse('user:manage-list')
 
@@ -215,3 +227,213 @@ class PrivateAdminUserApiTest(TestCase):
         serializer = UserDetailAdminSerializer(self.user)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(serializer.data, res.data)
+
+    def test_list_users_paginated(self):
+        """
+        Test the admin user list is paged with a keyset cursor
+        """
+        for i in range(5):
+            create_user(username=f'pagedUser{i}', password='testpass123')
+        res = self.client.get(MANAGE_URL, {'page_size': 3})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 3)
+        self.assertIsNone(res.data['previous'])
+
+        seen = [row['id'] for row in res.data['results']]
+        next_url = res.data['next']
+        while next_url:
+            res = self.client.get(next_url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            seen += [row['id'] for row in res.data['results']]
+            next_url = res.data['next']
+
+        expected = list(get_user_model().objects.order_by(
+            'date_created', 'id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_list_users_previous_page(self):
+        """
+        Test following the previous link returns the earlier page
+        """
+        for i in range(4):
+            create_user(username=f'pagedUser{i}', password='testpass123')
+        first = self.client.get(MANAGE_URL, {'page_size': 2})
+        second = self.client.get(first.data['next'])
+        res = self.client.get(second.data['previous'])
+        self.assertEqual(res.data['results'], first.data['results'])
+
+    def test_list_users_invalid_cursor(self):
+        """
+        Test a malformed cursor returns 404
+        """
+        res = self.client.get(MANAGE_URL, {'cursor': 'not-a-cursor'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_users_ndjson(self):
+        """
+        Test the user list streams as newline delimited JSON
+        """
+        res = self.client.get(MANAGE_URL, {'format': 'ndjson'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['username'] for row in rows],
+                         [self.user.username, self.super_user.username])
+        self.assertNotIn('password', rows[0])
+
+    def test_export_users_csv(self):
+        """
+        Test the user list streams as CSV with a header row
+        """
+        res = self.client.get(MANAGE_URL, {'format': 'csv'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        content = b''.join(res.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], ['id', 'username', 'first_name',
+                                   'last_name', 'email', 'is_active',
+                                   'is_staff'])
+        self.assertEqual(len(rows), 3)
+
+
+class AsyncTokenApiTests(TransactionTestCase):
+    """
+    Test the ASGI token endpoint, which reads the user from a pool
+    thread, so on a connection of its own
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(username='exampleuser', password='goodpass')
+
+    def test_create_token_async(self):
+        """
+        Test a token is issued for valid credentials
+        """
+        res = self.client.post(TOKEN_ASYNC_URL, {
+            'username': 'exampleuser', 'password': 'goodpass'},
+            format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        token = Token.objects.get(user=self.user)
+        self.assertEqual(res.json(), {'token': token.key})
+
+    def test_create_token_async_bad_credentials(self):
+        """
+        Test invalid credentials are rejected
+        """
+        res = self.client.post(TOKEN_ASYNC_URL, {
+            'username': 'exampleuser', 'password': 'badpass'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn('token', res.json())
+
+    def test_create_token_async_missing_field(self):
+        """
+        Test a missing password is a field error
+        """
+        res = self.client.post(TOKEN_ASYNC_URL, {'username': 'exampleuser'},
+                               format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', res.json())
+
+    async def test_create_token_async_concurrent(self):
+        """
+        Test concurrent logins check their passwords at the same time
+        """
+        barrier = threading.Barrier(2, timeout=5)
+
+        def authenticate(request, **credentials):
+            # Only returns once the other login is checking too
+            barrier.wait()
+            return self.user
+
+        client = AsyncClient()
+        body = {'username': 'exampleuser', 'password': 'goodpass'}
+        with patch('user.views.authenticate', authenticate):
+            responses = await asyncio.gather(*[
+                client.post(TOKEN_ASYNC_URL, body,
+                            content_type='application/json')
+                for _ in range(2)])
+        for res in responses:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_create_token_async_rehash(self):
+        """
+        Test upgrading the hash on login keeps the user's tokens
+        """
+        self.user.password = make_password('goodpass', hasher='scrypt')
+        self.user.save(update_fields=['password'])
+        with patch('core.signals.tokens.revoke') as revoke, \
+                patch('core.signals.bump_version') as bump:
+            res = self.client.post(TOKEN_ASYNC_URL, {
+                'username': 'exampleuser', 'password': 'goodpass'},
+                format='json')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.password.startswith('scrypt$'))
+        revoke.assert_not_called()
+        bump.assert_not_called()
+
+
+class AsyncUserApiTests(TestCase):
+    """
+    Test the ASGI user endpoints
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(username='exampleuser', password='goodpass')
+        self.admin = get_user_model().objects.create_superuser(
+            username='exampleadmin', password='goodpass')
+
+    def authenticate(self, user):
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_async_me_requires_token(self):
+        """
+        Test the async views reject unauthenticated requests
+        """
+        res = self.client.get(ASYNC_ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res['WWW-Authenticate'], 'Token')
+
+    def test_async_me(self):
+        """
+        Test the async profile matches the sync one
+        """
+        self.authenticate(self.user)
+        res = self.client.get(ASYNC_ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), self.client.get(ME_URL).json())
+
+    def test_async_manage_requires_staff(self):
+        """
+        Test non staff users are refused the admin list
+        """
+        self.authenticate(self.user)
+        res = self.client.get(ASYNC_MANAGE_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_async_manage_list_and_create(self):
+        """
+        Test the admin can page through and create users
+        """
+        self.authenticate(self.admin)
+        res = self.client.post(ASYNC_MANAGE_URL, {
+            'username': 'newuser', 'password': 'newpass123'},
+            format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        user = get_user_model().objects.get(username='newuser')
+        self.assertTrue(user.check_password('newpass123'))
+
+        res = self.client.get(ASYNC_MANAGE_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        usernames = [item['username'] for item in res.json()['results']]
+        self.assertEqual(usernames, ['exampleuser', 'exampleadmin', 'newuser'])
+
+        detail = reverse('user:async-manage-detail', args=[user.id])
+        self.assertEqual(self.client.get(detail).json()['username'],
+                         'newuser')
+        missing = reverse('user:async-manage-detail', args=[user.id + 100])
+        self.assertEqual(self.client.get(missing).status_code,
+                         status.HTTP_404_NOT_FOUND)
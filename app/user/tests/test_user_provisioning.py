@@ -0,0 +1,116 @@
+"""
+Tests for bulk user provisioning
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.jobs import run_next
+from core.models import Job, JobSecret
+BULK_URL = reverse('user:manage-bulk')
+
+
+@override_settings(PASSWORD_HASH_WORKERS=1,
+                   PASSWORD_HASHER_COST={'PBKDF2_ITERATIONS': 1000})
+class BulkProvisioningApiTests(TestCase):
+    """
+    Test provisioning users in bulk as the admin
+    """
+
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            username='admin', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_provision_users(self):
+        """Test valid rows are created and invalid ones reported"""
+        payload = [
+            {'username': 'operator1', 'password': 'testpass123',
+             'email': 'operator1@example.com'},
+            {'username': 'admin', 'password': 'testpass123'},
+            {'username': 'operator2', 'password': 'abc'},
+            {'username': 'operator3', 'password': 'testpass123'},
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['created'], 2)
+        self.assertEqual(res.data['failed'], 2)
+        statuses = [row['status'] for row in res.data['results']]
+        self.assertEqual(statuses, ['created', 'error', 'error', 'created'])
+        self.assertIn('username', res.data['results'][1]['errors'])
+        self.assertIn('password', res.data['results'][2]['errors'])
+        user = get_user_model().objects.get(username='operator1')
+        self.assertEqual(res.data['results'][0]['id'], user.id)
+        self.assertEqual(user.email, 'operator1@example.com')
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_duplicate_usernames_in_batch(self):
+        """Test only the first row with a username is created"""
+        payload = [{'username': 'operator1', 'password': 'testpass123'},
+                   {'username': 'operator1', 'password': 'otherpass123'}]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual(res.data['results'][1]['status'], 'error')
+        user = get_user_model().objects.get(username='operator1')
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_nothing_created_is_bad_request(self):
+        """Test a batch without a valid row is rejected"""
+        res = self.client.post(BULK_URL, [{'username': 'x'}], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data['created'], 0)
+
+    def test_body_must_be_a_list(self):
+        """Test a single object is rejected"""
+        res = self.client.post(BULK_URL, {'username': 'operator1'},
+                               format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(USER_BULK_SYNC_LIMIT=1)
+    def test_large_batch_runs_as_job(self):
+        """Test a batch over the limit is queued and run by a worker"""
+        payload = [{'username': 'operator1', 'password': 'testpass123'},
+                   {'username': 'operator2', 'password': 'testpass123'}]
+
+        with patch('user.provisioning.make_passwords') as make_passwords:
+            res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data['status'], 'queued')
+        # Hashing is left to the worker, and the passwords to the secret
+        make_passwords.assert_not_called()
+        payload = str(Job.objects.get(pk=res.data['id']).payload)
+        self.assertNotIn('testpass123', payload)
+        self.assertFalse(get_user_model().objects.filter(
+            username='operator1').exists())
+
+        run_next('test-worker')
+
+        job = self.client.get(res['Location'])
+        self.assertEqual(job.data['id'], res.data['id'])
+        self.assertEqual(job.data['status'], 'succeeded')
+        self.assertEqual(job.data['result']['created'], 2)
+        self.assertTrue(get_user_model().objects.get(
+            username='operator2').check_password('testpass123'))
+        self.assertFalse(JobSecret.objects.exists())
+
+    def test_provision_requires_admin(self):
+        """Test a regular user cannot provision users"""
+        user = get_user_model().objects.create_user(
+            username='user1', password='testpass123')
+        self.client.force_authenticate(user)
+
+        res = self.client.post(BULK_URL, [], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -14,6 +14,16 @@ router.register('manage', views.AdminManageViewSet, basename='manage')
 urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
     path('token/', views.CreateTokenView.as_view(), name='token'),
+    path('token/async/', views.AsyncCreateTokenView.as_view(),
+         name='token-async'),
+    path('token/refresh/', views.RefreshAccessTokenView.as_view(),
+         name='token-refresh'),
     path('me/', views.ManageUserView.as_view(), name='me'),
+    # Async variants for ASGI deployments
+    path('async/me/', views.AsyncManageUserView.as_view(), name='async-me'),
+    path('async/manage/', views.AsyncAdminUserListView.as_view(),
+         name='async-manage-list'),
+    path('async/manage/<int:pk>/', views.AsyncAdminUserDetailView.as_view(),
+         name='async-manage-detail'),
     path('', include(router.urls))
     ]
@@ -2,15 +2,46 @@
 Views for the user API
 """
 from typing import override
-from django.contrib.auth import get_user_model
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import authenticate, get_user_model
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connections
+from django.utils.translation import gettext as gt
 from rest_framework import (
     generics,
-    authentication,
     permissions,
+    status,
     viewsets)
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from core import tokens
+from core.authentication import AccessTokenAuthentication
+from core.conditional import ConditionalGetMixin
+from core.export import StreamingExportMixin
+from core.jobs import enqueue
+from core.openapi import extend_schema
+from core.pagination import KeysetPagination
+from core.serializers import JobSerializer
+from core.values import ValuesListMixin
+from core.views import AsyncAPIView, api_response, parse_body
 from user import serializers
+from user.provisioning import (
+    create_users,
+    pop_passwords,
+    provision_users,
+    validate_rows,
+    validate_users,
+)
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -18,7 +49,7 @@ class CreateUserView(generics.CreateAPIView):
     Create a new user in the system
     """
     serializer_class = serializers.UserDetailAdminSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [AccessTokenAuthentication]
     permission_classes = [permissions.IsAdminUser]
 
 
@@ -30,12 +61,130 @@ class CreateTokenView(ObtainAuthToken):
     render_classes = api_settings.DEFAULT_RENDERER_CLASSES
 
 
+class RefreshAccessTokenView(APIView):
+    """
+    Exchange a token from the token endpoint for a short lived access
+    token, sent as ``Authorization: Bearer <access>``
+    """
+    # Read from the database rather than the token cache, so a token
+    # deleted or a user deactivated in another process cannot refresh
+    # from a stale entry. TokenAuthentication rejects inactive users.
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = serializers.AccessTokenSerializer
+
+    @extend_schema(request=None,
+                   responses=serializers.AccessTokenSerializer)
+    def post(self, request):
+        if not tokens.token_settings()['ENABLED']:
+            raise NotFound()
+        return Response(self.serializer_class({
+            'access': tokens.issue(request.user),
+            'expires_in': tokens.token_settings()['LIFETIME'],
+        }).data)
+
+
+def authenticate_in_pool(request, **credentials):
+    """
+    Run the authentication backends on a pool thread, closing the
+    connection they opened since the thread outlives the request
+    """
+    try:
+        return authenticate(request, **credentials)
+    finally:
+        connections.close_all()
+
+
+class AsyncCreateTokenView(AsyncAPIView):
+    """
+    Create a new auth token for user, for ASGI deployments.
+
+    Under ASGI, synchronous views share one thread, so a login storm
+    queues every request behind the password hashes. This view keeps
+    the event loop free and hashes on the thread pool instead.
+    """
+    authentication_class = None
+    require_authentication = False
+
+    async def post(self, request):
+        serializer = serializers.AuthTokenSerializer()
+        credentials = serializer.to_internal_value(parse_body(request))
+        # Not aauthenticate, which runs every login on the one shared
+        # sync thread
+        user = await sync_to_async(
+            authenticate_in_pool, thread_sensitive=False)(
+                request, username=credentials['username'],
+                password=credentials['password'])
+        if user is None:
+            msg = gt('Unable to authenticate with provided credentials')
+            raise ValidationError({'non_field_errors': [msg]})
+        token, _ = await Token.objects.aget_or_create(user=user)
+        return api_response({'token': token.key})
+
+
+class AsyncManageUserView(AsyncAPIView):
+    """
+    Retrieve the authenticated user without holding a thread
+    """
+
+    async def get(self, request):
+        user = request.user
+        if user.get_deferred_fields():
+            # Authenticated by an access token, which only holds the flags
+            user = await get_user_model().objects.aget(pk=user.pk)
+        return api_response(serializers.UserSerializer(user).data)
+
+
+class AsyncAdminUserListView(AsyncAPIView):
+    """
+    List and create users as the admin under ASGI
+    """
+    require_staff = True
+
+    async def get(self, request):
+        paginator = KeysetPagination()
+        drf_request = Request(request)
+        queryset = get_user_model().objects.all()
+        page = await sync_to_async(paginator.paginate_queryset)(
+            queryset, drf_request)
+        data = serializers.AdminSerialiser(page, many=True).data
+        return api_response(paginator.get_paginated_response(data).data)
+
+    async def post(self, request):
+        serializer = serializers.UserDetailAdminSerializer(
+            data=parse_body(request))
+        # The username uniqueness check queries the database
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        attrs = dict(serializer.validated_data)
+        password = await sync_to_async(
+            make_password, thread_sensitive=False)(attrs.pop('password'))
+        user = await get_user_model().objects.acreate(password=password,
+                                                      **attrs)
+        return api_response(serializers.UserDetailAdminSerializer(user).data,
+                            status=201)
+
+
+class AsyncAdminUserDetailView(AsyncAPIView):
+    """
+    Retrieve a user as the admin under ASGI
+    """
+    require_staff = True
+
+    async def get(self, request, pk: int):
+        user_model = get_user_model()
+        try:
+            user = await user_model.objects.aget(pk=pk)
+        except user_model.DoesNotExist:
+            raise NotFound()
+        return api_response(serializers.UserDetailAdminSerializer(user).data)
+
+
 class ManageUserView(generics.RetrieveUpdateAPIView):
     """
     Manage the authenticated user
     """
     serializer_class = serializers.UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [AccessTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     @override
@@ -43,17 +192,24 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
         """
         Retrieve and return the authenticated user
         """
-        return self.request.user
+        user = self.request.user
+        if user.get_deferred_fields():
+            # Authenticated by an access token, which only holds the flags
+            user = get_user_model().objects.get(pk=user.pk)
+        return user
 
 
-class AdminManageViewSet(viewsets.ModelViewSet):
+class AdminManageViewSet(ConditionalGetMixin, StreamingExportMixin,
+                         ValuesListMixin, viewsets.ModelViewSet):
     """
     Manage a user as the admin
     """
     serializer_class = serializers.UserDetailAdminSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [AccessTokenAuthentication]
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = KeysetPagination
     queryset = get_user_model().objects.all()
+    cache_resource = 'user'
 
     def get_queryset(self):
         return self.queryset
@@ -64,8 +220,35 @@ class AdminManageViewSet(viewsets.ModelViewSet):
         """
         if self.action == 'list':
             return serializers.AdminSerialiser
+        if self.action == 'bulk':
+            return serializers.UserProvisionSerializer
         return self.serializer_class
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Provision a list of users, with a result for each row.
+
+        Batches larger than USER_BULK_SYNC_LIMIT are accepted with 202
+        and created by a background job, which also hashes the
+        passwords. They are queued as job secrets, out of the payload.
+        """
+        rows = validate_rows(request.data)
+        if len(rows) > settings.USER_BULK_SYNC_LIMIT:
+            results, accepted = validate_users(rows)
+            passwords = pop_passwords(accepted)
+            job = enqueue(create_users, results, accepted,
+                          user=request.user,
+                          secrets={'passwords': passwords})
+            location = reverse('core:jobs-detail', args=[job.id],
+                               request=request)
+            return Response(JobSerializer(job).data,
+                            status=status.HTTP_202_ACCEPTED,
+                            headers={'Location': location})
+        result = provision_users(rows)
+        return Response(result, status=status.HTTP_201_CREATED
+                        if result['created'] else status.HTTP_400_BAD_REQUEST)
+
     # def get(self, request, *args, **kwargs):
     #     breakpoint()
     #     return self.retrieve(request, *args, **kwargs)